@@ -1,20 +1,27 @@
 import os
-import random
-import sys
-from typing import List, Set, Tuple, Callable
+from functools import lru_cache
+from typing import List
 os.environ['SDL_VIDEO_CENTERED'] = '1' 
 import pygame
-from customize_board import load_settings
+import assets
+import instrument
+from assets import atlas, font, render_text
+from instrument import ENABLED as STATS, timed
+from engine import Coord, GameEngine, Snake, SNAKE_COLOURS
+from scenes import display
+from viewport import Camera, start_cell
 
 # ─────── constants ────────────────────────────────────────────────────────
-ASSETS = os.path.dirname(os.path.abspath(__file__))
-LOGO_IMG = os.path.join(ASSETS, "battlesnakes_logo.png")
-GRASS_IMG = os.path.join(ASSETS, "grass.png")
-
 CELL = 40
+LOGO_W = 600
 GAP = 20
 RIGHT_W = 300  # widened panel for text
-SCORES_FILE = "scores.txt"
+SUSPEND_FILE = "suspended_game.bss"  # snapshot left by Main Menu; the launcher offers to resume it
+BOT_DELAY_MS = 1000  # pause before the bot answers a user shot
+POPUP_MS = 1000      # how long HIT!/MISS! popups stay up
+MIN_VIEW = 10 * CELL  # boards up to 10x10 always show whole at full size
+WINDOW_MARGIN = 80    # desktop height kept free for title bar and taskbar
+MINIMAP = 130         # largest minimap side, in pixels
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -22,201 +29,160 @@ GRAY = (170, 170, 170)
 RED = (220, 40, 40)
 GREEN_BTN = (0, 170, 0)
 PANEL_BG = (230, 230, 230)
+GOLD = (255, 215, 0)
+
+PLAIN_CELL = (False, None, None, False)  # untouched grass: the board_looks() default
+
+# Every image a game draws, scaled for the board; see assets.atlas().
+GAME_IMAGES = (("logo", "battlesnakes_logo.png", (LOGO_W, None), True),
+               ("grass", "grass.png", (CELL, CELL), False),
+               *((f"{c}_snake", f"{c}_snake.png", (CELL - 6, CELL - 6), False) for c in SNAKE_COLOURS))
+
+
+@lru_cache(maxsize=8)
+def board_background(rows: int, cols: int, grass: pygame.Surface, stagger: bool = False) -> pygame.Surface:
+    """Grass tiles plus grid lines for rows x cols cells the size of `grass`,
+    odd rows shifted half a cell right if `stagger`; shared, so only blit it."""
+    cell = grass.get_width()
+    half = cell // 2 if stagger else 0
+    bg = pygame.Surface((cols * cell + half + 1, rows * cell + 1))
+    bg.fill(WHITE)
+    for y in range(rows):
+        shift = half if y & 1 else 0
+        for x in range(cols):
+            bg.blit(grass, (x * cell + shift, y * cell))
+        for x in range(cols + 1):
+            pygame.draw.line(bg, BLACK, (x * cell + shift, y * cell), (x * cell + shift, (y + 1) * cell))
+        for edge in (y, y + 1):
+            pygame.draw.line(bg, BLACK, (shift, edge * cell), (cols * cell + shift, edge * cell))
+    return bg
+
+
+@lru_cache(maxsize=64)
+def scaled(image: pygame.Surface, w: int, h: int) -> pygame.Surface:
+    """`image` at w x h (itself if already that size), for zoomed boards."""
+    if image.get_size() == (w, h):
+        return image
+    return pygame.transform.scale(image, (w, h))
+
+
+def max_view_size(left_x: int, gap_between_boards: int) -> tuple[int, int]:
+    """Largest board view that keeps the window on the desktop."""
+    sizes = pygame.display.get_desktop_sizes()
+    desk_w, desk_h = sizes[0] if sizes else (0, 0)
+    return (max(desk_w - left_x - GAP - RIGHT_W, MIN_VIEW),
+            max((desk_h - WINDOW_MARGIN - gap_between_boards) // 2, MIN_VIEW))
+
+class BaseGame(GameEngine):
+    """pygame front end: draws a GameEngine and feeds it mouse input."""
+    popup_bot_shots = True  # flash "Bot: HIT!/MISS!" after the bot fires
 
-Coord = Tuple[int, int]
-
-# ─────── model objects ────────────────────────────────────────────────────
-class Snake:
-    def __init__(self, xy: Coord, sprite: pygame.Surface,
-                 move_fn: Callable[["Snake", int, int, Set[Coord], Set[Coord]], None] | None = None):
-        self.xy: Coord = xy
-        self.sprite = sprite
-        self.move_fn = move_fn or Snake.default_move
-        self.alive: bool = True
-        self.revealed: bool = False  # for bot snakes: revealed when hit
-
-    def hit(self, xy: Coord) -> bool:
-        if xy == self.xy:
-            self.alive = False
-            self.revealed = True
-            return True
-        return False
-
-    def default_move(self, rows: int, cols: int,
-                     blocked: Set[Coord], attacked: Set[Coord]):
-        if not self.alive:
-            return
-        x, y = self.xy
-        nbrs = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-        random.shuffle(nbrs)
-        for nx, ny in nbrs:
-            if (0 <= nx < cols and 0 <= ny < rows
-                    and (nx, ny) not in blocked
-                    and (nx, ny) not in attacked):
-                self.xy = (nx, ny)
-                return
-
-    def attempt_move(self, rows: int, cols: int,
-                     blocked: Set[Coord], attacked: Set[Coord]):
-        self.move_fn(self, rows, cols, blocked, attacked)
-
-
-class Player:
-    def __init__(self, name: str):
-        self.name = name
-        self.snakes: List[Snake] = []
-        self.hits: Set[Coord] = set()
-        self.misses: Set[Coord] = set()
-
-    def alive_snakes(self):
-        return [s for s in self.snakes if s.alive]
-
-    def cells(self) -> Set[Coord]:
-        return {s.xy for s in self.snakes if s.alive}
-
-    def all_shots(self) -> Set[Coord]:
-        return self.hits | self.misses
-
-    def is_defeated(self) -> bool:
-        return not self.alive_snakes()
-
-
-class BaseGame:
     def __init__(self, settings: dict, user: str = "Player 1"):
-        self.rows, self.cols = settings["rows"], settings["cols"]
-        self.snakes_each = settings.get("snakes_per_player", 7)
-        self.players = [Player(user), Player("Bot")]
-        self.turn_idx = 0
-        self.turns_taken = 0
-        self.phase = "placement"
-        self.over = False
+        super().__init__(settings, user)
         self.last_hit_message = None
         self.hit_timer = 0
         self.force_redraw = False
-        self.bot_last_guess = None
-        pygame.init()
-        self.font = pygame.font.SysFont(None, 22)
-#################################################
-        original_logo = pygame.image.load(LOGO_IMG)
-        self.logo = pygame.transform.smoothscale(original_logo, (600, int(original_logo.get_height() * 600 / original_logo.get_width())))
-#################################################
-        self.grass = pygame.transform.scale(pygame.image.load(GRASS_IMG), (CELL, CELL))
+        assets.init()
+        self.font = font(22)
+        images = atlas(GAME_IMAGES)  # loaded once per process, so Play Again is instant
         self.bot_attack_pending = False
         self.bot_attack_timer = 0
-        self.snake_sprites: dict[str, pygame.Surface] = {}
-        self._prepare_snake_sprites()
         self.bot_last_hit_message = None
 
         # Get logo size
-        logo_width = self.logo.get_width()
-        logo_height = self.logo.get_height()
-
-        board_w = self.cols * CELL
-        board_h = self.rows * CELL
+        logo_width, logo_height = images.size("logo")
 
         self.left_x = logo_width + GAP
 
         # Adjust gap between top and bottom board
         gap_between_boards = GAP + 50
 
+        # Each board is drawn through a view no bigger than the desktop
+        # allows; larger boards start shrunk to fit and then zoom and scroll.
+        max_w, max_h = max_view_size(self.left_x, gap_between_boards)
+        stagger = self.topology.staggered
+        cell = start_cell(self.rows, self.cols, max_w, max_h, CELL, stagger)
+        board_w = min(self.cols * cell + (cell // 2 if stagger and self.rows > 1 else 0), max_w)
+        board_h = min(self.rows * cell, max_h)
+        self.camera = Camera(self.rows, self.cols, board_w, board_h, cell, stagger)
+
         window_w = self.left_x + board_w + GAP + RIGHT_W
         window_h = max(logo_height, board_h * 2 + gap_between_boards)
 
         self.top_rect = pygame.Rect(self.left_x, 0, board_w, board_h)
         self.bot_rect = self.top_rect.move(0, board_h + gap_between_boards)
+        self.strip_rect = pygame.Rect(self.left_x, self.top_rect.bottom + 1,
+                                      board_w + 1, gap_between_boards - 1)
+        self.panel_rect = pygame.Rect(self.left_x + board_w + GAP, 0, RIGHT_W, self.bot_rect.bottom)
 
-        # Setup screen and center the window manually
-        self.screen = pygame.display.set_mode((window_w, window_h))
+        # The shared window, resized only if this board needs another size
+        self.screen = display((window_w, window_h), "BattleSnakes - The Game")
         self.screen.fill(WHITE)
         pygame.display.flip()
-        pygame.display.set_caption("BattleSnakes - The Game")
+        # Pieces of the atlas, converted now that the display is set.
+        self.logo = images.get("logo")
+        self.grass = images.get("grass")
+        self.snake_sprites: dict[str, pygame.Surface] = {
+            c: images.get(f"{c}_snake") for c in SNAKE_COLOURS if f"{c}_snake" in images}
 
         # Buttons
         self.yes_btn = pygame.Rect(0, 0, 120, 40)
-        self.yes_btn.center = (self.left_x + (self.cols * CELL) // 2, self.top_rect.bottom + 30)
+        self.yes_btn.center = (self.top_rect.centerx, self.top_rect.bottom + 30)
         self.play_again_btn = pygame.Rect(self.left_x + board_w + GAP + 50, 300, 120, 40)
         self.quit_btn = pygame.Rect(self.left_x + board_w + GAP + 50, 360, 120, 40)
 ############
         self.main_menu_btn = pygame.Rect(self.left_x + board_w + GAP + 50, 420, 120, 40)
 ############
+        # Timings overlay at the foot of the panel (BATTLESNAKES_STATS=1; F3 hides it)
+        self.show_stats = STATS
+        stats_top = max(self.main_menu_btn.bottom + 20, self.panel_rect.bottom - 150)
+        self.stats_rect = pygame.Rect(self.panel_rect.x, stats_top, RIGHT_W,
+                                      max(self.panel_rect.bottom - stats_top, 0))
+
+        # Minimaps of both boards side by side in the panel, shown while the
+        # boards are too big for their views; clicking one scrolls there.
+        scale = MINIMAP / max(self.rows, self.cols)
+        mini_w, mini_h = max(1, round(self.cols * scale)), max(1, round(self.rows * scale))
+        mini_top = self.main_menu_btn.bottom + 40
+        self.minimap_rects = {
+            self.top_rect.y: pygame.Rect(self.panel_rect.x + 10, mini_top, mini_w, mini_h),
+            self.bot_rect.y: pygame.Rect(self.panel_rect.x + 30 + MINIMAP, mini_top, mini_w, mini_h)}
+        self.minimap_area = pygame.Rect(self.panel_rect.x, mini_top - 25, RIGHT_W,
+                                        mini_h + 25).clip(self.panel_rect)
+        self.grass_colour = pygame.transform.average_color(self.grass)[:3]
+        self._minimaps: dict[int, pygame.Surface] = {}  # one pixel per cell, per board
+        self._minimaps_scaled: dict[int, pygame.Surface] = {}  # those at minimap size
 
         self.pending: Coord | None = None
         self.messages: List[str] = ["Place your snakes: click bottom grid"]
-        self._grass_cache = {}
-
-    def _prepare_snake_sprites(self):
-        sprite_names = ["green", "red", "blue", "yellow", "purple", "orange"]
-        for cname in sprite_names:
-            path = os.path.join(ASSETS, f"{cname}_snake.png")
-            if os.path.exists(path):
-                img = pygame.image.load(path)
-                self.snake_sprites[cname] = pygame.transform.scale(img, (CELL - 6, CELL - 6))
-            else:
-                print(f"Warning: missing sprite for {cname}")
-
-    def snakes_move_phase(self):
-        for p in self.players:
-            if p is self.user:
-                attacked = self.bot.hits | self.bot.misses # <-- Only bot's hits are dangerous for user snakes
-            else:
-                attacked = self.user.hits | self.user.misses # <-- Only user's hits are dangerous for bot snakes
-
-            blocked = self.user.cells() | self.bot.cells()
-            new_blocked = blocked.copy()
+        self.board_bg = self._build_board_background()
+        self._drawn_looks: dict | None = None  # last frame's board_looks(), per board
 
-            for s in p.snakes:
-                if not s.alive:
-                    continue
-                new_blocked.discard(s.xy)
-                s.attempt_move(self.rows, self.cols, new_blocked, attacked)
-                new_blocked.add(s.xy)
-
-            blocked = new_blocked
+    def _build_board_background(self) -> pygame.Surface:
+        """Background for the cells in view at the camera's zoom."""
+        c = self.camera.cell
+        return board_background(*self.camera.pattern_size(), scaled(self.grass, c, c), self.camera.stagger)
 
     def handle_placement_click(self, gx: int, gy: int):
-        if len(self.user.snakes) >= self.snakes_each:
-            return
-        if (gx, gy) in self.user.cells():
-            return
-        colours = ["green", "red", "blue", "yellow", "purple", "orange"]
-        colour = random.choice(colours)
-        self.user.snakes.append(Snake((gx, gy), self.snake_sprites[colour]))
-        if len(self.user.snakes) == self.snakes_each:
-            self.auto_place_bot()
+        if self.place_snake(gx, gy) and self.phase == "battle":
             self.messages.append("Snakes placed – battle begins!")
-            self.phase = "battle"
-
-    def auto_place_bot(self):
-        colours = ["green", "red", "blue", "yellow", "purple", "orange"]
-        while len(self.bot.snakes) < self.snakes_each:
-            x, y = random.randrange(self.cols), random.randrange(self.rows)
-            if (x, y) not in self.bot.cells() and (x, y) not in self.user.cells():
-                c = random.choice(colours)
-                self.bot.snakes.append(Snake((x, y), self.snake_sprites[c]))
 
     def handle_attack_click(self, gx: int, gy: int):
-        if (gx, gy) in self.user.all_shots():
+        if not self.can_attack((gx, gy)):
             return
         self.pending = (gx, gy)
 
-    def check_game_over(self):
-        if self.user.is_defeated():
-            self.messages.append("Bot wins! Game over.")
-            self.over = True
-            self.end_winner = "Bot"
-        elif self.bot.is_defeated():
-            self.messages.append("You win! Game over.")
-            self.over = True
-            self.end_winner = "Player"
+    def check_game_over(self) -> bool:
+        was_over = self.over
+        if super().check_game_over() and not was_over:
+            if self.end_winner == "Bot":
+                self.messages.append("Bot wins! Game over.")
+            else:
+                self.messages.append("You win! Game over.")
+        return self.over
 
     def bot_take_shot(self):
-        while True:
-            x, y = random.randrange(self.cols), random.randrange(self.rows)
-            if (x, y) not in self.bot.all_shots():
-                break
-        self.bot_last_guess = (x, y)
-        hit = any(s.hit((x, y)) for s in self.user.snakes)
-        (self.bot.hits if hit else self.bot.misses).add((x, y))
+        (x, y), hit = super().bot_take_shot()
         self.messages.append(f"Bot fired at {(x, y)} – {'HIT' if hit else 'miss'}")
 
         # ✨ NEW: Store bot's popup message
@@ -224,15 +190,16 @@ class BaseGame:
 
         # ✨ NEW: Start popup timer
         self.hit_timer = pygame.time.get_ticks()
+        return (x, y), hit
 
+    @timed("confirm_attack")
     def confirm_attack(self):
         if not self.pending:
             return
         gx, gy = self.pending
-        hit = any(s.hit((gx, gy)) for s in self.bot.snakes)
 
-        # --- 1. Update shots
-        (self.user.hits if hit else self.user.misses).add((gx, gy))
+        # --- 1. Resolve the shot
+        hit = self.attack((gx, gy))
 
         # --- 2. Set popup message and timer
         self.last_hit_message = "HIT!" if hit else "MISS!"
@@ -246,179 +213,397 @@ class BaseGame:
 
         if not self.over:
             # Don't attack immediately — set a pending timer instead
-            self.bot_attack_pending = True
-            self.bot_attack_timer = pygame.time.get_ticks()
-
-    @property
-    def user(self) -> Player:
-        return self.players[0]
-
-    @property
-    def bot(self) -> Player:
-        return self.players[1]
-
+            self.schedule_bot_attack()
+
+    def schedule_bot_attack(self):
+        """The bot answers after BOT_DELAY_MS; play() fires it."""
+        self.bot_attack_pending = True
+        self.bot_attack_timer = pygame.time.get_ticks()
+        start_search = getattr(self.bot_ai, "start_search", None)
+        if start_search is not None and self.book_target() is None:
+            start_search()  # a search bot thinks during the delay, off this process
+
+    # ── what each cell looks like (Difficulty modes override these) ──
+    def cell_cleared(self, rect: pygame.Rect, cell: Coord) -> bool:
+        """True if the grass at `cell` has been shot away (drawn white)."""
+        if rect == self.top_rect:
+            # Top grid: player attacks bot
+            return cell in self.user.misses
+        # Bottom grid: bot attacks player
+        return cell in self.bot.hits or cell in self.bot.misses
+
+    def shown_shots(self, rect: pygame.Rect):
+        """(hits, misses) drawn as markers on the board at rect."""
+        if self.phase == "placement":
+            return (), ()
+        if rect == self.top_rect:
+            return self.user.hits, self.user.misses
+        return self.bot.hits, self.bot.misses
+
+    def shown_snakes(self, rect: pygame.Rect) -> List[Snake]:
+        if rect == self.bot_rect:
+            return [s for s in self.user.snakes if s.alive or s.revealed]
+        if self.phase == "placement":
+            return []
+        return [s for s in self.bot.snakes if s.revealed]  # Hide bot snakes unless revealed
+
+    def board_looks(self, rect: pygame.Rect) -> dict:
+        """Look of every cell that isn't plain grass, keyed by cell.
+
+        A look is (cleared, (colour, alive) or None, "hit"/"miss"/None,
+        pending); cells whose look changes between frames get redrawn.
+        """
+        hits, misses = self.shown_shots(rect)
+        snake_at = {s.xy: s for s in self.shown_snakes(rect)}
+        candidates = set(snake_at)
+        for p in self.players:
+            candidates.update(p.hits)
+            candidates.update(p.misses)
+        for extra in (self.pending, self.bot_last_guess, getattr(self, "last_guess", None)):
+            if extra is not None:
+                candidates.add(extra)
+        looks = {}
+        for cell in candidates:
+            snake = snake_at.get(cell)
+            look = (self.cell_cleared(rect, cell),
+                    (snake.colour, snake.alive) if snake else None,
+                    "hit" if cell in hits else "miss" if cell in misses else None,
+                    rect == self.top_rect and cell == self.pending)
+            if look != PLAIN_CELL:
+                looks[cell] = look
+        return looks
+
+    # ── drawing ──
+    def view_clip(self, rect: pygame.Rect) -> pygame.Rect:
+        """The board view at rect plus its closing grid line."""
+        return pygame.Rect(rect.x, rect.y, rect.w + 1, rect.h + 1)
+
+    def cell_at(self, rect: pygame.Rect, pos) -> Coord | None:
+        """The board cell under screen position pos, if any."""
+        return self.camera.cell_at(pos[0] - rect.x, pos[1] - rect.y)
+
+    @timed("draw_grid")
     def draw_grid(self, rect: pygame.Rect):
-        pygame.draw.rect(self.screen, WHITE, rect)
-        for y in range(self.rows):
-            for x in range(self.cols):
-                abs_x = rect.x + x * CELL
-                abs_y = rect.y + y * CELL
-                cell = (x, y)
-
-                if rect == self.top_rect:
-                    # Top grid: player attacks bot
-                    if cell in self.user.misses:
-                        pygame.draw.rect(self.screen, WHITE, (abs_x, abs_y, CELL, CELL))
-                    else:
-                        self.screen.blit(self.grass, (abs_x, abs_y))
-                else:
-                    # Bottom grid: bot attacks player
-                    if cell in self.bot.hits or cell in self.bot.misses:
-                        pygame.draw.rect(self.screen, WHITE, (abs_x, abs_y, CELL, CELL))
-                    else:
-                        self.screen.blit(self.grass, (abs_x, abs_y))
-
-        for x in range(self.cols + 1):
-            pygame.draw.line(self.screen, BLACK,
-                            (rect.x + x * CELL, rect.y),
-                            (rect.x + x * CELL, rect.bottom))
-        for y in range(self.rows + 1):
-            pygame.draw.line(self.screen, BLACK,
-                            (rect.x, rect.y + y * CELL),
-                            (rect.right, rect.y + y * CELL))
-
-
-    def draw_snakes(self, rect: pygame.Rect, owner: Player):
-        for s in owner.snakes:
-            if not s.alive and not s.revealed:
-                continue
-            x, y = s.xy
-
-            if owner is self.bot and rect == self.top_rect and not s.revealed:
-                continue  # Hide bot snakes unless revealed
-
-            # Draw the snake
-            self.screen.blit(s.sprite,
-                            (rect.x + x * CELL + 3,
-                            rect.y + y * CELL + 3))
-
+        """Plain grass and grid lines for the part of a board in view."""
+        cam = self.camera
+        x0, y0, x1, y1 = cam.visible_cells()
+        vx, vy = x0 * cam.cell - cam.ox, y0 * cam.cell - cam.oy
+        self.screen.set_clip(self.view_clip(rect))
+        if not cam.covers_view():
+            self.screen.fill(WHITE, self.view_clip(rect))
+        # A staggered pattern's row 0 is even, so odd y0 starts from its row 1.
+        parity = y0 & 1 if cam.stagger else 0
+        self.screen.blit(self.board_bg, (rect.x + vx, rect.y + vy),
+                         (0, parity * cam.cell, (x1 - x0) * cam.cell + cam.half() + 1,
+                          (y1 - y0) * cam.cell + 1))
+        self.screen.set_clip(None)
+
+    def draw_board(self, rect: pygame.Rect, looks: dict):
+        """The part of a board in view: grass, then every cell in view that
+        isn't plain grass."""
+        self.draw_grid(rect)
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        if (x1 - x0) * (y1 - y0) < len(looks):
+            # Zoomed in on a busy board: walk the view, not every mark.
+            looks = {(x, y): looks[x, y] for y in range(y0, y1) for x in range(x0, x1)
+                     if (x, y) in looks}
+        for cell, look in looks.items():
+            self.draw_cell(rect, cell, look)
+
+    def draw_cell(self, rect: pygame.Rect, cell: Coord, look: tuple) -> pygame.Rect | None:
+        """Repaint one cell (background, border, snake, marker, highlight);
+        returns the area painted, or None if the cell is out of view."""
+        if not self.camera.is_visible(cell):
+            return None
+        cleared, snake, marker, pending = look
+        c = self.camera.cell
+        vx, vy = self.camera.to_view(cell)
+        abs_x = rect.x + vx
+        abs_y = rect.y + vy
+
+        def px(n: int) -> int:  # a length drawn at CELL, at the current zoom
+            return max(1, round(n * c / CELL))
+
+        clip = self.view_clip(rect)
+        self.screen.set_clip(clip)
+        if cleared:
+            pygame.draw.rect(self.screen, WHITE, (abs_x, abs_y, c, c))
+            pygame.draw.rect(self.screen, BLACK, (abs_x, abs_y, c + 1, c + 1), 1)
+        else:
+            self.screen.blit(self.board_bg, (abs_x, abs_y), (0, 0, c + 1, c + 1))
+
+        if snake:
+            colour, alive = snake
+            pad = px(3)
+            size = max(1, c - 2 * pad)
+            self.screen.blit(scaled(self.snake_sprites[colour], size, size),
+                             (abs_x + pad, abs_y + pad))
             # Draw X if dead
-            if not s.alive:
+            if not alive:
+                inset, width = px(5), px(3)
                 pygame.draw.line(self.screen, RED,
-                                (rect.x + x * CELL + 5, rect.y + y * CELL + 5),
-                                (rect.x + (x + 1) * CELL - 5, rect.y + (y + 1) * CELL - 5), 3)
+                                (abs_x + inset, abs_y + inset),
+                                (abs_x + c - inset, abs_y + c - inset), width)
                 pygame.draw.line(self.screen, RED,
-                                (rect.x + (x + 1) * CELL - 5, rect.y + y * CELL + 5),
-                                (rect.x + x * CELL + 5, rect.y + (y + 1) * CELL - 5), 3)
-
-
-    def draw_attacks(self, rect: pygame.Rect, shooter: Player):
-        for x, y in shooter.hits:
-            pygame.draw.circle(self.screen, RED,
-                               (rect.x + x * CELL + CELL // 2,
-                                rect.y + y * CELL + CELL // 2), 8)
-        for x, y in shooter.misses:
-            pygame.draw.circle(self.screen, GRAY,
-                               (rect.x + x * CELL + CELL // 2,
-                                rect.y + y * CELL + CELL // 2), 5)
+                                (abs_x + c - inset, abs_y + inset),
+                                (abs_x + inset, abs_y + c - inset), width)
+
+        if marker == "hit":
+            pygame.draw.circle(self.screen, RED, (abs_x + c // 2, abs_y + c // 2), px(8))
+        elif marker == "miss":
+            pygame.draw.circle(self.screen, GRAY, (abs_x + c // 2, abs_y + c // 2), px(5))
+
+        if pending:
+            inset = px(2)
+            pygame.draw.rect(self.screen, GOLD,
+                            (abs_x + inset, abs_y + inset, c - 2 * inset, c - 2 * inset), px(3))
+        self.screen.set_clip(None)
+        return pygame.Rect(abs_x, abs_y, c + 1, c + 1).clip(clip)
+
+    # ── minimaps ──
+    def minimap_colour(self, look: tuple) -> tuple:
+        """One pixel's worth of a cell's look."""
+        cleared, snake, marker, pending = look
+        if pending:
+            return GOLD
+        if marker == "hit":
+            return RED
+        if snake:
+            colour, alive = snake
+            return tuple(pygame.Color(colour))[:3] if alive else BLACK
+        if marker == "miss":
+            return GRAY
+        return WHITE if cleared else self.grass_colour
+
+    def build_minimap(self, rect: pygame.Rect, looks: dict):
+        mini = pygame.Surface((self.cols, self.rows), 0, 32)
+        mini.fill(self.grass_colour)
+        for cell, look in looks.items():
+            mini.set_at(cell, self.minimap_colour(look))
+        self._minimaps[rect.y] = mini
+        self._minimaps_scaled.pop(rect.y, None)
+
+    def update_minimap(self, rect: pygame.Rect, looks: dict, cells):
+        mini = self._minimaps[rect.y]
+        for cell in cells:
+            mini.set_at(cell, self.minimap_colour(looks.get(cell, PLAIN_CELL)))
+        if cells:
+            self._minimaps_scaled.pop(rect.y, None)
+
+    def draw_minimaps(self):
+        """Both boards shrunk into the panel with the view outlined, while the
+        boards scroll; otherwise just panel background."""
+        self.screen.set_clip(self.minimap_area)
+        self.screen.fill(PANEL_BG, self.minimap_area)
+        cam = self.camera
+        if cam.scrolls():
+            for (y, mini_rect), label in zip(self.minimap_rects.items(), ("Enemy", "Yours")):
+                mini = self._minimaps_scaled.get(y)
+                if mini is None:
+                    # Many cells per pixel: average them; fewer: keep cells crisp.
+                    shrink = mini_rect.w < self.cols or mini_rect.h < self.rows
+                    mini = (pygame.transform.smoothscale if shrink else pygame.transform.scale)(
+                        self._minimaps[y], mini_rect.size)
+                    self._minimaps_scaled[y] = mini
+                self.screen.blit(mini, mini_rect)
+                self.screen.blit(render_text(label, 18, BLACK), (mini_rect.x, mini_rect.y - 18))
+                board_w, board_h = cam.board_size()
+                sx = mini_rect.w / board_w
+                sy = mini_rect.h / board_h
+                view = pygame.Rect(mini_rect.x + round(max(cam.ox, 0) * sx),
+                                   mini_rect.y + round(max(cam.oy, 0) * sy),
+                                   max(2, round(cam.view_w * sx)), max(2, round(cam.view_h * sy)))
+                pygame.draw.rect(self.screen, GOLD, view.clip(mini_rect.inflate(2, 2)), 1)
+        self.screen.set_clip(None)
+
+    def minimap_cell(self, pos) -> tuple[float, float] | None:
+        """The board point, in cells, under a click on a minimap."""
+        if not self.camera.scrolls():
+            return None
+        for mini_rect in self.minimap_rects.values():
+            if mini_rect.collidepoint(pos):
+                return ((pos[0] - mini_rect.x) * self.cols / mini_rect.w,
+                        (pos[1] - mini_rect.y) * self.rows / mini_rect.h)
+        return None
 
     def draw_panel(self):
         # Right-side panel background
-        panel_x = self.left_x + self.cols * CELL + GAP
-        panel_rect = pygame.Rect(panel_x, 0, RIGHT_W, self.bot_rect.bottom)
-        pygame.draw.rect(self.screen, PANEL_BG, panel_rect)
+        pygame.draw.rect(self.screen, PANEL_BG, self.panel_rect)
 
         # Render last few messages
         y_offset = 20
         for line in self.messages[-8:]:
-            msg_surface = self.font.render(line, True, BLACK)
-            self.screen.blit(msg_surface, (panel_x + 10, y_offset))
+            msg_surface = render_text(line, 22, BLACK)
+            self.screen.blit(msg_surface, (self.panel_rect.x + 10, y_offset))
             y_offset += 24
 
-        # Center button area or placement message
-        if self.phase == "placement":
-            self.show_snakes_left_message()
-        elif self.pending and self.phase == "battle" and self.turn_idx == 0:
-            pygame.draw.rect(self.screen, GREEN_BTN, self.yes_btn)
-            label = self.font.render("Attack Here?", True, WHITE)
-            self.screen.blit(label, label.get_rect(center=self.yes_btn.center))
-        ################
         # Always show Quit button
         pygame.draw.rect(self.screen, RED, self.quit_btn)
-        quit_text = self.font.render("Quit", True, WHITE)
+        quit_text = render_text("Quit", 22, WHITE)
         self.screen.blit(quit_text, quit_text.get_rect(center=self.quit_btn.center))
 
         # Always show Main Menu button
         pygame.draw.rect(self.screen, GRAY, self.main_menu_btn)
-        main_menu_text = self.font.render("Main Menu", True, WHITE)
+        main_menu_text = render_text("Main Menu", 22, WHITE)
         self.screen.blit(main_menu_text, main_menu_text.get_rect(center=self.main_menu_btn.center))
-        #####################
+
+        if self.over:
+            self.draw_end_buttons()
+
+    def draw_status_strip(self):
+        """The strip between the boards: placement count, attack button,
+        result text and hit/miss popups."""
+        self.screen.set_clip(self.strip_rect)
+        self.screen.fill(WHITE, self.strip_rect)
+        if self.phase == "placement":
+            self.show_snakes_left_message()
+        elif self.pending and self.phase == "battle" and self.turn_idx == 0:
+            pygame.draw.rect(self.screen, GREEN_BTN, self.yes_btn)
+            label = render_text("Attack Here?", 22, WHITE)
+            self.screen.blit(label, label.get_rect(center=self.yes_btn.center))
+        if self.over:
+            self.show_result_message()
+        popup = self.current_popup()
+        if popup:
+            self.show_popup_message(popup)
+        self.screen.set_clip(None)
 
     def show_snakes_left_message(self):
         """Show how many snakes left to place during placement phase."""
         snakes_left = self.snakes_each - len(self.user.snakes)
-        big_font = pygame.font.SysFont(None, 48)
         message = f"Snakes Left: {snakes_left}"
         color = (0, 180, 0) if snakes_left > 0 else (180, 0, 0)
-        surf = big_font.render(message, True, color)
-        rect = surf.get_rect(center=(self.left_x + (self.cols * CELL) // 2, self.top_rect.bottom + 30))
+        surf = render_text(message, 48, color)
+        rect = surf.get_rect(center=(self.top_rect.centerx, self.top_rect.bottom + 30))
         self.screen.blit(surf, rect)
 
+    def current_popup(self) -> str | None:
+        """Hit/miss popup to show right now; each one lasts a second."""
+        now = pygame.time.get_ticks()
+        if self.last_hit_message and now - self.hit_timer < POPUP_MS:
+            return self.last_hit_message
+        if self.popup_bot_shots and self.bot_last_hit_message and now - self.hit_timer < POPUP_MS:
+            return self.bot_last_hit_message
+        self.last_hit_message = None
+        self.bot_last_hit_message = None
+        return None
 
-    def draw(self):
-        self.screen.fill(WHITE)
-        self.screen.fill(WHITE, (0, 0, self.left_x, self.screen.get_height()))
-        self.screen.blit(self.logo, (0, 0))
-        self.draw_grid(self.top_rect)
-        self.draw_grid(self.bot_rect)
+    def _state_stamp(self) -> tuple:
+        """Cheap fingerprint of everything that can change a board cell."""
+        return (self.phase, len(self.user.snakes), self.turns_taken, self.pending,
+                self.bot_last_guess, getattr(self, "last_guess", None),
+                len(self.user.hits), len(self.user.misses),
+                len(self.bot.hits), len(self.bot.misses))
 
-        if self.phase == "placement":
-            self.draw_snakes(self.bot_rect, self.user)
-        else:
-            self.draw_snakes(self.bot_rect, self.user)
-            self.draw_snakes(self.top_rect, self.bot)
-            self.draw_attacks(self.top_rect, self.user)
-            self.draw_attacks(self.bot_rect, self.bot)
-            if self.pending:
-                x, y = self.pending
-                pygame.draw.rect(self.screen, (255, 215, 0),
-                                (self.top_rect.x + x * CELL + 2,
-                                self.top_rect.y + y * CELL + 2,
-                                CELL - 4, CELL - 4), 3)
-
-        self.draw_panel()
+    def _panel_key(self) -> tuple:
+        return tuple(self.messages[-8:]), self.over
 
-        if self.over:
-            self.draw_end_buttons()
+    def _strip_key(self) -> tuple:
+        return (self.phase, len(self.user.snakes), self.pending, self.over,
+                self.end_winner, self.current_popup())
 
-        now = pygame.time.get_ticks()
-        if self.last_hit_message and now - self.hit_timer < 1000:
-            self.show_popup_message(self.last_hit_message)
-        elif self.bot_last_hit_message and now - self.hit_timer < 1000:
-            self.show_popup_message(self.bot_last_hit_message)
-        else:
-            self.last_hit_message = None
-            self.bot_last_hit_message = None
-        pygame.display.flip()
+    @timed("draw")
+    def draw(self):
+        """Repaint only what changed since the last frame.
+
+        The first frame (or one after force_redraw is set) paints everything
+        and flips; later frames redraw changed cells in view (both views
+        whole after a zoom or scroll), the panel, minimaps and status strip,
+        and push just those rects with display.update().
+        """
+        if self.force_redraw or self._drawn_looks is None:
+            self.force_redraw = False
+            self.screen.fill(WHITE)
+            self.screen.blit(self.logo, (0, 0))
+            self._drawn_looks = {}
+            self._drawn_camera = self.camera.state()
+            self.board_bg = self._build_board_background()
+            for rect in (self.top_rect, self.bot_rect):
+                looks = self.board_looks(rect)
+                self.draw_board(rect, looks)
+                self.build_minimap(rect, looks)
+                self._drawn_looks[rect.y] = looks
+            self.draw_panel()
+            self.draw_minimaps()
+            self.draw_status_strip()
+            if self.show_stats:
+                self.draw_stats_overlay()
+            self._drawn_stamp = self._state_stamp()
+            self._drawn_panel = self._panel_key()
+            self._drawn_strip = self._strip_key()
+            pygame.display.flip()
+            if STATS:
+                instrument.frame()
+            return
 
-    def check_game_over(self):
-        if self.user.is_defeated():
-            self.messages.append("Bot wins! Game over.")
-            self.over = True
-            self.end_winner = "Bot"
-        elif self.bot.is_defeated():
-            self.messages.append("You win! Game over.")
-            self.over = True
-            self.end_winner = "Player"
+        dirty: List[pygame.Rect] = []
+        minimaps_stale = False
+        camera = self.camera.state()
+        if camera != self._drawn_camera:
+            self._drawn_camera = camera
+            self.board_bg = self._build_board_background()
+            for rect in (self.top_rect, self.bot_rect):
+                self.draw_board(rect, self._drawn_looks[rect.y])
+                dirty.append(self.view_clip(rect))
+            minimaps_stale = True
+        stamp = self._state_stamp()
+        if stamp != self._drawn_stamp:
+            self._drawn_stamp = stamp
+            for rect in (self.top_rect, self.bot_rect):
+                old = self._drawn_looks[rect.y]
+                new = self.board_looks(rect)
+                changed = [cell for cell in old.keys() | new.keys()
+                           if old.get(cell, PLAIN_CELL) != new.get(cell, PLAIN_CELL)]
+                for cell in changed:
+                    painted = self.draw_cell(rect, cell, new.get(cell, PLAIN_CELL))
+                    if painted is not None:
+                        dirty.append(painted)
+                self.update_minimap(rect, new, changed)
+                minimaps_stale = minimaps_stale or bool(changed) and self.camera.scrolls()
+                self._drawn_looks[rect.y] = new
+
+        panel = self._panel_key()
+        if panel != self._drawn_panel:
+            self._drawn_panel = panel
+            self.draw_panel()
+            self.draw_minimaps()
+            dirty.append(self.panel_rect)
+        elif minimaps_stale:
+            self.draw_minimaps()
+            dirty.append(self.minimap_area)
+        if self.show_stats:
+            self.draw_stats_overlay()
+            dirty.append(self.stats_rect)
+
+        strip = self._strip_key()
+        if strip != self._drawn_strip:
+            self._drawn_strip = strip
+            self.draw_status_strip()
+            dirty.append(self.strip_rect)
+
+        if dirty:
+            pygame.display.update(dirty)
+            if STATS:
+                instrument.count("rects_updated", len(dirty))
+                instrument.frame()
+
+    def draw_stats_overlay(self):
+        """FPS and recent per-phase timings (see instrument.py)."""
+        self.screen.set_clip(self.stats_rect)
+        self.screen.fill(PANEL_BG, self.stats_rect)
+        y = self.stats_rect.y + 4
+        for line in instrument.overlay_lines():
+            self.screen.blit(render_text(line, 18, (90, 90, 90)), (self.stats_rect.x + 10, y))
+            y += 17
+        self.screen.set_clip(None)
 
     def show_popup_message(self, text):
-        big_font = pygame.font.SysFont(None, 48)
         if "HIT" in text:
             color = (0, 180, 0)
         else:
             color = (180, 0, 0)
-        surf = big_font.render(text, True, color)
-        rect = surf.get_rect(center=(self.left_x + (self.cols * CELL) // 2, self.top_rect.bottom + 30))
+        surf = render_text(text, 48, color)
+        rect = surf.get_rect(center=(self.top_rect.centerx, self.top_rect.bottom + 30))
         self.screen.blit(surf, rect)
 
     def draw_end_buttons(self):
@@ -428,35 +613,111 @@ class BaseGame:
 ############
         pygame.draw.rect(self.screen, GRAY, self.main_menu_btn)
 ##############
-        again_text = self.font.render("Play Again", True, WHITE)
-        quit_text = self.font.render("Quit", True, WHITE)
+        again_text = render_text("Play Again", 22, WHITE)
+        quit_text = render_text("Quit", 22, WHITE)
 ###########
-        menu_text = self.font.render("Main Menu", True, WHITE)
+        menu_text = render_text("Main Menu", 22, WHITE)
 ###########
         self.screen.blit(again_text, again_text.get_rect(center=self.play_again_btn.center))
         self.screen.blit(quit_text, quit_text.get_rect(center=self.quit_btn.center))
 ###########
         self.screen.blit(menu_text, menu_text.get_rect(center=self.main_menu_btn.center))
 ###########
+
+    def show_result_message(self):
         # Centered Win/Lose Message (where "Attack Here?" normally is)
-        if hasattr(self, "end_winner"):
-            big_font = pygame.font.SysFont(None, 48)
+        if self.end_winner:
             if self.end_winner == "Player":
-                result_text = big_font.render("You Win!", True, (0, 180, 0))
+                result_text = render_text("You Win!", 48, (0, 180, 0))
             else:
-                result_text = big_font.render("Bot Wins!", True, (200, 0, 0))
+                result_text = render_text("Bot Wins!", 48, (200, 0, 0))
 
             # Use the same center as yes_btn
             self.screen.blit(result_text, result_text.get_rect(center=self.yes_btn.center))
 
-    def reset_game(self):
-        settings = load_settings()
-        self.__init__(settings, self.user.name)
-
-    def play(self):
-        clock = pygame.time.Clock()
-        running = True
-        while running:
+    # ── camera controls ──
+    def board_under(self, pos) -> pygame.Rect | None:
+        for rect in (self.top_rect, self.bot_rect):
+            if rect.collidepoint(pos):
+                return rect
+        return None
+
+    def camera_key(self, key: int):
+        """Arrows scroll a quarter of the view, +/- zoom, Home shows the
+        whole board."""
+        cam = self.camera
+        step_x, step_y = cam.view_w // 4, cam.view_h // 4
+        moves = {pygame.K_LEFT: (-step_x, 0), pygame.K_RIGHT: (step_x, 0),
+                 pygame.K_UP: (0, -step_y), pygame.K_DOWN: (0, step_y)}
+        if key in moves:
+            cam.pan(*moves[key])
+        elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            cam.zoom(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            cam.zoom(-1)
+        elif key == pygame.K_HOME:
+            cam.fit()
+
+    def ms_until_next_timer(self) -> int:
+        """How long play() may sleep before a timer is due; 0 means nothing
+        is scheduled, so it can wait for input indefinitely."""
+        due = []
+        if self.bot_attack_pending:
+            # Past the delay, poll until a thinking bot has its answer.
+            due.append(max(self.bot_attack_timer + BOT_DELAY_MS, pygame.time.get_ticks() + 15)
+                       if self.bot_thinking() else self.bot_attack_timer + BOT_DELAY_MS)
+        if self.last_hit_message or self.bot_last_hit_message:
+            due.append(self.hit_timer + POPUP_MS)
+        if self.show_stats:
+            due.append(pygame.time.get_ticks() + 500)  # keep the overlay's numbers fresh
+        if not due:
+            return 0
+        return max(1, min(due) - pygame.time.get_ticks())
+
+    def bot_thinking(self) -> bool:
+        """A search bot (search.py) is still working on its shot."""
+        return not getattr(self.bot_ai, "ready", lambda: True)()
+
+    def snapshot_extras(self) -> dict:
+        now = pygame.time.get_ticks()
+        return {**super().snapshot_extras(),
+                "pending": self.pending, "messages": self.messages,
+                "last_hit_message": self.last_hit_message,
+                "bot_last_hit_message": self.bot_last_hit_message,
+                "popup_age_ms": now - self.hit_timer,
+                "bot_attack_pending": self.bot_attack_pending,
+                "bot_attack_age_ms": now - self.bot_attack_timer,
+                "score_saved": hasattr(self, "score_saved")}
+
+    def restore_extras(self, extras: dict):
+        super().restore_extras(extras)
+        now = pygame.time.get_ticks()
+        self.pending = tuple(extras["pending"]) if extras["pending"] else None
+        self.messages = list(extras["messages"])
+        self.last_hit_message = extras["last_hit_message"]
+        self.bot_last_hit_message = extras["bot_last_hit_message"]
+        self.hit_timer = now - extras["popup_age_ms"]
+        self.bot_attack_pending = extras["bot_attack_pending"]
+        self.bot_attack_timer = now - extras["bot_attack_age_ms"]
+        start_search = getattr(self.bot_ai, "start_search", None)
+        if self.bot_attack_pending and start_search is not None and self.book_target() is None:
+            start_search()
+        if extras["score_saved"]:
+            self.score_saved = True
+        elif hasattr(self, "score_saved"):
+            del self.score_saved
+        self.force_redraw = True
+
+    def play(self) -> str:
+        """Event-driven loop: sleep in pygame.event.wait() until input
+        arrives or the next timer (bot attack, popup expiry) is due, and
+        let the retained-mode draw() repaint only what changed.
+
+        Returns how the player left: "quit", "menu" (the game is suspended
+        to SUSPEND_FILE if unfinished) or "again" for a new game; the caller
+        (main.py's game scene) decides what comes next.
+        """
+        while True:
             self.draw()
 
 ###############################
@@ -466,51 +727,60 @@ class BaseGame:
                 self.score_saved = True
 ###############################
 
-            if self.force_redraw:
-                self.force_redraw = False  # reset flag
-
             # Handle delayed bot attack
-            if self.bot_attack_pending and pygame.time.get_ticks() - self.bot_attack_timer >= 1000:
-                self.bot_take_shot()
-                self.check_game_over()
-                if not self.over:
-                    self.snakes_move_phase()
-                    self.turns_taken += 1
+            if (self.bot_attack_pending and pygame.time.get_ticks() - self.bot_attack_timer >= BOT_DELAY_MS
+                    and not self.bot_thinking()):
+                self.bot_turn()
                 self.bot_attack_pending = False
+                continue  # show the bot's shot before sleeping again
 
-            pygame.display.flip()
-
-            for e in pygame.event.get():
+            events = [pygame.event.wait(self.ms_until_next_timer())] + pygame.event.get()
+            for e in events:
                 if e.type == pygame.QUIT:
-                    running = False
+                    return "quit"
+
+                elif e.type == pygame.KEYDOWN and e.key == pygame.K_F3 and STATS:
+                    self.show_stats = not self.show_stats
+                    self.force_redraw = True
+
+                elif e.type == pygame.KEYDOWN:
+                    self.camera_key(e.key)
+
+                elif e.type == pygame.MOUSEWHEEL:
+                    pos = pygame.mouse.get_pos()
+                    rect = self.board_under(pos)
+                    if rect is not None:
+                        self.camera.zoom(e.y, (pos[0] - rect.x, pos[1] - rect.y))
+
+                elif e.type == pygame.MOUSEMOTION and (e.buttons[1] or e.buttons[2]):
+                    # Middle- or right-drag on a board scrolls it.
+                    if self.board_under(e.pos) is not None:
+                        self.camera.pan(-e.rel[0], -e.rel[1])
 
                 elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
                     if self.quit_btn.collidepoint(e.pos):
-                        running = False
+                        return "quit"
                     elif self.over and self.play_again_btn.collidepoint(e.pos):
-                        self.reset_game()
+                        return "again"
 #################################
                     elif self.main_menu_btn.collidepoint(e.pos):
-                        pygame.mixer.quit()  # if using sound, clean up
-                        self.over = True     # optional: flag to exit cleanly
-                        from main import run_gui_launcher
-                        run_gui_launcher()
-                        return
+                        if not self.over:
+                            from snapshot import save_file
+                            save_file(self, SUSPEND_FILE)
+                        return "menu"
 #############################
+                    elif self.minimap_cell(e.pos) is not None:
+                        self.camera.center_on(*self.minimap_cell(e.pos))
+
                     elif self.phase == "placement" and self.bot_rect.collidepoint(e.pos):
-                        gx = (e.pos[0] - self.bot_rect.x) // CELL
-                        gy = (e.pos[1] - self.bot_rect.y) // CELL
-                        self.handle_placement_click(gx, gy)
+                        cell = self.cell_at(self.bot_rect, e.pos)
+                        if cell is not None:
+                            self.handle_placement_click(*cell)
 
                     elif self.phase == "battle":
                         if self.yes_btn.collidepoint(e.pos) and self.pending:
                             self.confirm_attack()
                         elif self.top_rect.collidepoint(e.pos):
-                            gx = (e.pos[0] - self.top_rect.x) // CELL
-                            gy = (e.pos[1] - self.top_rect.y) // CELL
-                            self.handle_attack_click(gx, gy)
-
-            clock.tick(30)
-
-        pygame.quit()
-        sys.exit()
+                            cell = self.cell_at(self.top_rect, e.pos)
+                            if cell is not None:
+                                self.handle_attack_click(*cell)
@@ -0,0 +1,127 @@
+# ai.py – probability-density bot that hunts the user's snakes (needs numpy)
+from functools import lru_cache
+
+import numpy as np
+
+from engine import Coord, GameEngine
+from topology import Topology
+
+
+@lru_cache(maxsize=8)
+def neighbour_index(topo: Topology) -> np.ndarray:
+    """topo's neighbour table as a (cells, directions) array, with index
+    `size` (one past the last cell) where there is no neighbour."""
+    nbrs = np.frombuffer(topo.table, dtype=np.intc).astype(np.intp).reshape(topo.size, topo.degree)
+    nbrs[nbrs < 0] = topo.size
+    return nbrs
+
+
+def _neighbour_sum(a: np.ndarray, out: np.ndarray, topo: Topology) -> np.ndarray:
+    """out[y, x] = sum of a over the neighbours of (x, y) (zero off-board)."""
+    if topo.name == "rect":
+        out.fill(0)
+        out[1:, :] += a[:-1, :]
+        out[:-1, :] += a[1:, :]
+        out[:, 1:] += a[:, :-1]
+        out[:, :-1] += a[:, 1:]
+        return out
+    padded = np.zeros(topo.size + 1, dtype=a.dtype)
+    padded[:-1] = a.ravel()
+    np.sum(padded[neighbour_index(topo)], axis=1, out=out.reshape(-1))
+    return out
+
+
+class HeatmapAI:
+    """Bot targeting from a per-cell estimate of how many user snakes are there.
+
+    `heat` always sums to the number of user snakes still alive. Each bot shot
+    zeroes its cell and renormalises; each move phase diffuses the heat one
+    step (to the board's neighbours; see topology.py), split evenly over the cells a snake may enter (the rule
+    in Snake.default_move). Snakes with nowhere to go keep their mass.
+    Enable with settings["bot_ai"] = "heatmap", or assign game.bot_ai.
+    """
+
+    def __init__(self, game: GameEngine):
+        self.game = game
+        shape = (game.rows, game.cols)
+        self.remaining = game.snakes_each
+        self.heat = np.full(shape, self.remaining / (game.rows * game.cols))
+        self.safe = np.ones(shape)  # 1.0 where user snakes may move, 0.0 if attacked
+        self.degree = np.empty(shape)
+        self._scratch = np.empty(shape)
+        self._bot_dead = [False] * game.snakes_each
+        self._update_degree()
+
+    def copy(self, game: GameEngine) -> "HeatmapAI":
+        """This AI's beliefs, attached to `game` (a GameEngine.copy())."""
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.game = game
+        for name in ("heat", "safe", "degree", "stuck", "inv_degree"):
+            setattr(new, name, getattr(self, name).copy())
+        new._scratch = np.empty_like(self._scratch)
+        new._bot_dead = self._bot_dead[:]
+        return new
+
+    def config(self) -> dict:
+        """The settings entries that recreate this bot (for replays and snapshots)."""
+        return {"bot_ai": "heatmap"}
+
+    def _update_degree(self):
+        _neighbour_sum(self.safe, self.degree, self.game.topology)
+        self.stuck = self.degree == 0
+        self.inv_degree = np.divide(1.0, self.degree, out=np.zeros_like(self.degree),
+                                    where=~self.stuck)
+
+    def _mark_unsafe(self, xy: Coord) -> bool:
+        x, y = xy
+        if self.game.is_dangerous(self.game.user, xy) and self.safe[y, x]:
+            self.safe[y, x] = 0.0
+            return True
+        return False
+
+    def _normalise(self):
+        total = self.heat.sum()
+        if total > 0:
+            self.heat *= self.remaining / total
+        elif self.remaining:
+            # Our model lost track (e.g. a snake stayed put when boxed in by
+            # other snakes); fall back to a uniform guess over safe cells.
+            self.heat[:] = self.safe * (self.remaining / max(self.safe.sum(), 1.0))
+
+    # ── hooks called by GameEngine ──
+    def choose_target(self) -> Coord:
+        flat = self.heat.ravel()
+        best = flat.max()
+        if best <= 0:
+            return self.game.bot_targets.pop_random(self.game.rng)
+        candidates = np.flatnonzero(flat >= best * (1 - 1e-9))
+        i = int(candidates[self.game.rng.randrange(len(candidates))])
+        return i % self.game.cols, i // self.game.cols
+
+    def observe_shot(self, xy: Coord, hit: bool):
+        x, y = xy
+        self.heat[y, x] = 0.0
+        if hit:
+            self.remaining = len(self.game.user.alive_snakes())
+        if self._mark_unsafe(xy):
+            self._update_degree()
+        self._normalise()
+
+    def observe_move(self):
+        # Some rules (Hard) also keep snakes off cells where the user killed a
+        # bot snake; pick those up as they appear.
+        changed = False
+        for i, s in enumerate(self.game.bot.snakes):
+            if not s.alive and not self._bot_dead[i]:
+                self._bot_dead[i] = True
+                changed |= self._mark_unsafe(s.xy)
+        if changed:
+            self._update_degree()
+
+        share = np.multiply(self.heat, self.inv_degree, out=self._scratch)
+        moved = _neighbour_sum(share, np.empty_like(share), self.game.topology)
+        moved *= self.safe
+        moved += self.heat * self.stuck
+        self.heat = moved
+        self._normalise()
@@ -0,0 +1,159 @@
+# assets.py – process-wide fonts, rendered-text cache and image atlas for the pygame UI
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+Colour = Tuple[int, int, int]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(HERE, ".asset_cache")  # packed, pre-scaled atlases; safe to delete
+ATLAS_VERSION = 1
+
+# (name, file in the game folder, (width, height or None to keep the aspect), smooth scaling)
+ImageSpec = Tuple[str, str, Tuple[int, Optional[int]], bool]
+
+
+def init():
+    """Start the pygame modules the UI uses. Cheaper than pygame.init(),
+    which also opens audio, joysticks and the rest; a no-op once they're up,
+    so every screen and game can call it."""
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+@lru_cache(maxsize=None)
+def font(size: int) -> pygame.font.Font:
+    """The default system font at `size`, created once per process."""
+    return pygame.font.SysFont(None, size)
+
+
+@lru_cache(maxsize=512)
+def render_text(text: str, size: int, colour: Colour) -> pygame.Surface:
+    """Antialiased text surface, cached by (text, size, colour).
+
+    The surface is shared between callers, so blit it but never draw on it.
+    """
+    return font(size).render(text, True, colour)
+
+
+class Atlas:
+    """Every image in a set, pre-scaled and packed into one sheet.
+
+    Sizes are known straight away; get() hands out pieces of the sheet,
+    converted to the display's pixel format the first time they're asked
+    for with a display mode set (convert() for opaque images, so they blit
+    without blending, convert_alpha() for the rest).
+    """
+
+    def __init__(self, sheet: pygame.Surface, rects: Dict[str, Tuple[int, int, int, int]],
+                 opaque: Dict[str, bool]):
+        self.sheet = sheet
+        self.rects = {name: pygame.Rect(r) for name, r in rects.items()}
+        self.opaque = opaque
+        self._converted: Dict[str, pygame.Surface] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.rects
+
+    def size(self, name: str) -> Tuple[int, int]:
+        return self.rects[name].size
+
+    def get(self, name: str) -> pygame.Surface:
+        """The image as a surface to blit from; never draw on it."""
+        surf = self._converted.get(name)
+        if surf is None:
+            surf = self.sheet.subsurface(self.rects[name])
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert() if self.opaque[name] else surf.convert_alpha()
+                self._converted[name] = surf
+        return surf
+
+
+def _scaled(path: str, size: Tuple[int, Optional[int]], smooth: bool) -> pygame.Surface:
+    img = pygame.image.load(path)
+    w, h = size
+    if h is None:
+        h = int(img.get_height() * w / img.get_width())
+    return (pygame.transform.smoothscale if smooth else pygame.transform.scale)(img, (w, h))
+
+
+def _pack(images: Dict[str, pygame.Surface]) -> Tuple[pygame.Surface, Dict[str, Tuple[int, int, int, int]]]:
+    """Shelf-pack images, tallest first, into one transparent sheet."""
+    width = max([64] + [img.get_width() for img in images.values()])
+    rects, x, y, shelf = {}, 0, 0, 0
+    for name, img in sorted(images.items(), key=lambda kv: -kv[1].get_height()):
+        w, h = img.get_size()
+        if x + w > width:
+            x, y, shelf = 0, y + shelf + 1, 0
+        rects[name] = (x, y, w, h)
+        x, shelf = x + w + 1, max(shelf, h)
+    sheet = pygame.Surface((width, max(y + shelf, 1)), pygame.SRCALPHA, 32)
+    sheet.fill((0, 0, 0, 0))
+    for name, img in images.items():
+        # MAX onto a cleared sheet copies the pixels, alpha included, where a
+        # normal blit would blend the edges of transparent images into it.
+        sheet.blit(img, rects[name][:2], special_flags=pygame.BLEND_RGBA_MAX)
+    return sheet, rects
+
+
+@lru_cache(maxsize=8)
+def atlas(specs: Tuple[ImageSpec, ...]) -> Atlas:
+    """The atlas for `specs`, built once per process.
+
+    Built atlases are also saved under CACHE_DIR as raw RGBA, keyed by the
+    specs and the source files' sizes and timestamps, so later runs read one
+    small sheet instead of decoding and scaling every full-size PNG. Missing
+    source files are left out with a warning.
+    """
+    sources = {}
+    for name, filename, _, _ in specs:
+        path = os.path.join(HERE, filename)
+        try:
+            st = os.stat(path)
+            sources[name] = (path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            print(f"Warning: missing image {filename}")
+    key = hashlib.md5(json.dumps([ATLAS_VERSION, specs, sources]).encode()).hexdigest()[:16]
+    sheet_path = os.path.join(CACHE_DIR, f"atlas-{key}.rgba")
+    index_path = os.path.join(CACHE_DIR, f"atlas-{key}.json")
+    opaque = {}
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        with open(sheet_path, "rb") as f:
+            sheet = pygame.image.frombytes(f.read(), tuple(index["size"]), "RGBA")
+        return Atlas(sheet, index["rects"], index["opaque"])
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+
+    images = {}
+    for name, _, size, smooth in specs:
+        if name in sources:
+            img = _scaled(sources[name][0], size, smooth)
+            images[name] = img
+            opaque[name] = not img.get_flags() & pygame.SRCALPHA
+    sheet, rects = _pack(images)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for path, data in ((sheet_path, pygame.image.tobytes(sheet, "RGBA")),
+                           (index_path, json.dumps({"size": sheet.get_size(), "rects": rects,
+                                                    "opaque": opaque}).encode())):
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+    except (OSError, pygame.error):
+        pass  # read-only install: just build it again next run
+    return Atlas(sheet, rects, opaque)
+
+
+def clear():
+    """Drop cached fonts, text and images; call after pygame.quit()/pygame.init()."""
+    render_text.cache_clear()
+    font.cache_clear()
+    atlas.cache_clear()
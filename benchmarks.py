@@ -0,0 +1,323 @@
+# benchmarks.py – timing harness for engine throughput, rendering, startup and scores
+#
+#   python benchmarks.py --json bench.json            # full run, machine-readable
+#   python benchmarks.py --quick                      # small sizes, table only
+#   python benchmarks.py --compare bench.json         # flag regressions vs. a saved run
+#   python benchmarks.py --only engine scores         # pick groups
+#
+# The draw and startup groups need pygame and run under SDL's dummy video
+# driver; they are skipped when pygame is not installed.
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+FULL_SIZES = [(10, 10), (50, 50), (100, 100), (200, 200), (500, 500)]
+QUICK_SIZES = [(10, 10), (100, 100)]
+FULL_SNAKES = [7, 100, 1000]
+QUICK_SNAKES = [7, 100]
+
+
+def measure(name: str, fn: Callable[[], object], params: dict,
+            min_time: float, max_rounds: int = 10000) -> dict:
+    """Call fn repeatedly for about min_time seconds and summarise the timings."""
+    times: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < max_rounds and (len(times) < 3 or time.perf_counter() < deadline):
+        t = time.perf_counter()
+        if fn() is StopIteration:
+            break
+        times.append(time.perf_counter() - t)
+    return {"name": name, "params": params, "unit": "s", "rounds": len(times),
+            "min": min(times), "max": max(times), "mean": statistics.fmean(times),
+            "median": statistics.median(times),
+            "stddev": statistics.stdev(times) if len(times) > 1 else 0.0}
+
+
+# ─────── groups ───────────────────────────────────────────────────────────
+def bench_engine(quick: bool, min_time: float) -> List[dict]:
+    from bitboard import bitboard_engine
+    from engine import CellPool, RegularEngine
+    from patterns import kernel
+    from vecenv import VectorEnv
+
+    results = []
+    for rows, cols in QUICK_SIZES if quick else FULL_SIZES:
+        for snakes in QUICK_SNAKES if quick else FULL_SNAKES:
+            if snakes * 2 > rows * cols:
+                continue
+            for backend, cls, rule in (("sets", RegularEngine, "sequential"),
+                                       ("bits", bitboard_engine(RegularEngine), "sequential"),
+                                       ("vector", RegularEngine, "simultaneous")):
+                random.seed(0)
+                game = cls({"rows": rows, "cols": cols, "snakes_per_player": snakes,
+                            "move_rule": rule})
+                free = CellPool(rows, cols)
+                while game.phase == "placement":
+                    game.place_snake(*free.pop_random())
+                params = {"rows": rows, "cols": cols, "snakes": snakes, "backend": backend}
+
+                results.append(measure("snakes_move_phase", game.snakes_move_phase, params, min_time))
+
+                targets = CellPool(rows, cols)
+                def user_attack():
+                    if not targets:
+                        return StopIteration
+                    game.user_attack(targets.pop_random())
+                results.append(measure("confirm_attack", user_attack, params, min_time))
+                if backend != "vector":
+                    # A 13-cell diamond: the whole shot resolves in one call.
+                    single, game.pattern = game.pattern, kernel("diamond", game.topology)
+                    targets = CellPool(rows, cols)
+                    results.append(measure("pattern_attack", user_attack,
+                                           {**params, "pattern": "diamond"}, min_time))
+                    game.pattern = single
+                results.append(measure("bot_take_shot", game.bot_take_shot, params, min_time))
+            for shape in ("torus", "hex"):
+                random.seed(0)
+                game = RegularEngine({"rows": rows, "cols": cols, "snakes_per_player": snakes,
+                                      "topology": shape})
+                free = CellPool(rows, cols)
+                while game.phase == "placement":
+                    game.place_snake(*free.pop_random())
+                results.append(measure("snakes_move_phase", game.snakes_move_phase,
+                                       {"rows": rows, "cols": cols, "snakes": snakes,
+                                        "backend": "sets", "topology": shape}, min_time))
+            # A whole turn of many games at once; as many as keep the arrays small.
+            games = min(4096, 4_000_000 // (rows * cols))
+            env = VectorEnv(games, {"rows": rows, "cols": cols, "snakes_per_player": snakes}, seed=0)
+            env.reset()
+            results.append(measure("vector_env_step", lambda: env.step(env.random_actions()),
+                                   {"rows": rows, "cols": cols, "snakes": snakes, "games": games},
+                                   min_time))
+    return results
+
+
+def bench_draw(quick: bool, min_time: float) -> List[dict]:
+    from Difficulty import RegularGame
+
+    results = []
+    # Past the window size only the cells in view are drawn, so 200x200 and
+    # 500x500 should cost about what 40x40 does.
+    sizes = [(10, 10), (20, 20), (100, 100)] if quick else [(10, 10), (20, 20), (40, 40), (200, 200), (500, 500)]
+    for rows, cols in sizes:
+        random.seed(0)
+        game = RegularGame({"rows": rows, "cols": cols, "snakes_per_player": 7})
+        while game.phase == "placement":
+            game.handle_placement_click(random.randrange(cols), random.randrange(rows))
+        game.draw()
+        params = {"rows": rows, "cols": cols}
+
+        def full():
+            game.force_redraw = True
+            game.draw()
+        results.append(measure("draw_full", full, params, min_time))
+        results.append(measure("draw_idle", game.draw, params, min_time))
+
+        def scroll():
+            # Arrow-key steps, turning back at the edges of the board.
+            before = game.camera.state()
+            game.camera.pan(scroll.dx, scroll.dx)
+            if game.camera.state() == before:
+                scroll.dx = -scroll.dx
+                game.camera.pan(scroll.dx, scroll.dx)
+            game.draw()
+        scroll.dx = game.camera.view_w // 4
+        results.append(measure("draw_scroll", scroll, params, min_time))
+        # What "Play Again" costs: a new game in a process that has had one.
+        settings = {"rows": rows, "cols": cols, "snakes_per_player": 7}
+        results.append(measure("game_init", lambda: RegularGame(settings), params, min_time))
+
+        def turn():
+            if game.over:
+                return StopIteration
+            game.handle_attack_click(random.randrange(cols), random.randrange(rows))
+            game.confirm_attack()
+            game.bot_attack_pending = False
+            if not game.over:
+                game.bot_turn()
+            t = time.perf_counter()
+            game.draw()
+            turn.elapsed = time.perf_counter() - t
+        # Time only the draw() after each turn, not the turn itself.
+        samples = []
+        while len(samples) < 50 and turn() is not StopIteration:
+            samples.append(turn.elapsed)
+        if samples:
+            results.append({"name": "draw_after_turn", "params": params, "unit": "s",
+                            "rounds": len(samples), "min": min(samples), "max": max(samples),
+                            "mean": statistics.fmean(samples), "median": statistics.median(samples),
+                            "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0})
+    return results
+
+
+STARTUP_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import main
+draw = main.draw_launcher
+def first_frame(*args):
+    draw(*args)
+    print(time.perf_counter() - t0)
+    raise SystemExit
+main.draw_launcher = first_frame
+main.run_gui_launcher()
+"""
+
+
+FIRST_GAME_SCRIPT = """
+import time
+from Difficulty import RegularGame
+t0 = time.perf_counter()
+RegularGame({"rows": 10, "cols": 10, "snakes_per_player": 7})
+print(time.perf_counter() - t0)
+"""
+
+
+def bench_startup(quick: bool, min_time: float) -> List[dict]:
+    """`import main` to first launcher frame, and opening the first game,
+    in fresh interpreters (with the image atlas already on disk)."""
+    times, wall, first_game = [], [], []
+    subprocess.run([sys.executable, "-c", FIRST_GAME_SCRIPT], cwd=HERE, capture_output=True, check=True)
+    for _ in range(3 if quick else 10):
+        t = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout
+        wall.append(time.perf_counter() - t)
+        times.append(float(out.strip().splitlines()[-1]))
+        out = subprocess.run([sys.executable, "-c", FIRST_GAME_SCRIPT], cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout
+        first_game.append(float(out.strip().splitlines()[-1]))
+    results = []
+    for name, samples in (("startup_import_to_first_frame", times), ("startup_process_wall", wall),
+                          ("startup_first_game_init", first_game)):
+        results.append({"name": name, "params": {}, "unit": "s", "rounds": len(samples),
+                        "min": min(samples), "max": max(samples),
+                        "mean": statistics.fmean(samples), "median": statistics.median(samples),
+                        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0})
+    return results
+
+
+def bench_scores(quick: bool, min_time: float) -> List[dict]:
+    import sqlite3
+    import score_manager
+
+    results = []
+    saved = score_manager.SCORES_DB, score_manager.SCORES_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            score_manager.SCORES_FILE = os.path.join(tmp, "no_legacy_scores.txt")
+            for n in [100, 10000] if quick else [100, 10000, 100000, 1000000]:
+                score_manager.close()
+                score_manager.SCORES_DB = os.path.join(tmp, f"scores_{n}.db")
+                score_manager.top_scores(1)  # create the schema
+                with sqlite3.connect(score_manager.SCORES_DB) as conn:
+                    conn.executemany("INSERT INTO scores VALUES (?, ?)",
+                                     ((f"user{i}", i % 50) for i in range(n)))
+                last = f"user{n - 1}"
+                results.append(measure("update_score", lambda: score_manager.update_score(last, 1),
+                                       {"entries": n}, min_time, max_rounds=2000))
+                results.append(measure("top_scores", lambda: score_manager.top_scores(10),
+                                       {"entries": n}, min_time, max_rounds=2000))
+        finally:
+            score_manager.close()
+            score_manager.SCORES_DB, score_manager.SCORES_FILE = saved
+    return results
+
+
+GROUPS: Dict[str, Callable[[bool, float], List[dict]]] = {
+    "engine": bench_engine,
+    "draw": bench_draw,
+    "startup": bench_startup,
+    "scores": bench_scores,
+}
+NEEDS_PYGAME = {"draw", "startup"}
+
+
+# ─────── reporting ────────────────────────────────────────────────────────
+def label(r: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in r["params"].items())
+    return f"{r['name']}[{params}]" if params else r["name"]
+
+
+def print_table(results: List[dict], baseline: Dict[str, dict] | None = None):
+    """pytest-benchmark style table; times in microseconds."""
+    width = max([len(label(r)) for r in results] + [20])
+    head = f"{'Name (time in us)':<{width}} {'Min':>11} {'Max':>11} {'Mean':>11} {'StdDev':>11} {'Median':>11} {'Rounds':>7}"
+    if baseline is not None:
+        head += f" {'vs base':>8}"
+    print(head)
+    print("-" * len(head))
+    for r in results:
+        line = (f"{label(r):<{width}} {r['min'] * 1e6:>11.1f} {r['max'] * 1e6:>11.1f} "
+                f"{r['mean'] * 1e6:>11.1f} {r['stddev'] * 1e6:>11.1f} {r['median'] * 1e6:>11.1f} {r['rounds']:>7}")
+        if baseline is not None:
+            old = baseline.get(label(r))
+            if old:
+                ratio = r["median"] / old["median"]
+                line += f" {ratio:>7.2f}x" + (" !" if ratio > 1.2 else "")
+        print(line)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark BattleSnakes hot paths.")
+    ap.add_argument("--quick", action="store_true", help="small sizes and short timings")
+    ap.add_argument("--only", nargs="+", choices=sorted(GROUPS), default=sorted(GROUPS))
+    ap.add_argument("--json", metavar="PATH", help="write results as JSON")
+    ap.add_argument("--compare", metavar="PATH", help="JSON from an earlier run; '!' marks >20%% slower")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, HERE)
+    min_time = 0.05 if args.quick else 0.5
+    try:
+        import pygame  # noqa: F401
+        have_pygame = True
+    except ImportError:
+        have_pygame = False
+
+    results: List[dict] = []
+    for group in args.only:
+        if group in NEEDS_PYGAME and not have_pygame:
+            print(f"skipping {group}: pygame not installed", file=sys.stderr)
+            continue
+        print(f"running {group}...", file=sys.stderr)
+        for r in GROUPS[group](args.quick, min_time):
+            results.append({"group": group, **r})
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {label(r): r for r in json.load(f)["results"]}
+    print_table(results, baseline)
+
+    if args.json:
+        report = {"meta": {"commit": git_commit(), "python": platform.python_version(),
+                           "platform": platform.platform(), "quick": args.quick,
+                           "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                  "results": results}
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
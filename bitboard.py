@@ -0,0 +1,209 @@
+# bitboard.py – optional compact board backend: cells as bits of a Python int
+#
+# What it buys is memory and cheap shot bookkeeping: a shot set is one bit
+# per cell instead of a tuple per cell, and unions such as the danger cells
+# are a single int operation. The move phase is not vectorised: the
+# sequential rule moves one snake at a time, each drawing from the game's
+# rng, so it still loops over the snakes in Python and costs about the same
+# per snake as the set backend. Measured against it, a move phase is
+# 1.4-2.5x faster (1.4x on 200x200 with 2000 snakes a side), not an order
+# of magnitude. For that, use "move_rule": "simultaneous" (vecmove.py).
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Tuple
+
+from engine import Coord, Player, Snake
+from instrument import timed
+from patterns import AnyKernel
+from topology import Topology
+
+
+# ─────── geometry ─────────────────────────────────────────────────────────
+class BitBoard:
+    """Index tables for a rows x cols board; cell (x, y) is bit y*cols + x.
+
+    Shared by every game of the same size and shape, so get one via
+    BitBoard.of().
+    """
+
+    def __init__(self, topo: Topology):
+        self.rows, self.cols = topo.rows, topo.cols
+        self.size = topo.size
+        self.nbytes = (self.size + 7) // 8
+        self.full = (1 << self.size) - 1
+        self.coords: List[Coord] = topo.coords
+        # Per cell, the neighbours that exist, in the topology's direction order.
+        table, deg = topo.table, topo.degree
+        self.neighbours: List[Tuple[int, ...]] = [
+            tuple(j for j in table[i * deg:(i + 1) * deg] if j >= 0) for i in range(self.size)]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def of(topo: Topology) -> "BitBoard":
+        return BitBoard(topo)
+
+    def index(self, xy: Coord) -> int:
+        x, y = xy
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return -1
+
+    def mask_of(self, coords: Iterable[Coord]) -> int:
+        """Pack coordinates into a mask in one pass (no per-cell big-int ops)."""
+        packed = bytearray(self.nbytes)
+        cols = self.cols
+        for x, y in coords:
+            i = y * cols + x
+            packed[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(packed, "little")
+
+    def unpack(self, mask: int) -> bytes:
+        """Bit-packed bytes of mask; test cell i with b[i >> 3] >> (i & 7) & 1."""
+        return mask.to_bytes(self.nbytes, "little")
+
+    def iter_bits(self, mask: int) -> Iterator[int]:
+        packed = self.unpack(mask)
+        for byte_i, byte in enumerate(packed):
+            while byte:
+                low = byte & -byte
+                yield (byte_i << 3) + low.bit_length() - 1
+                byte ^= low
+
+
+# ─────── set-like view ────────────────────────────────────────────────────
+class BitSet:
+    """Set of coordinates stored as an int bitmask.
+
+    Supports what the engine and renderers use on Player.hits/misses/cells():
+    membership, iteration, len, add/discard and | & - with other BitSets.
+    """
+    __slots__ = ("board", "mask")
+
+    def __init__(self, board: BitBoard, mask: int = 0):
+        self.board = board
+        self.mask = mask
+
+    def __contains__(self, xy) -> bool:
+        i = self.board.index(xy)
+        return i >= 0 and (self.mask >> i) & 1 == 1
+
+    def __iter__(self) -> Iterator[Coord]:
+        coords = self.board.coords
+        return (coords[i] for i in self.board.iter_bits(self.mask))
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __or__(self, other: "BitSet") -> "BitSet":
+        return BitSet(self.board, self.mask | other.mask)
+
+    def __and__(self, other: "BitSet") -> "BitSet":
+        return BitSet(self.board, self.mask & other.mask)
+
+    def __sub__(self, other: "BitSet") -> "BitSet":
+        return BitSet(self.board, self.mask & ~other.mask)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BitSet):
+            return self.mask == other.mask
+        return set(self) == other
+
+    def __repr__(self) -> str:
+        return f"BitSet({set(self)!r})"
+
+    def add(self, xy: Coord):
+        self.mask |= 1 << self.board.index(xy)
+
+    def discard(self, xy: Coord):
+        i = self.board.index(xy)
+        if i >= 0:
+            self.mask &= ~(1 << i)
+
+    def copy(self) -> "BitSet":
+        return BitSet(self.board, self.mask)
+
+
+class BitPlayer(Player):
+    """Player whose hits, misses and occupied cells are BitSets."""
+    __slots__ = ("board",)
+
+    def __init__(self, name: str, board: BitBoard):
+        super().__init__(name)
+        self.board = board
+        self.hits = BitSet(board)
+        self.misses = BitSet(board)
+
+    def cells(self) -> BitSet:
+        return BitSet(self.board, self.board.mask_of(self.occupied))
+
+    def take_pattern(self, pattern: AnyKernel, xy: Coord, shooter: "BitPlayer") -> bool:
+        """Player.take_pattern, recording the shot with one mask operation
+        per set instead of a big-int add per cell."""
+        cols = self.board.cols
+        hit_mask = 0
+        for cell in pattern.cells(xy):
+            if self.take_shot(cell):
+                hit_mask |= 1 << (cell[1] * cols + cell[0])
+        shooter.hits.mask |= hit_mask
+        shooter.misses.mask |= pattern.mask(xy) & ~hit_mask
+        return hit_mask != 0
+
+
+# ─────── engine mix-in ────────────────────────────────────────────────────
+class BitboardMixin:
+    """Put before a GameEngine subclass to run it on the bitboard backend.
+
+    The rules stay those of the engine class; only the storage and the move
+    phase change. Use bitboard_engine() rather than mixing in by hand.
+    """
+
+    def new_player(self, name: str) -> BitPlayer:
+        return BitPlayer(name, BitBoard.of(self.topology))
+
+    @timed("snakes_move_phase")
+    def snakes_move_phase(self):
+        if self.mover is not None:
+            return super().snakes_move_phase()
+        board: BitBoard = self.user.board
+        coords, neighbours = board.coords, board.neighbours
+        # One byte per cell for occupancy, so moves update it in O(1).
+        occupied = bytearray(board.size)
+        for p in self.players:
+            for s in p.snakes:
+                if s.alive:
+                    occupied[s.xy[1] * board.cols + s.xy[0]] = 1
+
+        for p in self.players:
+            danger = self.danger_cells(p)
+            mask = danger.mask if isinstance(danger, BitSet) else board.mask_of(danger)
+            unsafe = board.unpack(mask)
+            for s in p.snakes:
+                if not s.alive:
+                    continue
+                if s.move_fn is not Snake.default_move:
+                    # Custom movers get the usual set-like arguments.
+                    blocked = BitSet(board, board.mask_of(
+                        coords[i] for i in range(board.size) if occupied[i]))
+                    blocked.discard(s.xy)
+                    i = board.index(s.xy)
+                    occupied[i] = 0
+                    s.attempt_move(self.topology, blocked, BitSet(board, mask), self.rng)
+                    occupied[board.index(s.xy)] = 1
+                    continue
+                i = s.xy[1] * board.cols + s.xy[0]
+                free = [j for j in neighbours[i]
+                        if not occupied[j] and not (unsafe[j >> 3] >> (j & 7)) & 1]
+                if free:
+                    j = self.rng.choice(free)
+                    occupied[i] = 0
+                    occupied[j] = 1
+                    s.xy = coords[j]
+
+
+@lru_cache(maxsize=None)
+def bitboard_engine(engine_cls: type) -> type:
+    """Return engine_cls running on the bitboard backend, e.g.
+    bitboard_engine(RegularEngine)(settings)."""
+    return type(f"Bit{engine_cls.__name__}", (BitboardMixin, engine_cls), {})
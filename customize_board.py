@@ -2,7 +2,10 @@
 import json
 import os
 import pygame
-import sys
+
+import assets
+from assets import render_text
+from scenes import display
 
 SETTINGS_FILE = "board_settings.json"
 
@@ -16,19 +19,18 @@ PANEL_BG = (230, 230, 230)
 DEFAULTS = {
     "rows": 10,
     "cols": 10,
-    "snakes_per_player": 7
+    "snakes_per_player": 7,
+    "opening_book": "openings.bsb"
 }
 def reset_to_defaults() -> None:
     """Force the settings file to match DEFAULTS every time the game starts."""
     with open(SETTINGS_FILE, "w") as f:
         json.dump(DEFAULTS, f)
-pygame.init()
-FONT = pygame.font.SysFont(None, 32)
-BIG_FONT = pygame.font.SysFont(None, 48)
+assets.init()
 def draw_button(screen, rect, label, mouse_pos):
     color = GRAY if rect.collidepoint(mouse_pos) else GRAY
     pygame.draw.rect(screen, color, rect)
-    text = FONT.render(label, True, WHITE)
+    text = render_text(label, 32, WHITE)
     screen.blit(text, text.get_rect(center=rect.center))
 
 def _prompt_int(label: str, default: int) -> int:
@@ -63,11 +65,10 @@ def load_settings() -> dict:
         except (json.JSONDecodeError, IOError):
             print("⚠ Failed to load settings. Using defaults.")
     return DEFAULTS.copy()
-def customize_board_gui():
-    screen = pygame.display.set_mode((700, 500))  # Larger window
-    pygame.display.set_caption("Customize BattleSnakes Board")
-
-    clock = pygame.time.Clock()
+def customize_board_gui(manager):
+    """Scene for editing the board settings; Save or Cancel go back to the
+    manager's home screen, closing the window quits."""
+    screen = display((700, 500), "Customize BattleSnakes Board")  # Larger window
 
     settings = DEFAULTS.copy()
 
@@ -84,8 +85,10 @@ def customize_board_gui():
     }
 
     active_field = None
+    error = ""  # why the last Save was refused, shown until the next edit
     blink = True
-    blink_timer = 0
+    blink_timer = pygame.time.get_ticks()
+    drawn = None
 
     # Buttons
     save_button = pygame.Rect(180, 350, 120, 40)
@@ -93,53 +96,70 @@ def customize_board_gui():
 
     running = True
     while running:
-        screen.fill(BLACK)
         mouse_pos = pygame.mouse.get_pos()
 
-        # Title
-        title = BIG_FONT.render("Customize Board", True, RED)
-        screen.blit(title, title.get_rect(center=(350, 40)))
-
-        # Draw input fields
-        for field, rect in fields.items():
-            color = RED if active_field == field else WHITE
-            pygame.draw.rect(screen, color, rect, 2)
-
-            display_text = input_texts[field]
-            # Add blinking cursor if active
-            if active_field == field and blink:
-                display_text += "|"
-
-            text_surface = FONT.render(display_text, True, WHITE)
-            screen.blit(text_surface, (rect.x + 10, rect.y + 8))
-
-            label = FONT.render(field.replace("_", " ").capitalize(), True, WHITE)
-            screen.blit(label, (rect.x - 200, rect.y + 8))
-
-        # Draw buttons
-        draw_button(screen, save_button, "Save", mouse_pos)
-        draw_button(screen, cancel_button, "Cancel", mouse_pos)
-
-        pygame.display.flip()
-
         # Blinking cursor timer
-        blink_timer += clock.get_time()
-        if blink_timer >= 500:  # Toggle blink every 500ms
+        if pygame.time.get_ticks() - blink_timer >= 500:  # Toggle blink every 500ms
             blink = not blink
-            blink_timer = 0
-
-        for event in pygame.event.get():
+            blink_timer = pygame.time.get_ticks()
+
+        # Repaint only when something visible changed, then sleep until the
+        # next event (or the next blink while a field is being edited).
+        state = (dict(input_texts), active_field, active_field and blink, error,
+                 save_button.collidepoint(mouse_pos), cancel_button.collidepoint(mouse_pos))
+        if state == drawn:
+            timeout = max(1, blink_timer + 500 - pygame.time.get_ticks()) if active_field else 0
+            events = [pygame.event.wait(timeout)] + pygame.event.get()
+        else:
+            drawn = state
+            events = []
+            screen.fill(BLACK)
+
+            # Title
+            title = render_text("Customize Board", 48, RED)
+            screen.blit(title, title.get_rect(center=(350, 40)))
+
+            # Draw input fields
+            for field, rect in fields.items():
+                color = RED if active_field == field else WHITE
+                pygame.draw.rect(screen, color, rect, 2)
+
+                display_text = input_texts[field]
+                # Add blinking cursor if active
+                if active_field == field and blink:
+                    display_text += "|"
+
+                text_surface = render_text(display_text, 32, WHITE)
+                screen.blit(text_surface, (rect.x + 10, rect.y + 8))
+
+                label = render_text(field.replace("_", " ").capitalize(), 32, WHITE)
+                screen.blit(label, (rect.x - 200, rect.y + 8))
+
+            if error:
+                message = render_text(error, 24, RED)
+                screen.blit(message, message.get_rect(center=(350, 315)))
+
+            # Draw buttons
+            draw_button(screen, save_button, "Save", mouse_pos)
+            draw_button(screen, cancel_button, "Cancel", mouse_pos)
+
+            pygame.display.flip()
+
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                return None
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_pos = event.pos
                 if save_button.collidepoint(mouse_pos):
                     # Save settings
                     try:
                         # Parse input values
                         for key in fields:
                             settings[key] = int(input_texts[key])
-                        
+                            if settings[key] < 1:
+                                raise ValueError(key)
+
                         rows = settings["rows"]
                         cols = settings["cols"]
                         snakes = settings["snakes_per_player"]
@@ -147,7 +167,7 @@ def customize_board_gui():
                         required_cells = snakes * 2
 
                         if required_cells > total_cells:
-                            print(f"⚠ Too many snakes! Board has {total_cells} cells, but needs {required_cells}.")
+                            error = f"Too many snakes! Board has {total_cells} cells, but needs {required_cells}."
                             continue  # Skip saving and stay in GUI
 
                         # Save to file
@@ -157,8 +177,7 @@ def customize_board_gui():
                         running = False
 
                     except ValueError:
-                        print("⚠ Invalid input! Settings not saved.")
-                    running = False
+                        error = "Invalid input! Every value must be a whole number of at least 1."
                 elif cancel_button.collidepoint(mouse_pos):
                     running = False
                 else:
@@ -169,6 +188,7 @@ def customize_board_gui():
                             active_field = field
 
             elif event.type == pygame.KEYDOWN and active_field:
+                error = ""
                 if event.key == pygame.K_BACKSPACE:
                     input_texts[active_field] = input_texts[active_field][:-1]
                 elif event.key == pygame.K_RETURN:
@@ -176,4 +196,4 @@ def customize_board_gui():
                 elif event.unicode.isdigit():
                     input_texts[active_field] += event.unicode
 
-        clock.tick(30)
+    return manager.home
@@ -0,0 +1,574 @@
+# engine.py – pygame-free BattleSnakes rules for headless play and simulation
+import random
+from array import array
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from instrument import timed
+from patterns import AnyKernel, kernel
+from topology import Topology, topology
+
+Coord = Tuple[int, int]
+
+SNAKE_COLOURS = ["green", "red", "blue", "yellow", "purple", "orange"]
+
+
+# ─────── model objects ────────────────────────────────────────────────────
+class Snake:
+    __slots__ = ("_xy", "colour", "move_fn", "alive", "revealed", "occupancy")
+
+    def __init__(self, xy: Coord, colour: str = "green",
+                 move_fn: Callable[["Snake", int, int, Set[Coord], Set[Coord]], None] | None = None):
+        self._xy: Coord = xy
+        self.colour = colour  # sprite key; renderers map it to an image
+        self.move_fn = move_fn or Snake.default_move
+        self.alive: bool = True
+        self.revealed: bool = False  # for bot snakes: revealed when hit
+        self.occupancy: Dict[Coord, "Snake"] | None = None  # owner's index; see Player.add_snake
+
+    @property
+    def xy(self) -> Coord:
+        return self._xy
+
+    @xy.setter
+    def xy(self, xy: Coord):
+        occ = self.occupancy
+        if occ is not None and self.alive:
+            if occ.get(self._xy) is self:
+                del occ[self._xy]
+            occ[xy] = self
+        self._xy = xy
+
+    def copy(self) -> "Snake":
+        """Unindexed copy; Player.add_snake() links it to an owner."""
+        new = Snake.__new__(Snake)
+        new._xy, new.colour, new.move_fn = self._xy, self.colour, self.move_fn
+        new.alive, new.revealed, new.occupancy = self.alive, self.revealed, None
+        return new
+
+    def hit(self, xy: Coord) -> bool:
+        if xy == self._xy and self.alive:
+            self.alive = False
+            self.revealed = True
+            if self.occupancy is not None and self.occupancy.get(xy) is self:
+                del self.occupancy[xy]
+            return True
+        return False
+
+    def default_move(self, topo: Topology,
+                     blocked: Set[Coord], attacked: Set[Coord], rng: random.Random = random):
+        """Step to a random neighbour that is neither blocked nor attacked, if any."""
+        if not self.alive:
+            return
+        x, y = self._xy
+        base = (y * topo.cols + x) * topo.degree
+        table, coords = topo.table, topo.coords
+        # Shuffling direction numbers draws from rng exactly as shuffling
+        # the neighbours themselves would.
+        order = topo.order
+        order.sort()
+        rng.shuffle(order)
+        for d in order:
+            j = table[base + d]
+            if j >= 0:
+                nxy = coords[j]
+                if nxy not in blocked and nxy not in attacked:
+                    self.xy = nxy
+                    return
+
+    def attempt_move(self, topo: Topology,
+                     blocked: Set[Coord], attacked: Set[Coord], rng: random.Random = random):
+        """Move by move_fn; the default rule draws from `rng` (the game's stream).
+        Custom move_fns are called as move_fn(snake, rows, cols, blocked, attacked)."""
+        if self.move_fn is Snake.default_move:
+            self.default_move(topo, blocked, attacked, rng)
+        else:
+            self.move_fn(self, topo.rows, topo.cols, blocked, attacked)
+
+
+class Player:
+    __slots__ = ("name", "snakes", "occupied", "fallen", "hits", "misses")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.snakes: List[Snake] = []
+        self.occupied: Dict[Coord, Snake] = {}  # cell -> live snake on it
+        self.fallen: Set[Coord] = set()  # cells where a snake was killed by take_shot
+        self.hits: Set[Coord] = set()
+        self.misses: Set[Coord] = set()
+
+    def copy(self) -> "Player":
+        """Independent copy: new snakes, index and shot sets."""
+        new = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                setattr(new, name, getattr(self, name))
+        new.snakes, new.occupied = [], {}
+        for s in self.snakes:
+            new.add_snake(s.copy())
+        new.fallen, new.hits, new.misses = self.fallen.copy(), self.hits.copy(), self.misses.copy()
+        return new
+
+    def add_snake(self, snake: Snake):
+        """Append snake and index it; its moves and death keep `occupied` in sync."""
+        self.snakes.append(snake)
+        snake.occupancy = self.occupied
+        if snake.alive:
+            self.occupied[snake.xy] = snake
+
+    def snake_at(self, xy: Coord) -> Optional[Snake]:
+        return self.occupied.get(xy)
+
+    def take_shot(self, xy: Coord) -> bool:
+        """Kill the snake on xy, if there is one; returns whether it was a hit.
+
+        Firing again where a snake already died still counts as a hit.
+        """
+        snake = self.occupied.get(xy)
+        if snake is not None and snake.hit(xy):
+            self.fallen.add(xy)
+            return True
+        return xy in self.fallen
+
+    def take_pattern(self, pattern: AnyKernel, xy: Coord, shooter: "Player") -> bool:
+        """Fire `pattern` centred on xy at this player, adding every cell it
+        covers to shooter's hits or misses; returns whether any cell hit."""
+        hit_any = False
+        hits, misses = shooter.hits, shooter.misses
+        for cell in pattern.cells(xy):
+            if self.take_shot(cell):
+                hits.add(cell)
+                hit_any = True
+            else:
+                misses.add(cell)
+        return hit_any
+
+    def alive_snakes(self):
+        return [s for s in self.snakes if s.alive]
+
+    def cells(self) -> Set[Coord]:
+        return set(self.occupied)
+
+    def all_shots(self) -> Set[Coord]:
+        return self.hits | self.misses
+
+    def has_shot(self, xy: Coord) -> bool:
+        return xy in self.hits or xy in self.misses
+
+    def is_defeated(self) -> bool:
+        return not self.alive_snakes()
+
+
+@lru_cache(maxsize=8)
+def _identity_cells(n: int) -> bytes:
+    """array("i", range(n)) as bytes; copying these beats rebuilding the range."""
+    return array("i", range(n)).tobytes()
+
+
+class CellPool:
+    """Set of board cells with O(1) random pick and removal.
+
+    Cells live densely in `_cells` (as y*cols + x); `_pos` maps a cell back to
+    its slot, or -1 once removed. Removal swaps the last cell into the hole.
+    `removed` lists the cells taken out, in order: replaying it on a full
+    pool (replayed()) rebuilds this one slot for slot, which is all a
+    snapshot needs to store.
+    """
+
+    __slots__ = ("cols", "_cells", "_pos", "removed", "_rows")
+
+    def __init__(self, rows: int, cols: int, exclude=()):
+        self.cols = cols
+        self._cells, self._pos = array("i"), array("i")
+        self._cells.frombytes(_identity_cells(rows * cols))
+        self._pos.frombytes(_identity_cells(rows * cols))
+        self.removed = array("i")
+        for xy in exclude:
+            self.discard(xy)
+
+    @classmethod
+    def replayed(cls, rows: int, cols: int, removed) -> "CellPool":
+        """A full pool with the cells of `removed` (indices) taken out in
+        order. The slot arrays are only built on first use (see
+        __getattr__), so restoring a snapshot costs nothing per board cell."""
+        pool = cls.__new__(cls)
+        pool.cols = cols
+        pool.removed = array("i", removed)
+        pool._rows = rows
+        return pool
+
+    def __getattr__(self, name: str):
+        # Only reached for unset slots: a replayed() pool builds its slot
+        # arrays the first time they are needed.
+        if name not in ("_cells", "_pos"):
+            raise AttributeError(name)
+        rows = self._rows
+        del self._rows
+        cells, pos = self._cells, self._pos = array("i"), array("i")
+        cells.frombytes(_identity_cells(rows * self.cols))
+        pos.frombytes(_identity_cells(rows * self.cols))
+        for i in self.removed:
+            slot = pos[i]
+            last = cells.pop()
+            if last != i:
+                cells[slot] = last
+                pos[last] = slot
+            pos[i] = -1
+        return getattr(self, name)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, xy: Coord) -> bool:
+        return self._pos[xy[1] * self.cols + xy[0]] >= 0
+
+    def discard(self, xy: Coord):
+        i = xy[1] * self.cols + xy[0]
+        slot = self._pos[i]
+        if slot < 0:
+            return
+        last = self._cells.pop()
+        if last != i:
+            self._cells[slot] = last
+            self._pos[last] = slot
+        self._pos[i] = -1
+        self.removed.append(i)
+
+    def copy(self) -> "CellPool":
+        new = CellPool.__new__(CellPool)
+        new.cols, new._cells, new._pos = self.cols, self._cells[:], self._pos[:]
+        new.removed = self.removed[:]
+        return new
+
+    def pop_random(self, rng: random.Random = random) -> Coord:
+        """Remove and return a uniformly random cell; IndexError when empty."""
+        if not self._cells:
+            raise IndexError("pop from empty CellPool")
+        i = self._cells[rng.randrange(len(self._cells))]
+        xy = (i % self.cols, i // self.cols)
+        self.discard(xy)
+        return xy
+
+
+# ─────── rules ────────────────────────────────────────────────────────────
+class GameEngine:
+    """Board state and turn rules for one game, with no display attached.
+
+    The pygame classes in BaseGame.py / Difficulty.py render on top of this;
+    batch tools drive it directly through place_snake() and step().
+    """
+    attack_pattern = "single"  # shape of the user's shots; see patterns.py
+
+    def __init__(self, settings: dict, user: str = "Player 1"):
+        self.rows, self.cols = settings["rows"], settings["cols"]
+        self.snakes_each = settings.get("snakes_per_player", 7)
+        self.topology = topology(settings.get("topology", "rect"), self.rows, self.cols)
+        if "attack_pattern" in settings:
+            self.attack_pattern = settings["attack_pattern"]
+        self.pattern = kernel(self.attack_pattern, self.topology)
+        self.players = [self.new_player(user), self.new_player("Bot")]
+        self.turn_idx = 0
+        self.turns_taken = 0
+        self.phase = "placement"
+        self.over = False
+        self.end_winner: Optional[str] = None
+        # Every random choice in the rules draws from this per-game stream,
+        # so (settings, seed, user inputs) reproduce a game exactly.
+        self.seed: int = settings.get("seed")
+        if self.seed is None:
+            self.seed = random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.bot_last_guess: Optional[Coord] = None
+        self.bot_targets = CellPool(self.rows, self.cols)  # cells the bot has not fired at
+        self.bot_ai = None  # optional targeting strategy; see ai.py
+        if settings.get("bot_ai") == "heatmap":
+            from ai import HeatmapAI  # needs numpy, so only imported on request
+            self.bot_ai = HeatmapAI(self)
+        elif settings.get("bot_ai") == "search":
+            from search import SearchAI  # needs numpy too
+            self.bot_ai = SearchAI(self, settings.get("search_ms", 300), settings.get("search_iters"),
+                                   settings.get("search_worker", True))
+        self.mover = None  # optional batched move phase; see vecmove.py
+        if settings.get("move_rule", "sequential") == "simultaneous":
+            from vecmove import VectorMover  # needs numpy, so only imported on request
+            self.mover = VectorMover(self)
+        self.opening = None  # optional precomputed bot placement and first shots; see openings.py
+        if settings.get("opening_book"):
+            from openings import find_opening
+            self.opening = find_opening(settings["opening_book"], self.rows, self.cols,
+                                        self.snakes_each, self.topology.name)
+        self.book_shot = 0  # next of opening.shots to try
+        self.recorder = None  # optional replay log; see replay.py
+        if settings.get("record"):
+            from replay import ReplayRecorder
+            self.recorder = ReplayRecorder(self, settings["record"])
+
+    def board_config(self) -> dict:
+        """Settings that recreate this game's board shape and attack
+        pattern where they differ from the defaults, as recorded in replays
+        and snapshots."""
+        out = {}
+        if self.topology.name != "rect":
+            out["topology"] = self.topology.name
+        spec = self.attack_pattern
+        if spec != type(self).attack_pattern:
+            out["attack_pattern"] = spec if isinstance(spec, str) else list(spec)
+        return out
+
+    def new_player(self, name: str) -> Player:
+        """Factory for both sides; alternative board backends override this."""
+        return Player(name)
+
+    def copy(self) -> "GameEngine":
+        """Fork the game: an independent copy of its state for search to play on.
+
+        Players, snakes, shot sets and the bot's target pool are copied;
+        bot_ai and mover are copied if they support it. Meant for engine
+        objects; a pygame game's copy would share its window and surfaces.
+        """
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.players = [p.copy() for p in self.players]
+        new.bot_targets = self.bot_targets.copy()
+        new.rng = random.Random()
+        new.rng.setstate(self.rng.getstate())
+        new.recorder = None
+        for name in ("bot_ai", "mover"):
+            helper = getattr(self, name)
+            if helper is not None:
+                setattr(new, name, helper.copy(new))
+        return new
+
+    def snapshot_extras(self) -> dict:
+        """JSON-able state outside the board that snapshot.py must keep;
+        subclasses add theirs and call super()."""
+        return {"book_shot": self.book_shot} if self.opening is not None else {}
+
+    def restore_extras(self, extras: dict):
+        """Inverse of snapshot_extras(), applied after the board is restored."""
+        self.book_shot = extras.get("book_shot", 0)
+
+    @property
+    def user(self) -> Player:
+        return self.players[0]
+
+    @property
+    def bot(self) -> Player:
+        return self.players[1]
+
+    # ── placement ──
+    def place_snake(self, gx: int, gy: int, colour: str | None = None) -> bool:
+        """Place one user snake; returns False if the click was ignored."""
+        if self.phase != "placement" or len(self.user.snakes) >= self.snakes_each:
+            return False
+        if self.user.snake_at((gx, gy)) is not None:
+            return False
+        snake = Snake((gx, gy), colour or self.rng.choice(SNAKE_COLOURS))
+        self.user.add_snake(snake)
+        if self.recorder is not None:
+            self.recorder.placed(0, snake)
+        if len(self.user.snakes) == self.snakes_each:
+            self.auto_place_bot()
+            self.phase = "battle"
+        return True
+
+    def auto_place_bot(self):
+        free = CellPool(self.rows, self.cols, exclude=self.user.cells() | self.bot.cells())
+        while len(self.bot.snakes) < self.snakes_each:
+            xy = free.pop_random(self.rng) if self.opening is None else self.opening.place(free, self.rng)
+            snake = Snake(xy, self.rng.choice(SNAKE_COLOURS))
+            self.bot.add_snake(snake)
+            if self.recorder is not None:
+                self.recorder.placed(1, snake)
+
+    # ── battle ──
+    def can_attack(self, xy: Coord) -> bool:
+        return not self.user.has_shot(xy)
+
+    def user_attack(self, xy: Coord) -> bool:
+        """Resolve the user's shot at xy against the bot, over every cell of
+        the attack pattern; returns True if any of them hit."""
+        return self.bot.take_pattern(self.pattern, xy, self.user)
+
+    def attack(self, xy: Coord) -> bool:
+        """The user's shot at xy under this mode's rules (user_attack),
+        logged to the replay recorder if one is attached."""
+        hit = self.user_attack(xy)
+        if self.recorder is not None:
+            self.recorder.user_shot(xy, hit)
+        return hit
+
+    def rebuild_bot_targets(self):
+        """Resync bot_targets after bot shots were changed from outside."""
+        self.bot_targets = CellPool(self.rows, self.cols, exclude=self.bot.all_shots())
+
+    def book_target(self) -> Optional[Coord]:
+        """The bot's next opening-book shot (skipping cells it has already
+        fired at), or None once it has hit something or the book has run out."""
+        if self.opening is None or self.bot.hits:
+            return None
+        shots, cols = self.opening.shots, self.cols
+        while self.book_shot < len(shots):
+            xy = (shots[self.book_shot] % cols, shots[self.book_shot] // cols)
+            if xy in self.bot_targets:
+                return xy
+            self.book_shot += 1
+        return None
+
+    @timed("bot_take_shot")
+    def bot_take_shot(self) -> Tuple[Coord, bool]:
+        if not self.bot_targets:
+            # Hard mode lets snakes crawl back onto old misses, so the bot
+            # must be allowed to re-fire there once every cell has been tried.
+            self.bot_targets = CellPool(self.rows, self.cols, exclude=self.bot.hits)
+        book = self.book_target()
+        if book is not None:
+            x, y = book
+            self.book_shot += 1
+            self.bot_targets.discard(book)
+        elif self.bot_ai is not None:
+            x, y = self.bot_ai.choose_target()
+            self.bot_targets.discard((x, y))
+        else:
+            x, y = self.bot_targets.pop_random(self.rng)
+        self.bot_last_guess = (x, y)
+        hit = self.user.take_shot((x, y))
+        (self.bot.hits if hit else self.bot.misses).add((x, y))
+        if self.bot_ai is not None:
+            self.bot_ai.observe_shot((x, y), hit)
+        return (x, y), hit
+
+    def danger_cells(self, p: Player) -> Set[Coord]:
+        """Cells p's snakes refuse to move into."""
+        if p is self.user:
+            return self.bot.hits | self.bot.misses  # only bot's shots are dangerous for user snakes
+        return self.user.hits | self.user.misses  # only user's shots are dangerous for bot snakes
+
+    def is_dangerous(self, p: Player, xy: Coord) -> bool:
+        """xy in danger_cells(p), without building the union."""
+        return (self.bot if p is self.user else self.user).has_shot(xy)
+
+    @timed("snakes_move_phase")
+    def snakes_move_phase(self):
+        if self.mover is not None:
+            self.mover.move()
+            return
+        for p in self.players:
+            attacked = self.danger_cells(p)
+            blocked = self.user.cells() | self.bot.cells()
+            for s in p.snakes:
+                if not s.alive:
+                    continue
+                blocked.discard(s.xy)
+                s.attempt_move(self.topology, blocked, attacked, self.rng)
+                blocked.add(s.xy)
+
+    def check_game_over(self) -> bool:
+        if self.user.is_defeated():
+            self.over = True
+            self.end_winner = "Bot"
+        elif self.bot.is_defeated():
+            self.over = True
+            self.end_winner = "Player"
+        if self.over and self.recorder is not None:
+            self.recorder.finish()
+        return self.over
+
+    def bot_turn(self):
+        """Bot fires, then (if the game goes on) every snake moves."""
+        xy, hit = self.bot_take_shot()
+        if self.recorder is not None:
+            self.recorder.bot_shot(xy, hit)
+        if not self.check_game_over():
+            self.snakes_move_phase()
+            if self.recorder is not None:
+                self.recorder.moved()
+            if self.bot_ai is not None:
+                self.bot_ai.observe_move()
+            self.turns_taken += 1
+
+    def step(self, xy: Coord) -> bool:
+        """Play one full turn: the user fires at xy, then the bot answers.
+
+        Returns whether the user's shot hit. Raises ValueError outside the
+        battle phase or for a shot the current rules don't allow.
+        """
+        if self.phase != "battle" or self.over:
+            raise ValueError("step() needs a game in the battle phase")
+        if not self.can_attack(xy):
+            raise ValueError(f"cannot attack {xy}")
+        hit = self.attack(xy)
+        if not self.check_game_over():
+            self.bot_turn()
+        return hit
+
+
+class RegularEngine(GameEngine):
+    """Regular mode: standard 1-cell attack behavior."""
+
+
+class EasyEngine(GameEngine):
+    """Easy mode: attacks a cross shape (center + N/S/E/W)"""
+    attack_pattern = "cross"
+
+
+class HardEngine(GameEngine):
+    """Hard mode: only hits block snakes, and the user may fire at any cell again."""
+
+    def __init__(self, settings: dict, user: str = "Player 1"):
+        super().__init__(settings, user)
+        self.last_guess: Optional[Coord] = None
+
+    def can_attack(self, xy: Coord) -> bool:
+        return True
+
+    def snapshot_extras(self) -> dict:
+        return {**super().snapshot_extras(), "last_guess": self.last_guess}
+
+    def restore_extras(self, extras: dict):
+        super().restore_extras(extras)
+        self.last_guess = tuple(extras["last_guess"]) if extras["last_guess"] else None
+
+    def user_attack(self, xy: Coord) -> bool:
+        self.last_guess = xy
+        return super().user_attack(xy)
+
+    def danger_cells(self, p: Player) -> Set[Coord]:
+        return self.user.hits | self.bot.hits
+
+    def is_dangerous(self, p: Player, xy: Coord) -> bool:
+        return xy in self.user.hits or xy in self.bot.hits
+
+
+ENGINES = {"easy": EasyEngine, "regular": RegularEngine, "hard": HardEngine}
+
+
+def mode_and_backend(game: GameEngine) -> Tuple[str, str]:
+    """("easy" | "regular" | "hard", "sets" | "bits") for any engine or
+    pygame game, as stored in replays and snapshots."""
+    for name, cls in ENGINES.items():
+        if isinstance(game, cls):
+            break
+    else:
+        raise ValueError(f"{type(game).__name__} is not one of the ENGINES modes")
+    backend = "bits" if any(c.__name__ == "BitboardMixin" for c in type(game).__mro__) else "sets"
+    return name, backend
+
+
+# ─────── headless driver ──────────────────────────────────────────────────
+def random_policy(game: GameEngine) -> Coord:
+    """User policy that fires at a uniformly random cell it may still attack."""
+    while True:
+        xy = (random.randrange(game.cols), random.randrange(game.rows))
+        if game.can_attack(xy):
+            return xy
+
+
+def play_headless(game: GameEngine,
+                  policy: Callable[[GameEngine], Coord] = random_policy) -> GameEngine:
+    """Place the user's snakes at random and play `game` to the end."""
+    while game.phase == "placement":
+        game.place_snake(random.randrange(game.cols), random.randrange(game.rows))
+    while not game.over:
+        game.step(policy(game))
+    return game
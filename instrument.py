@@ -0,0 +1,142 @@
+# instrument.py – opt-in timers, counters and profiling for diagnosing slow machines
+#
+#   BATTLESNAKES_STATS=1 python main.py            # time the hot paths; FPS and per-phase
+#                                                  # overlay in the game panel (F3 hides it)
+#   BATTLESNAKES_PROFILE=game.prof python main.py  # the same, plus cProfile: on exit writes
+#                                                  # game.prof (pstats) and game.prof.txt
+#
+# Both are read at import. With neither set, @timed hands back the function
+# it decorates untouched and count() does nothing, so instrumented code
+# runs exactly as before.
+import atexit
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional
+
+PROFILE_PATH: Optional[str] = os.environ.get("BATTLESNAKES_PROFILE") or None
+ENABLED: bool = bool(os.environ.get("BATTLESNAKES_STATS")) or PROFILE_PATH is not None
+
+RECENT = 30  # calls averaged for the overlay
+
+
+class Stat:
+    """Call count and timings (seconds) for one instrumented function."""
+
+    __slots__ = ("count", "total", "max", "recent", "active")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=RECENT)
+        self.active = False
+
+    def add(self, dt: float):
+        self.count += 1
+        self.total += dt
+        if dt > self.max:
+            self.max = dt
+        self.recent.append(dt)
+
+    def recent_mean(self) -> float:
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+
+stats: Dict[str, Stat] = {}
+counters: Counter = Counter()
+_frames: deque = deque(maxlen=240)  # perf_counter() of recent frames
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording each call's duration under `name`.
+
+    An override and the method it extends may both be decorated with the
+    same name; only the outermost call is timed.
+    """
+    def wrap(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+        stat = stats.setdefault(name, Stat())
+
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            if stat.active:
+                return fn(*args, **kwargs)
+            stat.active = True
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stat.add(time.perf_counter() - t)
+                stat.active = False
+        return timed_fn
+    return wrap
+
+
+def count(name: str, n: int = 1):
+    if ENABLED:
+        counters[name] += n
+
+
+def frame():
+    """Mark a frame as shown, for fps()."""
+    if ENABLED:
+        _frames.append(time.perf_counter())
+
+
+def fps() -> float:
+    """Frames shown over the last second."""
+    now = time.perf_counter()
+    return sum(1 for t in _frames if now - t <= 1.0)
+
+
+def overlay_lines() -> List[str]:
+    """Short lines for an on-screen overlay: FPS, then each phase's recent
+    mean and worst time in ms."""
+    lines = [f"FPS {fps():.0f}"]
+    for name, s in stats.items():
+        if s.count:
+            lines.append(f"{name} {s.recent_mean() * 1e3:.2f} ms (max {s.max * 1e3:.2f})")
+    return lines
+
+
+def report() -> str:
+    """Every timer and counter as a table."""
+    out = [f"{'name':<20} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1].total):
+        if s.count:
+            out.append(f"{name:<20} {s.count:>8} {s.total * 1e3:>10.1f} "
+                       f"{s.total / s.count * 1e3:>9.3f} {s.max * 1e3:>9.3f}")
+    for name, n in sorted(counters.items()):
+        out.append(f"{name:<20} {n:>8}")
+    return "\n".join(out)
+
+
+_profiler: Optional[cProfile.Profile] = None
+
+
+def dump():
+    """Write the profile (if BATTLESNAKES_PROFILE is set) and the timer
+    report; runs at exit."""
+    text = report()
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(PROFILE_PATH)
+        buf = io.StringIO()
+        pstats.Stats(_profiler, stream=buf).sort_stats("cumulative").print_stats(30)
+        with open(PROFILE_PATH + ".txt", "w") as f:
+            f.write(text + "\n\n" + buf.getvalue())
+    print(text, file=sys.stderr)
+
+
+if ENABLED:
+    atexit.register(dump)
+if PROFILE_PATH is not None:
+    _profiler = cProfile.Profile()
+    _profiler.enable()
@@ -1,11 +1,13 @@
 import pygame
+import assets
+from assets import render_text
 from customize_board import customize_board_gui, load_settings, reset_to_defaults
+from BaseGame import SUSPEND_FILE
 from Difficulty import EasyGame, RegularGame, HardGame
-import sys
+from scenes import Scene, SceneManager, display
+from score_manager import top_scores
 import os
 
-SCORES_FILE = "scores.txt"
-
 # Colors and fonts
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -14,60 +16,108 @@ DARK_GRAY = (100, 100, 100)
 GREEN = (0, 200, 0)
 RED = (200, 0, 0)
 
-pygame.init()
-FONT = pygame.font.SysFont(None, 32)
-BIG_FONT = pygame.font.SysFont(None, 48)
+SCORES_MS = 5000  # the scores screen goes back to the menu after this, or on a click/key
+
+assets.init()
 
 def draw_button(screen, rect, label, mouse_pos):
     color = DARK_GRAY if rect.collidepoint(mouse_pos) else GRAY
     pygame.draw.rect(screen, color, rect)
-    text = FONT.render(label, True, WHITE)
+    text = render_text(label, 32, WHITE)
     screen.blit(text, text.get_rect(center=rect.center))
 
-def show_scores_gui(screen):
+def show_scores_gui(manager: SceneManager) -> Scene | None:
+    screen = display((600, 400), "BattleSnakes - Scores")
     screen.fill(BLACK)
 
-    scores = []
-    if os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE) as f:
-            for line in f:
-                parts = line.strip().rsplit(" ", 1)  # Split on last space
-                if len(parts) == 2 and parts[1].isdigit():
-                    username, score = parts
-                    scores.append((username, int(score)))
-    if not scores:
-        lines = ["No scores yet."]
-    else:
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
-        lines = scores[:10]
+    lines = top_scores(10)  # already sorted by score, descending
+    if not lines:
+        lines = [("No scores yet.", "")]
 
     # Title
-    screen.blit(BIG_FONT.render("------Scores------", True, WHITE), (50, 10))
-    screen.blit(FONT.render("Players", True, WHITE), (50, 50))
-    screen.blit(FONT.render("-----------", True, WHITE), (50, 60))
-    screen.blit(FONT.render("Score", True, WHITE), (300, 50))
-    screen.blit(FONT.render("---------", True, WHITE), (300, 60))
+    screen.blit(render_text("------Scores------", 48, WHITE), (50, 10))
+    screen.blit(render_text("Players", 32, WHITE), (50, 50))
+    screen.blit(render_text("-----------", 32, WHITE), (50, 60))
+    screen.blit(render_text("Score", 32, WHITE), (300, 50))
+    screen.blit(render_text("---------", 32, WHITE), (300, 60))
 
     #Controls the starting vertical position of each line of text
     y = 90
     for name, score in lines:
-        name_txt = FONT.render(name, True, WHITE)
-        score_txt = FONT.render(str(score), True, WHITE)
+        name_txt = render_text(name, 32, WHITE)
+        score_txt = render_text(str(score), 32, WHITE)
         screen.blit(name_txt, (50, y))    # Left column
         screen.blit(score_txt, (300, y))  # Right column
         y += 30
 
     pygame.display.flip()
-    pygame.time.wait(5000)#keeps the score screen visiblee for 5 seconds
+    # Stay up for SCORES_MS, sleeping in event.wait(); any click or key returns sooner.
+    until = pygame.time.get_ticks() + SCORES_MS
+    while (left := until - pygame.time.get_ticks()) > 0:
+        e = pygame.event.wait(left)
+        if e.type == pygame.QUIT:
+            return None
+        if e.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+            break
+    return manager.home
+
+def draw_launcher(screen, buttons, input_box, username, mouse_pos):
+    screen.fill(BLACK)
 
-def run_gui_launcher():
-    screen = pygame.display.set_mode((600, 400))
-    pygame.display.set_caption("BattleSnakes - Menu")
+    # Title
+    title = render_text("BattleSnakes", 48, RED)
+    screen.blit(title, title.get_rect(center=(300, 30)))
+
+    # Username input
+    pygame.draw.rect(screen, BLACK, input_box, 2)
+    name_txt = render_text(username or "Enter username...", 32, WHITE)
+    screen.blit(name_txt, (input_box.x + 10, input_box.y + 8))
+
+    # Buttons
+    draw_button(screen, buttons["easy"], "Play Easy", mouse_pos)
+    draw_button(screen, buttons["regular"], "Play Regular", mouse_pos)
+    draw_button(screen, buttons["hard"], "Play Hard", mouse_pos)
+    draw_button(screen, buttons["custom"], "Customize Board", mouse_pos)
+    draw_button(screen, buttons["scores"], "Scores", mouse_pos)
+    draw_button(screen, buttons["quit"], "Quit", mouse_pos)
+    if os.path.exists(SUSPEND_FILE):
+        draw_button(screen, buttons["resume"], "Resume Game", mouse_pos)
+
+    pygame.display.flip()
+
+def play_game(manager: SceneManager, game) -> Scene | None:
+    """Game scene: play `game`, and any rematches, in the shared window."""
+    while True:
+        outcome = game.play()
+        if outcome != "again":
+            return manager.home if outcome == "menu" else None
+        cls, user = type(game), game.user.name
+        game = None  # let the finished game go before building the next one
+        game = cls(load_settings(), user)
+
+def new_game(cls) -> Scene:
+    """The scene that starts a fresh `cls` game for whoever is signed in."""
+    return lambda manager: play_game(manager, cls(load_settings(), manager.username or "Guest"))
+
+def resume_suspended_game() -> Scene | None:
+    """The game Main Menu suspended, as a scene; the snapshot is used up."""
+    import snapshot
+    try:
+        game = snapshot.load_file(SUSPEND_FILE, {"easy": EasyGame, "regular": RegularGame, "hard": HardGame})
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not resume the saved game: {e}")
+        game = None
+    os.remove(SUSPEND_FILE)
+    if game is None:
+        return None
+    return lambda manager: play_game(manager, game)
+
+def launcher(manager: SceneManager) -> Scene | None:
+    """The menu scene; returns whichever screen is picked, or None on Quit."""
+    screen = display((600, 400), "BattleSnakes - Menu")
 
-    clock = pygame.time.Clock()
     input_active = True
-    username = ""
+    username = manager.username
     input_box = pygame.Rect(180, 60, 240, 40)
 
     # Buttons
@@ -78,34 +128,25 @@ def run_gui_launcher():
         "custom": pygame.Rect(200, 280, 200, 40),
         "scores": pygame.Rect(200, 330, 95, 30),
         "quit": pygame.Rect(305, 330, 95, 30),
+        "resume": pygame.Rect(200, 365, 200, 30),
     }
 
+    # Only repaint when the username or the hovered button changes; in
+    # between, sleep in pygame.event.wait() instead of polling.
+    drawn = None
     while True:
-        screen.fill(BLACK)
         mouse_pos = pygame.mouse.get_pos()
-
-        # Title
-        title = BIG_FONT.render("BattleSnakes", True, RED)
-        screen.blit(title, title.get_rect(center=(300, 30)))
-
-        # Username input
-        pygame.draw.rect(screen, BLACK, input_box, 2)
-        name_txt = FONT.render(username or "Enter username...", True, WHITE)
-        screen.blit(name_txt, (input_box.x + 10, input_box.y + 8))
-
-        # Buttons
-        draw_button(screen, buttons["easy"], "Play Easy", mouse_pos)
-        draw_button(screen, buttons["regular"], "Play Regular", mouse_pos)
-        draw_button(screen, buttons["hard"], "Play Hard", mouse_pos)
-        draw_button(screen, buttons["custom"], "Customize Board", mouse_pos)
-        draw_button(screen, buttons["scores"], "Scores", mouse_pos)
-        draw_button(screen, buttons["quit"], "Quit", mouse_pos)
-
-        pygame.display.flip()
-
-        for e in pygame.event.get():
+        hovered = next((name for name, rect in buttons.items() if rect.collidepoint(mouse_pos)), None)
+        if drawn == (username, hovered):
+            handle = [pygame.event.wait()] + pygame.event.get()
+        else:
+            handle = []
+            drawn = (username, hovered)
+            draw_launcher(screen, buttons, input_box, username, mouse_pos)
+
+        for e in handle:
             if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                return None
             elif e.type == pygame.KEYDOWN and input_active:
                 if e.key == pygame.K_BACKSPACE:
                     username = username[:-1]
@@ -113,21 +154,30 @@ def run_gui_launcher():
                     input_active = False
                 else:
                     username += e.unicode
+                manager.username = username
             elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+                mouse_pos = e.pos
                 if buttons["easy"].collidepoint(mouse_pos):
-                    EasyGame(load_settings(), username or "Guest").play()
+                    return new_game(EasyGame)
                 elif buttons["regular"].collidepoint(mouse_pos):
-                    RegularGame(load_settings(), username or "Guest").play()
+                    return new_game(RegularGame)
                 elif buttons["hard"].collidepoint(mouse_pos):
-                    HardGame(load_settings(), username or "Guest").play()
+                    return new_game(HardGame)
                 elif buttons["custom"].collidepoint(mouse_pos):
-                    customize_board_gui()
+                    return customize_board_gui
                 elif buttons["scores"].collidepoint(mouse_pos):
-                    show_scores_gui(screen)
+                    return show_scores_gui
                 elif buttons["quit"].collidepoint(mouse_pos):
-                    pygame.quit(); sys.exit()
+                    return None
+                elif buttons["resume"].collidepoint(mouse_pos) and os.path.exists(SUSPEND_FILE):
+                    scene = resume_suspended_game()
+                    if scene is not None:
+                        return scene
+                    drawn = None  # the Resume button is gone; repaint without it
 
-        clock.tick(30)
+def run_gui_launcher():
+    """Open the window on the menu and run screens until the player quits."""
+    SceneManager(launcher).run()
 
 if __name__ == "__main__":
     reset_to_defaults()
@@ -0,0 +1,399 @@
+# openings.py – precomputed opening book: where the bot puts its snakes and where it fires first
+#
+#   python openings.py                              # (re)build openings.bsb for BOARDS
+#   python openings.py --boards 12x12x8 16x16x10:hex --games 20000
+#   python openings.py --check 2000                 # bot with and without the book, per board
+#
+# Games with "opening_book": "openings.bsb" in their settings (the launcher's
+# defaults have it; relative paths are taken from this directory, not the
+# working directory) look up their board when they start: the bot then places
+# its snakes by the book's weights and fires the book's shots in order until
+# it first hits, at no cost beyond a table lookup. Boards the book doesn't
+# cover use the nearest snake count for the same board, or else play as
+# before (uniform placement, random or bot_ai shots).
+#
+# Both tables come from simulated games against a user who places at random
+# and fires with a tournament.py policy (random by default):
+#   placement  each cell's weight grows with how long bot snakes starting
+#              there survived, pooled over the board's mirror images
+#   shots      all the games are played in step with the book built so far;
+#              before each bot turn the next shot is the cell holding the most
+#              user snakes across the games where the bot has not hit yet
+#
+# File layout, little-endian, read in place through mmap:
+#   header   b"BSOB", u8 version, u32 n
+#   index    n entries: u16 rows, u16 cols, u16 snakes, u8 topology, pad,
+#            u32 offset, u32 shots
+#   tables   at each offset (8-byte aligned): rows*cols u32 running totals of
+#            the placement weights, then `shots` u32 cells
+# Cells are y * cols + x; topology indexes TOPOLOGY_CODES.
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from engine import ENGINES, CellPool, Coord, GameEngine
+from topology import Topology, topology
+
+MAGIC = b"BSOB"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+ENTRY = struct.Struct("<HHHBxII")
+TOPOLOGY_CODES = ("rect", "torus", "hex")
+BOOK_FILE = "openings.bsb"
+HERE = os.path.dirname(os.path.abspath(__file__))  # relative book paths start here
+# Boards built by default: the launcher's default and sizes often picked in
+# the customiser.
+BOARDS = ("8x8x5", "10x10x7", "12x12x8", "15x15x10")
+
+Key = Tuple[int, int, int, str]  # rows, cols, snakes per player, topology
+
+PLACE_TRIES = 32      # weighted draws before placing uniformly among the free cells
+PRIOR_SNAKES = 20     # pseudo-observations pulling a cell's survival towards the mean
+SHARPEN = 4           # survival ratio -> weight exponent; finite, so no cell is ruled out
+WEIGHT_TOTAL = 1 << 20
+
+
+class Opening:
+    """One board's entry: placement weights (as running totals, so a draw is
+    a bisect) and the opening shots as cell indices."""
+
+    __slots__ = ("cumulative", "shots", "cols", "path")
+
+    def __init__(self, cumulative: Sequence[int], shots: Sequence[int], cols: int,
+                 path: Optional[str] = None):
+        self.cumulative = cumulative
+        self.shots = shots
+        self.cols = cols
+        self.path = path
+
+    def config(self) -> dict:
+        """The settings entry that finds this opening again (for replays and snapshots)."""
+        return {"opening_book": self.path}
+
+    def place(self, free: CellPool, rng: random.Random) -> Coord:
+        """Take a cell from `free` by the placement weights; uniformly once
+        draws keep landing on taken cells."""
+        cumulative, cols = self.cumulative, self.cols
+        total = cumulative[-1]
+        for _ in range(PLACE_TRIES):
+            i = bisect_right(cumulative, rng.randrange(total))
+            xy = (i % cols, i // cols)
+            if xy in free:
+                free.discard(xy)
+                return xy
+        return free.pop_random(rng)
+
+
+class OpeningBook:
+    """A parsed book over any buffer (an mmap for games, bytes when rebuilding).
+
+    The tables stay in the buffer: an Opening's sequences are views into it.
+    """
+
+    def __init__(self, data, path: Optional[str] = None):
+        self.path = path
+        view = memoryview(data)
+        if len(view) < HEADER.size:
+            raise ValueError("not an opening book")
+        magic, version, n = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not an opening book")
+        if version != VERSION:
+            raise ValueError(f"unsupported opening book version {version}")
+        if HEADER.size + n * ENTRY.size > len(view):
+            raise ValueError("truncated opening book")
+        self._view = view
+        self._index: Dict[Key, Tuple[int, int]] = {}
+        for k in range(n):
+            rows, cols, snakes, topo, offset, shots = ENTRY.unpack_from(view, HEADER.size + k * ENTRY.size)
+            if topo >= len(TOPOLOGY_CODES) or offset + 4 * (rows * cols + shots) > len(view):
+                raise ValueError("corrupt opening book index")
+            self._index[rows, cols, snakes, TOPOLOGY_CODES[topo]] = (offset, shots)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> List[Key]:
+        return sorted(self._index)
+
+    def _words(self, offset: int, n: int) -> Sequence[int]:
+        words = self._view[offset:offset + 4 * n]
+        if sys.byteorder == "little":
+            return words.cast("I")
+        out = array("I", words)
+        out.byteswap()
+        return out
+
+    def get(self, key: Key) -> Opening:
+        """The entry stored under exactly `key`; KeyError if there is none."""
+        offset, shots = self._index[key]
+        size = key[0] * key[1]
+        return Opening(self._words(offset, size), self._words(offset + 4 * size, shots), key[1], self.path)
+
+    def find(self, rows: int, cols: int, snakes: int, topo: str = "rect") -> Optional[Opening]:
+        """The entry for this board, else the one for the same board with the
+        nearest snake count, else None."""
+        if (rows, cols, snakes, topo) in self._index:
+            return self.get((rows, cols, snakes, topo))
+        near = [k for k in self._index if k[:2] == (rows, cols) and k[3] == topo]
+        if not near:
+            return None
+        return self.get(min(near, key=lambda k: (abs(k[2] - snakes), k[2])))
+
+
+@lru_cache(maxsize=4)
+def load(path: str) -> Optional[OpeningBook]:
+    """The book at `path` (relative to this module's directory), mapped
+    once per process; None if there is no such file, or it is empty or
+    malformed, so games play on without a book."""
+    try:
+        with open(os.path.join(HERE, path), "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    try:
+        return OpeningBook(data, path)
+    except ValueError as e:
+        print(f"⚠ Ignoring opening book {path}: {e}.")
+        return None
+
+
+def find_opening(path: str, rows: int, cols: int, snakes: int, topo: str = "rect") -> Optional[Opening]:
+    """The book's opening for this board, or None if there is no book or it
+    has nothing for the board."""
+    book = load(path)
+    return book.find(rows, cols, snakes, topo) if book is not None else None
+
+
+def write(path: str, entries: Dict[Key, Tuple[Sequence[int], Sequence[int]]]):
+    """Write a book of {key: (placement running totals, shots)}."""
+    keys = sorted(entries)
+    offset = HEADER.size + len(keys) * ENTRY.size
+    head = bytearray(HEADER.pack(MAGIC, VERSION, len(keys)))
+    tables = bytearray()
+    for rows, cols, snakes, topo in keys:
+        cumulative, shots = entries[rows, cols, snakes, topo]
+        offset += -offset % 8
+        tables += bytes(-len(tables) % 8)
+        head += ENTRY.pack(rows, cols, snakes, TOPOLOGY_CODES.index(topo), offset, len(shots))
+        words = array("I", cumulative) + array("I", shots)
+        if sys.byteorder != "little":
+            words.byteswap()
+        tables += words.tobytes()
+        offset += 4 * len(words)
+    head += bytes(-len(head) % 8)
+    with open(path, "wb") as f:
+        f.write(head + tables)
+
+
+# ─────── building ─────────────────────────────────────────────────────────
+def parse_board(spec: str) -> Key:
+    """(rows, cols, snakes, topology) from "12x12x8" or "16x16x10:hex"."""
+    dims, _, topo = spec.partition(":")
+    try:
+        rows, cols, snakes = (int(v) for v in dims.split("x"))
+    except ValueError:
+        raise ValueError(f"board {spec!r} is not ROWSxCOLSxSNAKES[:topology]") from None
+    topo = topo or "rect"
+    if topo not in TOPOLOGY_CODES:
+        raise ValueError(f"unknown topology {topo!r} (known: {', '.join(TOPOLOGY_CODES)})")
+    if rows < 1 or cols < 1 or not 1 <= snakes <= rows * cols // 2:
+        raise ValueError(f"board {spec!r} has no room for its snakes")
+    if max(rows, cols, snakes) > 0xFFFF:
+        raise ValueError(f"board {spec!r} is too big for the book's index")
+    return rows, cols, snakes, topo
+
+
+def _settings(key: Key) -> dict:
+    rows, cols, snakes, topo = key
+    return {"rows": rows, "cols": cols, "snakes_per_player": snakes, "topology": topo}
+
+
+def _new_game(cls: type, settings: dict, opening: Optional[Opening] = None) -> GameEngine:
+    """A game with the user's snakes placed at random, ready for battle."""
+    game = cls({**settings, "seed": random.getrandbits(64)})
+    game.opening = opening
+    while game.phase == "placement":
+        game.place_snake(random.randrange(game.cols), random.randrange(game.rows))
+    return game
+
+
+def _mirrors(topo: Topology) -> List[List[int]]:
+    """Cell permutations under which the board looks the same: its flips
+    (and transposes if square) for walled rectangles, none otherwise."""
+    if topo.name != "rect":
+        return [list(range(topo.size))]
+    rows, cols = topo.rows, topo.cols
+    maps = [lambda x, y: (x, y), lambda x, y: (cols - 1 - x, y),
+            lambda x, y: (x, rows - 1 - y), lambda x, y: (cols - 1 - x, rows - 1 - y)]
+    if rows == cols:
+        maps += [lambda x, y, m=m: m(y, x) for m in maps]
+    perms = []
+    for m in maps:
+        perms.append([y * cols + x for x, y in (m(cx, cy) for cx, cy in topo.coords)])
+    return perms
+
+
+def placement_weights(cls: type, settings: dict, games: int, policy) -> List[int]:
+    """Running totals of per-cell weights, from how many turns bot snakes
+    placed uniformly on each cell survived."""
+    topo = topology(settings["topology"], settings["rows"], settings["cols"])
+    cols = topo.cols
+    turns, count = [0] * topo.size, [0] * topo.size
+    for _ in range(games):
+        game = _new_game(cls, settings)
+        snakes = game.bot.snakes
+        starts = [s.xy[1] * cols + s.xy[0] for s in snakes]
+        died: List[Optional[int]] = [None] * len(snakes)
+        while not game.over:
+            game.step(policy(game))
+            for k, s in enumerate(snakes):
+                if died[k] is None and not s.alive:
+                    died[k] = game.turns_taken
+        # Snakes that outlived the game count its length: a lower bound.
+        for i, t in zip(starts, died):
+            turns[i] += game.turns_taken if t is None else t
+            count[i] += 1
+
+    perms = _mirrors(topo)
+    turns = [sum(turns[p[i]] for p in perms) for i in range(topo.size)]
+    count = [sum(count[p[i]] for p in perms) for i in range(topo.size)]
+    mean = sum(turns) / max(sum(count), 1)
+    if mean <= 0:
+        return list(range(1, topo.size + 1))
+    ratio = [(t + PRIOR_SNAKES * mean) / (c + PRIOR_SNAKES) / mean for t, c in zip(turns, count)]
+    weights = [r ** SHARPEN for r in ratio]
+    scale = WEIGHT_TOTAL / sum(weights)
+    return list(accumulate(max(1, round(w * scale)) for w in weights))
+
+
+def opening_shots(cls: type, settings: dict, games: int, policy,
+                  max_shots: int, min_games: int) -> List[int]:
+    """Bot shots in order, chosen greedily over `games` games played in step
+    (see the top of the file)."""
+    topo = topology(settings["topology"], settings["rows"], settings["cols"])
+    cols = topo.cols
+    shots = array("I")
+    # The games read the book as it grows; bots place uniformly meanwhile.
+    opening = Opening(array("I", range(1, topo.size + 1)), shots, cols)
+    live = [_new_game(cls, settings, opening) for _ in range(games)]
+    fired = bytearray(topo.size)
+    while len(shots) < max_shots:
+        live = [g for g in live if not g.over and not g.bot.hits]
+        if len(live) < min_games:
+            break
+        counts = [0] * topo.size
+        for g in live:
+            for s in g.user.alive_snakes():
+                counts[s.xy[1] * cols + s.xy[0]] += 1
+        best = max((i for i in range(topo.size) if not fired[i]), key=counts.__getitem__)
+        fired[best] = 1
+        shots.append(best)
+        for g in live:
+            g.step(policy(g))
+    return list(shots)
+
+
+def build(job: dict) -> dict:
+    """Worker entry point: one board's tables."""
+    from tournament import resolve_policy
+    random.seed(f"{job['seed']}:{job['board']}")
+    key = parse_board(job["board"])
+    cls, settings = ENGINES[job["mode"]], _settings(key)
+    policy = resolve_policy(job["user"])
+    size = key[0] * key[1]
+    cumulative = placement_weights(cls, settings, job["games"], policy)
+    shots = opening_shots(cls, settings, job["games"], policy,
+                          min(job["max_shots"], size // 2), max(job["games"] // 10, 1))
+    return {"key": key, "cumulative": cumulative, "shots": shots}
+
+
+def check(job: dict) -> dict:
+    """Worker entry point: the bot's win rate, and how many turns it takes
+    to find a first snake, on one board with and without its opening."""
+    from tournament import resolve_policy
+    key = parse_board(job["board"])
+    cls, settings = ENGINES[job["mode"]], _settings(key)
+    policy = resolve_policy(job["user"])
+    opening = OpeningBook(job["data"], job["path"]).find(*key)
+    out = {"board": job["board"]}
+    for name, book in (("uniform", None), ("book", opening)):
+        random.seed(f"{job['seed']}:{job['board']}:check")
+        wins = first_hit = 0
+        for _ in range(job["games"]):
+            game = _new_game(cls, settings, book)
+            while not game.over:
+                game.step(policy(game))
+                first_hit += not game.bot.hits
+            wins += game.end_winner == "Bot"
+        out[name] = (wins / job["games"], first_hit / job["games"])
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build or check the bot's opening book.")
+    ap.add_argument("--boards", nargs="+", default=list(BOARDS),
+                    help="ROWSxCOLSxSNAKES[:topology] (default: %(default)s)")
+    ap.add_argument("--games", type=int, default=4000, help="simulated games per board and table")
+    ap.add_argument("--max-shots", type=int, default=64, help="longest opening per board")
+    ap.add_argument("--mode", choices=sorted(ENGINES), default="regular")
+    ap.add_argument("--user", default="random",
+                    help="user strategy to open against (see tournament.py)")
+    ap.add_argument("--check", type=int, metavar="GAMES",
+                    help="instead of building, play GAMES games per board with and without the book")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=os.path.join(HERE, BOOK_FILE))
+    args = ap.parse_args(argv)
+    try:
+        for board in args.boards:
+            parse_board(board)
+    except ValueError as e:
+        ap.error(str(e))
+
+    # Rebuilding some boards keeps the others already in the book.
+    entries: Dict[Key, Tuple[Sequence[int], Sequence[int]]] = {}
+    if os.path.exists(args.out):
+        with open(args.out, "rb") as f:
+            data = f.read()
+        old = OpeningBook(data, args.out)
+        entries = {k: (list(o.cumulative), list(o.shots)) for k in old.keys() for o in (old.get(k),)}
+    elif args.check:
+        ap.error(f"no opening book at {args.out}")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        if args.check:
+            jobs = [pool.submit(check, {"board": b, "games": args.check, "mode": args.mode,
+                                        "user": args.user, "seed": args.seed,
+                                        "data": data, "path": args.out}) for b in args.boards]
+            for fut in as_completed(jobs):
+                r = fut.result()
+                (u_win, u_miss), (b_win, b_miss) = r["uniform"], r["book"]
+                print(f"{r['board']:14} with the book: bot wins {u_win:.1%} -> {b_win:.1%}, "
+                      f"misses before its first hit {u_miss:.1f} -> {b_miss:.1f}")
+            return
+        jobs = [pool.submit(build, {"board": b, "games": args.games, "max_shots": args.max_shots,
+                                    "mode": args.mode, "user": args.user, "seed": args.seed})
+                for b in args.boards]
+        for fut in as_completed(jobs):
+            r = fut.result()
+            entries[r["key"]] = (r["cumulative"], r["shots"])
+            print(f"{'x'.join(map(str, r['key'][:3]))}:{r['key'][3]}  {len(r['shots'])} opening shots "
+                  f"({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+    write(args.out, entries)
+    print(f"{len(entries)} boards in {args.out} ({os.path.getsize(args.out):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
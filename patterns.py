@@ -0,0 +1,191 @@
+# patterns.py – attack shapes for the user's shots, compiled once per board size and shape
+#
+# A pattern is a small grid of '#' (cell hit) and '.' (not hit), centred on
+# the cell the user picks; rows and columns must be odd. Modes name one in
+# GameEngine.attack_pattern, and any game can override it with
+# "attack_pattern" in its settings, either a name from PATTERNS or a grid of
+# its own, e.g. board_settings.json:
+#
+#   {"rows": 30, "cols": 30, "attack_pattern": ["#.#", ".#.", "#.#"]}
+#
+# kernel() fits a pattern to a board's size and shape (topology.py): which
+# cells it covers from any centre, already clipped to the board or wrapped
+# around it, as coordinates or as one bitmask, so firing it needs no bounds
+# checks and a bitboard records the whole shot in a couple of big-int
+# operations. On hex boards the grid is read as seen from an even row.
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Union
+
+from topology import Topology
+
+Coord = Tuple[int, int]
+Offset = Tuple[int, int]
+PatternSpec = Union[str, Sequence[str]]  # a PATTERNS name or a grid
+
+PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "single": ("#",),
+    "cross": (".#.",
+              "###",
+              ".#."),
+    "square": ("###",
+               "###",
+               "###"),
+    "line": ("#####",),
+    "diamond": ("..#..",
+                ".###.",
+                "#####",
+                ".###.",
+                "..#.."),
+}
+# Names that mean a different grid on some board shapes.
+SHAPE_PATTERNS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "hex": {"cross": ("##.",   # the centre and its six neighbours
+                      "###",
+                      "##.")},
+}
+
+
+def offsets(spec: PatternSpec, shape: str = "rect") -> Tuple[Offset, ...]:
+    """(dx, dy) of every cell a pattern hits, relative to its centre, on a
+    `shape` board.
+
+    Raises ValueError for an unknown name or a malformed grid.
+    """
+    if isinstance(spec, str):
+        named = {**PATTERNS, **SHAPE_PATTERNS.get(shape, {})}
+        if spec not in named:
+            raise ValueError(f"unknown attack pattern {spec!r} (known: {', '.join(named)})")
+        spec = named[spec]
+    grid = list(spec)
+    if not grid or any(len(row) != len(grid[0]) for row in grid):
+        raise ValueError("attack pattern rows must be non-empty and the same length")
+    if len(grid) % 2 == 0 or len(grid[0]) % 2 == 0:
+        raise ValueError("attack pattern needs an odd number of rows and columns")
+    if any(ch not in "#." for row in grid for ch in row):
+        raise ValueError("attack pattern cells must be '#' or '.'")
+    cx, cy = len(grid[0]) // 2, len(grid) // 2
+    out = tuple((x - cx, y - cy) for y, row in enumerate(grid) for x, ch in enumerate(row) if ch == "#")
+    if not out:
+        raise ValueError("attack pattern hits no cells")
+    return out
+
+
+class Kernel:
+    """A pattern fitted to a rows x cols board with walls for edges.
+
+    Only centres within reach of an edge lose cells, so each column gets a
+    key naming which dx survive there (likewise rows and dy); the clipped
+    offset lists and bitmasks are built once per key.
+    """
+
+    def __init__(self, offs: Tuple[Offset, ...], rows: int, cols: int):
+        self.offsets = offs
+        self.rows, self.cols = rows, cols
+        self.full = (1 << rows * cols) - 1
+        dxs = sorted({dx for dx, _ in offs})
+        dys = sorted({dy for _, dy in offs})
+
+        def keys(n: int, ds: List[int]) -> List[int]:
+            # Bit k of a key: ds[k] stays on the board from this position.
+            return [sum(1 << k for k, d in enumerate(ds) if 0 <= v + d < n) for v in range(n)]
+        self._xkey = keys(cols, dxs)
+        self._ykey = keys(rows, dys)
+
+        def kept(key: int, ds: List[int]) -> set:
+            return {d for k, d in enumerate(ds) if key >> k & 1}
+        self._cells: Dict[Tuple[int, int], Tuple[Offset, ...]] = {
+            (xk, yk): tuple(o for o in offs if o[0] in kept(xk, dxs) and o[1] in kept(yk, dys))
+            for xk in set(self._xkey) for yk in set(self._ykey)}
+
+        # Bit masks relative to the centre's bit, less `base` so they start at
+        # bit 0. Rows off the board fall off the ends when shifted into place;
+        # columns would wrap to the next row instead, so they are dropped per key.
+        self.base = min(dy * cols + dx for dx, dy in offs)
+        self._masks: Dict[int, int] = {}
+        for xk in set(self._xkey):
+            xs = kept(xk, dxs)
+            self._masks[xk] = sum(1 << (dy * cols + dx - self.base) for dx, dy in offs if dx in xs)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def cells(self, xy: Coord) -> List[Coord]:
+        """The board cells covered with the centre on xy (none if xy is off
+        the board)."""
+        x, y = xy
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return []
+        return [(x + dx, y + dy) for dx, dy in self._cells[self._xkey[x], self._ykey[y]]]
+
+    def mask(self, xy: Coord) -> int:
+        """cells(xy) as a bitmask, cell (x, y) being bit y*cols + x."""
+        x, y = xy
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return 0
+        shift = y * self.cols + x + self.base
+        m = self._masks[self._xkey[x]]
+        return (m << shift if shift >= 0 else m >> -shift) & self.full
+
+
+class ParityKernel:
+    """Kernels for even and odd rows, for boards whose rows are offset."""
+
+    def __init__(self, even: Kernel, odd: Kernel):
+        self.offsets = even.offsets
+        self._by_parity = (even, odd)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def cells(self, xy: Coord) -> List[Coord]:
+        return self._by_parity[xy[1] & 1].cells(xy)
+
+    def mask(self, xy: Coord) -> int:
+        return self._by_parity[xy[1] & 1].mask(xy)
+
+
+class WrappedKernel:
+    """A pattern on a board whose edges join up: cells wrap around instead
+    of being clipped."""
+
+    def __init__(self, offs: Tuple[Offset, ...], rows: int, cols: int):
+        self.offsets = offs
+        self.rows, self.cols = rows, cols
+        # A pattern wider or taller than the board would cover a cell twice.
+        self._overlaps = (max(dx for dx, _ in offs) - min(dx for dx, _ in offs) >= cols
+                          or max(dy for _, dy in offs) - min(dy for _, dy in offs) >= rows)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def cells(self, xy: Coord) -> List[Coord]:
+        x, y = xy
+        rows, cols = self.rows, self.cols
+        if not (0 <= x < cols and 0 <= y < rows):
+            return []
+        out = [((x + dx) % cols, (y + dy) % rows) for dx, dy in self.offsets]
+        return list(dict.fromkeys(out)) if self._overlaps else out
+
+    def mask(self, xy: Coord) -> int:
+        cols = self.cols
+        m = 0
+        for x, y in self.cells(xy):
+            m |= 1 << (y * cols + x)
+        return m
+
+
+AnyKernel = Union[Kernel, ParityKernel, WrappedKernel]
+
+
+@lru_cache(maxsize=32)
+def _kernel(offs: Tuple[Offset, ...], topo: Topology) -> AnyKernel:
+    if topo.wraps:
+        return WrappedKernel(offs, topo.rows, topo.cols)
+    parts = [Kernel(o, topo.rows, topo.cols) for o in topo.pattern_offsets(offs)]
+    return parts[0] if len(parts) == 1 else ParityKernel(*parts)
+
+
+def kernel(spec: PatternSpec, topo: Topology) -> AnyKernel:
+    """The pattern fitted to a board of topo's size and shape; shared by
+    every game of that size and shape using it."""
+    return _kernel(offsets(spec, topo.name), topo)
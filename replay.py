@@ -0,0 +1,268 @@
+# replay.py – compact binary game logs: record, verify headless, step through in the UI
+#
+#   python replay.py game.bsr            # re-run headless and check it matches
+#   python replay.py game.bsr --dump     # print every event
+#   python replay.py game.bsr --gui      # step through it: Space/→ next event, Esc quits
+#
+# Record a game by putting "record": "game.bsr" in its settings (e.g.
+# board_settings.json), or attach ReplayRecorder(game) yourself.
+#
+# File layout, little-endian:
+#   header   b"BSRP", u8 version, u32 n, n bytes of JSON
+#            {"mode", "backend", "user", "settings"} – settings include the seed
+#   events   one tag byte each, then
+#     P  u8 player, u32 cell, u8 colour   a snake placed (player 0 user, 1 bot)
+#     U  u32 cell, u8 hit                 the user's shot
+#     S  u32 cell, u8 hit                 the bot's shot
+#     M  u32 n, n * u32 (snake << 2 | direction)   snakes that stepped E/W/S/N
+#     J  u32 snake, u32 cell              any other move (custom move_fn, torus wrap, hex diagonal)
+# Cells are y * cols + x; colour indexes engine.SNAKE_COLOURS; snake numbers
+# the user's snakes 0.. then the bot's, in list order (player * snakes_per_player
+# + index). Only P (player 0) and U are inputs – everything
+# else is derived from the seed, so replaying re-runs the rules and checks
+# that they still produce the logged bot shots and moves.
+import argparse
+import json
+import struct
+import sys
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+from engine import ENGINES, SNAKE_COLOURS, Coord, GameEngine, Snake, mode_and_backend
+
+MAGIC = b"BSRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+PLACE = struct.Struct("<cBIB")
+SHOT = struct.Struct("<cIB")
+MOVES = struct.Struct("<cI")
+JUMP = struct.Struct("<cII")
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))  # E, W, S, N: the 2-bit directions in M
+
+
+class ReplayMismatch(Exception):
+    """Re-running a replay produced different events from the log."""
+
+
+class ReplayRecorder:
+    """Logs a game's events as it is played. The engine calls the hooks;
+    the log is written to `path` (if given) when the game ends."""
+
+    def __init__(self, game: GameEngine, path: Optional[str] = None):
+        self.game = game
+        self.path = path
+        settings = {"rows": game.rows, "cols": game.cols,
+                    "snakes_per_player": game.snakes_each, "seed": game.seed}
+        settings.update(game.board_config())
+        if game.bot_ai is not None:
+            settings.update(game.bot_ai.config())
+        if game.mover is not None:
+            settings["move_rule"] = "simultaneous"
+        if game.opening is not None:
+            settings.update(game.opening.config())
+        mode, backend = mode_and_backend(game)
+        meta = json.dumps({"mode": mode, "backend": backend, "user": game.user.name,
+                           "settings": settings}).encode()
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, len(meta)) + meta)
+        self.header_len = len(self.data)
+        # Last logged cell of every snake, for diffing after each move phase.
+        self._cells: List[List[int]] = [[self._cell(s.xy) for s in p.snakes] for p in game.players]
+        game.recorder = self
+
+    def _cell(self, xy: Coord) -> int:
+        return xy[1] * self.game.cols + xy[0]
+
+    def placed(self, player: int, snake: Snake):
+        cell = self._cell(snake.xy)
+        colour = SNAKE_COLOURS.index(snake.colour) if snake.colour in SNAKE_COLOURS else 255
+        self.data += PLACE.pack(b"P", player, cell, colour)
+        self._cells[player].append(cell)
+
+    def user_shot(self, xy: Coord, hit: bool):
+        self.data += SHOT.pack(b"U", self._cell(xy), hit)
+
+    def bot_shot(self, xy: Coord, hit: bool):
+        self.data += SHOT.pack(b"S", self._cell(xy), hit)
+
+    def moved(self):
+        cols, each = self.game.cols, self.game.snakes_each
+        steps = {1: 0, -1: 1, cols: 2, -cols: 3}
+        words = array("I")
+        jumps = bytearray()
+        for p_i, p in enumerate(self.game.players):
+            last = self._cells[p_i]
+            for i, s in enumerate(p.snakes):
+                cell = s.xy[1] * cols + s.xy[0]
+                if cell != last[i]:
+                    d = steps.get(cell - last[i])
+                    # A ±1 cell step that wraps a row edge is a jump, not E/W.
+                    if d is None or (d < 2 and cell // cols != last[i] // cols):
+                        jumps += JUMP.pack(b"J", p_i * each + i, cell)
+                    else:
+                        words.append((p_i * each + i) << 2 | d)
+                    last[i] = cell
+        if sys.byteorder != "little":
+            words.byteswap()
+        self.data += MOVES.pack(b"M", len(words)) + words.tobytes() + jumps
+
+    def finish(self):
+        if self.path:
+            with open(self.path, "wb") as f:
+                f.write(self.data)
+
+
+class Replay:
+    """A parsed replay: header fields plus the event list."""
+
+    def __init__(self, data: bytes):
+        magic, version, n = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a BattleSnakes replay")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        meta = json.loads(data[HEADER.size:HEADER.size + n])
+        self.mode: str = meta["mode"]
+        self.backend: str = meta["backend"]
+        self.user: str = meta["user"]
+        self.settings: dict = meta["settings"]
+        self.data = bytes(data)
+        self.header_len = HEADER.size + n
+        self.events = self._parse(self.header_len)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def _parse(self, pos: int) -> list:
+        data, cols = self.data, self.settings["cols"]
+        events = []
+        while pos < len(data):
+            tag = data[pos:pos + 1]
+            start = pos
+            if tag == b"P":
+                _, player, cell, colour = PLACE.unpack_from(data, pos)
+                pos += PLACE.size
+                ev = ("P", player, (cell % cols, cell // cols), colour)
+            elif tag in (b"U", b"S"):
+                _, cell, hit = SHOT.unpack_from(data, pos)
+                pos += SHOT.size
+                ev = (tag.decode(), (cell % cols, cell // cols), bool(hit))
+            elif tag == b"M":
+                _, n = MOVES.unpack_from(data, pos)
+                pos += MOVES.size
+                words = array("I", data[pos:pos + 4 * n])
+                if sys.byteorder != "little":
+                    words.byteswap()
+                pos += 4 * n
+                ev = ("M", [(w >> 2, STEPS[w & 3]) for w in words])
+            elif tag == b"J":
+                _, snake, cell = JUMP.unpack_from(data, pos)
+                pos += JUMP.size
+                ev = ("J", snake, (cell % cols, cell // cols))
+            else:
+                raise ValueError(f"bad event tag {tag!r} at byte {pos}")
+            events.append((start, pos, ev))
+        return events
+
+    def inputs(self) -> List[Tuple[str, Coord]]:
+        """The user's actions in order: ("P", xy) placements and ("U", xy) shots."""
+        return [(ev[0], ev[2] if ev[0] == "P" else ev[1])
+                for _, _, ev in self.events if ev[0] == "U" or (ev[0] == "P" and ev[1] == 0)]
+
+    def engine_class(self, base: Optional[type] = None) -> type:
+        cls = base or ENGINES[self.mode]
+        if self.backend == "bits":
+            from bitboard import bitboard_engine
+            cls = bitboard_engine(cls)
+        return cls
+
+    def new_game(self, base: Optional[type] = None) -> GameEngine:
+        return self.engine_class(base)(dict(self.settings), self.user)
+
+
+def replay_headless(replay: Replay) -> GameEngine:
+    """Re-run the logged inputs on a fresh engine and check that every
+    derived event matches; raises ReplayMismatch at the first difference."""
+    game = replay.new_game()
+    rec = ReplayRecorder(game)
+    checked = 0
+    for kind, xy in replay.inputs():
+        try:
+            if kind == "P":
+                game.place_snake(*xy)
+            else:
+                game.step(xy)
+        except ValueError as e:
+            raise ReplayMismatch(f"input {kind} {xy} rejected: {e}") from None
+        new = len(rec.data)
+        if rec.data[checked:new] != replay.data[checked:new]:
+            for i, (start, end, ev) in enumerate(replay.events):
+                if rec.data[start:end] != replay.data[start:end]:
+                    raise ReplayMismatch(f"event {i} differs: logged {ev}")
+            raise ReplayMismatch("game went on after the logged end")
+        checked = new
+    if len(rec.data) != len(replay.data):
+        raise ReplayMismatch("game ended before the logged end")
+    return game
+
+
+def replay_gui(replay: Replay):
+    """Step through a replay in the game window: Space or → plays the next
+    user action (and the bot's answer), Esc or closing the window quits."""
+    import pygame
+    from Difficulty import EasyGame, HardGame, RegularGame
+
+    gui = {"easy": EasyGame, "regular": RegularGame, "hard": HardGame}[replay.mode]
+    game = replay.new_game(gui)
+    pygame.display.set_caption(f"BattleSnakes replay – {replay.user}")
+    inputs = replay.inputs()
+    i = 0
+    while True:
+        game.draw()
+        e = pygame.event.wait(game.ms_until_next_timer())
+        if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
+            break
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_SPACE, pygame.K_RIGHT) and i < len(inputs):
+            kind, (x, y) = inputs[i]
+            i += 1
+            if kind == "P":
+                game.handle_placement_click(x, y)
+            else:
+                game.pending = (x, y)
+                game.confirm_attack()
+                if game.bot_attack_pending:
+                    game.bot_attack_pending = False
+                    game.bot_turn()
+    pygame.quit()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Verify, dump or watch a BattleSnakes replay.")
+    ap.add_argument("path")
+    ap.add_argument("--dump", action="store_true", help="print every event")
+    ap.add_argument("--gui", action="store_true", help="step through the game in a window")
+    args = ap.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    print(f"{replay.mode} ({replay.backend}) {replay.settings['rows']}x{replay.settings['cols']}, "
+          f"user {replay.user!r}, seed {replay.settings['seed']}, {len(replay.events)} events")
+    if args.dump:
+        for _, _, ev in replay.events:
+            print(*ev)
+    if args.gui:
+        replay_gui(replay)
+        return
+    t = time.perf_counter()
+    try:
+        game = replay_headless(replay)
+    except ReplayMismatch as e:
+        sys.exit(f"MISMATCH: {e}")
+    elapsed = time.perf_counter() - t
+    print(f"OK: {game.end_winner or 'nobody'} won after {game.turns_taken} turns "
+          f"(replayed in {elapsed * 1e3:.1f} ms, {game.turns_taken / max(elapsed, 1e-9):,.0f} turns/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# scenes.py – one window for every screen: launcher, board customiser, scores and games
+#
+# A scene is a function that runs one screen until the user leaves it and
+# returns the scene to show next, or None to quit. SceneManager.run() calls
+# them one after another from a flat loop, so going back and forth between
+# the menu and games never nests one screen's loop inside another's, and a
+# finished game is dropped as soon as its scene returns.
+import gc
+from typing import Callable, Optional, Tuple
+
+import pygame
+
+import assets
+
+Scene = Callable[["SceneManager"], Optional[Callable]]
+
+
+def display(size: Tuple[int, int], caption: str) -> pygame.Surface:
+    """The window, resized to `size` only if it isn't already; every screen
+    draws on this one display instead of opening its own."""
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != tuple(size):
+        screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    return screen
+
+
+class SceneManager:
+    """Runs scenes until one returns None, then closes pygame.
+
+    `home` is the scene others go back to (the launcher); `username` is
+    whatever was typed into it, kept across visits.
+    """
+
+    def __init__(self, home: Scene):
+        assets.init()
+        self.home = home
+        self.username = ""
+
+    def run(self, scene: Optional[Scene] = None):
+        scene = scene or self.home
+        while scene is not None:
+            scene = scene(self)
+            # A game leaves reference cycles (snakes <-> their owner's index,
+            # bots <-> game) holding its surfaces; free them now rather than
+            # whenever the collector next gets round to it.
+            gc.collect()
+        pygame.quit()
@@ -1,32 +1,79 @@
 import os
+import sqlite3
+from typing import List, Tuple
 
-SCORES_FILE = "scores.txt"
+from instrument import timed
 
+SCORES_FILE = "scores.txt"  # legacy plain-text scores, imported into the DB once
+SCORES_DB = "scores.db"
 
+# One connection per (process, path); forked game processes open their own.
+_conn: sqlite3.Connection | None = None
+_conn_key: tuple | None = None
+
+
+def _db() -> sqlite3.Connection:
+    global _conn, _conn_key
+    key = (os.getpid(), os.path.abspath(SCORES_DB))
+    if _conn is None or _conn_key != key:
+        # timeout: wait for other game processes' write locks instead of failing
+        conn = sqlite3.connect(SCORES_DB, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")  # readers never block the writer
+        conn.execute("CREATE TABLE IF NOT EXISTS scores ("
+                     "username TEXT PRIMARY KEY, score INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores(score DESC)")
+        _import_legacy(conn)
+        _conn, _conn_key = conn, key
+    return _conn
+
+
+def _import_legacy(conn: sqlite3.Connection):
+    """Copy scores.txt into an empty database (best score per name)."""
+    if not os.path.exists(SCORES_FILE):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None:
+            with open(SCORES_FILE, "r") as f:
+                for line in f:
+                    parts = line.strip().rsplit(" ", 1)  # Split on last space
+                    if len(parts) == 2 and parts[1].isdigit():
+                        _upsert(conn, parts[0], int(parts[1]))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _upsert(conn: sqlite3.Connection, username: str, score: int):
+    # Replace only if it's a better score
+    conn.execute("INSERT INTO scores (username, score) VALUES (?, ?) "
+                 "ON CONFLICT(username) DO UPDATE SET score = excluded.score "
+                 "WHERE excluded.score > scores.score", (username, score))
+
+
+@timed("update_score")
 def update_score(username, new_score):
-    scores = []
-
-    # Load existing scores
-    if os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE, "r") as f:
-            for line in f:
-                name, sc = line.strip().split()
-                scores.append((name, int(sc)))
-
-    # Replace or append the user's score
-    updated = False
-    for i, (name, sc) in enumerate(scores):
-        if name == username:
-            if new_score > sc:
-                scores[i] = (username, new_score)  # Replace only if it's a better score
-            updated = True
-            break
-
-    if not updated:
-        scores.append((username, new_score))
-
-
-    # Write back to file
-    with open(SCORES_FILE, "w") as f:
-        for name, sc in scores:
-            f.write(f"{name} {sc}\n")
\ No newline at end of file
+    """Record new_score for username if it beats their best; one atomic write."""
+    conn = _db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _upsert(conn, username, int(new_score))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def top_scores(k: int = 10) -> List[Tuple[str, int]]:
+    """Best k (username, score) pairs, highest first."""
+    return _db().execute("SELECT username, score FROM scores "
+                         "ORDER BY score DESC LIMIT ?", (k,)).fetchall()
+
+
+def close():
+    """Close this process's connection (e.g. before pointing SCORES_DB elsewhere)."""
+    global _conn, _conn_key
+    if _conn is not None:
+        _conn.close()
+    _conn = _conn_key = None
@@ -0,0 +1,313 @@
+# search.py – lookahead bot: Monte Carlo search over where the user's snakes may be (needs numpy)
+#
+# Enable with settings["bot_ai"] = "search". Optional settings:
+#   "search_ms"      thinking time per shot (default 300)
+#   "search_iters"   fixed simulations per shot instead of a time budget;
+#                    makes the bot's choices reproducible (replays verify)
+#   "search_worker"  False to search in-process (default True: a worker
+#                    process, so a pygame loop keeps running while it thinks)
+import hashlib
+import itertools
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from ai import HeatmapAI, _neighbour_sum, neighbour_index
+from engine import Coord, GameEngine, HardEngine
+from topology import Topology, topology
+
+CANDIDATES = 16   # root moves: the hottest cells the bot may fire at
+DEPTH = 3         # bot shots simulated per world, the first being the root move
+DISCOUNT = 0.9    # a hit now is worth more than one later
+TABLE_SIZE = 4096  # positions kept in the transposition table
+
+
+class SearchAI(HeatmapAI):
+    """HeatmapAI's beliefs, with each shot picked by a search over them.
+
+    The heat map gives, per cell, the expected number of user snakes there.
+    Each search is an expectimax over the CANDIDATES hottest cells: a root
+    shot is worth its exact hit chance plus the discounted hits of DEPTH - 1
+    greedy follow-up shots, averaged over sampled worlds. A world puts a
+    snake on each cell near the shots with probability min(heat, 1) and
+    moves them by Snake.default_move's rule against the cells that would
+    then be dangerous to them. All root shots are played out in the same
+    worlds with the same moves, so comparisons between them are sharp.
+
+    Searches run in a worker process and are keyed by a hash of everything
+    they read, so a position seen before (the opening, in every game) picks
+    up the stored statistics instead of starting over.
+    """
+
+    def __init__(self, game: GameEngine, ms: int = 300, iters: Optional[int] = None,
+                 worker: bool = True):
+        super().__init__(game)
+        self.ms, self.iters, self.worker = ms, iters, worker
+        self._future: Optional[Future] = None
+        self._future_key: Optional[bytes] = None
+        if worker:
+            _executor()  # start the worker now rather than on the first shot
+
+    def copy(self, game: GameEngine) -> "SearchAI":
+        new = super().copy(game)
+        new._future = new._future_key = None
+        return new
+
+    def config(self) -> dict:
+        return {"bot_ai": "search", "search_ms": self.ms, "search_iters": self.iters,
+                "search_worker": self.worker}
+
+    def _position(self) -> dict:
+        """Everything a search reads, in picklable form."""
+        game = self.game
+        cols = game.cols
+        return {"rows": game.rows, "cols": cols, "topology": game.topology.name,
+                "misses_block": not isinstance(game, HardEngine),
+                "heat": self.heat, "safe": self.safe,
+                "blocked": np.array(sorted(y * cols + x for x, y in game.bot.cells()), dtype=np.int64),
+                "danger": np.array(sorted(y * cols + x for x, y in game.danger_cells(game.user)),
+                                   dtype=np.int64),
+                "ms": self.ms, "iters": self.iters}
+
+    def start_search(self):
+        """Begin searching the current position in the background; the next
+        choose_target() collects the result (or searches afresh if the
+        position changed in between)."""
+        if self.remaining and self.worker:
+            pos = self._position()
+            self._future_key = position_key(pos)
+            try:
+                self._future = _executor().submit(search_position, pos)
+            except BrokenProcessPool:
+                self._future = None
+
+    def ready(self) -> bool:
+        """False while a background search is still running."""
+        return self._future is None or self._future.done()
+
+    def choose_target(self) -> Coord:
+        if not self.remaining or self.heat.max() <= 0:
+            return super().choose_target()
+        pos = self._position()
+        future, self._future = self._future, None
+        if future is None or self._future_key != position_key(pos):
+            if future is not None:
+                future.cancel()
+            future = None
+            if self.worker:
+                try:
+                    future = _executor().submit(search_position, pos)
+                except BrokenProcessPool:
+                    pass
+        try:
+            cell = future.result() if future is not None else search_position(pos)
+        except BrokenProcessPool:
+            _reset_executor()
+            cell = search_position(pos)
+        return cell % self.game.cols, cell // self.game.cols
+
+
+# ─────── worker process ───────────────────────────────────────────────────
+_executor_: Optional[ProcessPoolExecutor] = None
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _executor_
+    if _executor_ is None:
+        # spawn, not fork: the parent may have a pygame window open.
+        _executor_ = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _executor_
+
+
+def _reset_executor():
+    global _executor_
+    if _executor_ is not None:
+        _executor_.shutdown(wait=False, cancel_futures=True)
+    _executor_ = None
+
+
+# ─────── the search itself (runs in the worker) ──────────────────────────
+# position key -> [root cells, summed follow-up values, worlds simulated]; least recently used first
+_table: "OrderedDict[bytes, list]" = OrderedDict()
+
+
+def position_key(pos: dict) -> bytes:
+    h = hashlib.md5(b"%d %d %d" % (pos["rows"], pos["cols"], pos["misses_block"]))
+    if pos["topology"] != "rect":
+        h.update(pos["topology"].encode())
+    for name in ("heat", "safe", "blocked", "danger"):
+        h.update(np.ascontiguousarray(pos[name]).tobytes())
+        h.update(b"|")
+    return h.digest()
+
+
+def _diffuse(heat: np.ndarray, safe: np.ndarray, topo: Topology) -> np.ndarray:
+    """One move phase of HeatmapAI.observe_move()."""
+    degree = _neighbour_sum(safe, np.empty_like(safe), topo)
+    stuck = degree == 0
+    share = np.divide(heat, degree, out=np.zeros_like(heat), where=~stuck)
+    moved = _neighbour_sum(share, np.empty_like(share), topo) * safe
+    return moved + heat * stuck
+
+
+def _dilate(mask: np.ndarray, steps: int, topo: Topology) -> np.ndarray:
+    mask = mask.copy()
+    if topo.name != "rect":
+        flat = np.append(mask.ravel(), False)
+        nbrs = neighbour_index(topo)
+        for _ in range(steps):
+            flat[:-1] |= flat[nbrs].any(axis=1)
+        return flat[:-1].reshape(mask.shape)
+    for _ in range(steps):
+        grown = mask.copy()
+        grown[1:, :] |= mask[:-1, :]
+        grown[:-1, :] |= mask[1:, :]
+        grown[:, 1:] |= mask[:, :-1]
+        grown[:, :-1] |= mask[:, 1:]
+        mask = grown
+    return mask
+
+
+@lru_cache(maxsize=4)
+def _orders(degree: int) -> list:
+    """Every order of trying a cell's directions."""
+    return list(itertools.permutations(range(degree)))
+
+
+@lru_cache(maxsize=4)
+def _neighbours(topo: Topology) -> list:
+    """Per cell, its neighbour cells in direction order, -1 where there is none."""
+    table, deg = topo.table, topo.degree
+    return [tuple(table[c * deg:(c + 1) * deg]) for c in range(topo.size)]
+
+
+def search_position(pos: dict) -> int:
+    """The cell (y * cols + x) to fire at."""
+    rows, cols = pos["rows"], pos["cols"]
+    size = rows * cols
+    key = position_key(pos)
+    heat = pos["heat"].ravel()
+    # Like HeatmapAI, fire anywhere the heat says a snake may be; in Hard
+    # that includes old misses snakes have crawled back onto.
+    allowed = heat > 0
+
+    entry = _table.get(key)
+    if entry is None:
+        # Hottest allowed cells, ties broken by a key-seeded jitter so an
+        # even heat map doesn't always favour the top-left corner.
+        jitter = np.random.default_rng(int.from_bytes(key[:8], "little")).random(size)
+        score = np.where(allowed, heat * (1 + 1e-9 * jitter), -1.0)
+        k = min(CANDIDATES, int(allowed.sum()))
+        cand = np.argpartition(-score, k - 1)[:k]
+        cand = cand[np.argsort(-score[cand], kind="stable")]
+        entry = [cand, np.zeros(k), 0]
+    _table[key] = entry
+    _table.move_to_end(key)
+    while len(_table) > TABLE_SIZE:
+        _table.popitem(last=False)
+    cand, totals, done = entry
+    # The root shot's own hit chance is known exactly; only what follows is sampled.
+    p_hit = np.minimum(heat[cand], 1.0)
+    budget = pos["iters"]
+    if budget is not None and done >= budget:
+        return _best(cand, p_hit, totals, done)
+
+    # Greedy follow-up shots: the hottest cells after 1, 2, ... move phases.
+    shape = (rows, cols)
+    topo = topology(pos["topology"], rows, cols)
+    h, safe = pos["heat"], pos["safe"]
+    follow = []
+    for _ in range(DEPTH - 1):
+        h = _diffuse(h, safe, topo)
+        score = h.ravel()
+        k = min(DEPTH + CANDIDATES, size)
+        top = np.argpartition(-score, k - 1)[:k]
+        follow.append(top[np.argsort(-score[top], kind="stable")].tolist())
+    # Only snakes within DEPTH steps of some shot can matter.
+    shots = np.zeros(size, dtype=bool)
+    shots[cand] = True
+    for top in follow:
+        shots[top] = True
+    near = np.flatnonzero(_dilate(shots.reshape(shape), DEPTH, topo).ravel())
+    p_near = np.minimum(heat[near], 1.0)
+
+    blocked = set(pos["blocked"].tolist())
+    danger = set(pos["danger"].tolist())
+    misses_block = pos["misses_block"]
+    cand_list = cand.tolist()
+    nbrs = _neighbours(topo)
+    orders_all = _orders(topo.degree)
+    # Seeded by the position and the work already done on it, so a fixed
+    # world count gives the same answer whenever the position recurs.
+    nrng = np.random.default_rng(int.from_bytes(key[:8], "little") ^ done)
+    deadline = time.perf_counter() + pos["ms"] / 1000
+    n = 0
+    while budget is None or done + n < budget:
+        if budget is None and n and time.perf_counter() >= deadline:
+            break
+        world = near[nrng.random(len(near)) < p_near].tolist()
+        # Every root move plays out in this world with the same snake moves
+        # (common random numbers), so their differences aren't sampling
+        # noise: each snake's direction order per move phase is drawn once.
+        orders = [[orders_all[o] for o in row]
+                  for row in nrng.integers(len(orders_all), size=(DEPTH - 1, len(world))).tolist()]
+        for a, first in enumerate(cand_list):
+            totals[a] += _simulate(first, follow, world, orders, nbrs, blocked, danger, misses_block)
+        n += 1
+    entry[2] = done + n
+    return _best(cand, p_hit, totals, done + n)
+
+
+def _best(cand: np.ndarray, p_hit: np.ndarray, totals: np.ndarray, worlds: int) -> int:
+    """Root move with the best expected value; the hotter cell among equals."""
+    value = p_hit + totals / max(worlds, 1)
+    return int(cand[np.flatnonzero(value >= value.max() - 1e-12)[0]])
+
+
+def _simulate(first: int, follow: list, world: list, orders: list, nbrs: list,
+              blocked: set, danger: set, misses_block: bool) -> float:
+    """Discounted hits from the DEPTH - 1 greedy shots after firing at
+    `first`, with the world's snakes moving in between."""
+    cells = world[:]
+    live = set(cells)
+    shot = set()  # this simulation's shots that now block user snakes
+    fired = set()
+    value, weight = 0.0, 1.0
+    target = first
+    for depth in range(DEPTH):
+        if depth:
+            target = next((c for c in follow[depth - 1] if c not in fired), None)
+            if target is None:
+                break
+        fired.add(target)
+        if target in live:
+            live.discard(target)
+            cells[cells.index(target)] = -1
+            if depth:
+                value += weight
+            shot.add(target)
+        elif misses_block:
+            shot.add(target)
+        weight *= DISCOUNT
+        if depth == DEPTH - 1 or not live:
+            break
+        # Snake.default_move, one snake at a time as snakes_move_phase does.
+        for i, order in enumerate(orders[depth]):
+            c = cells[i]
+            if c < 0:
+                continue
+            nb = nbrs[c]
+            for d in order:
+                nc = nb[d]
+                if nc >= 0 and nc not in live and nc not in blocked and nc not in danger and nc not in shot:
+                    live.discard(c)
+                    live.add(nc)
+                    cells[i] = nc
+                    break
+    return value
@@ -0,0 +1,422 @@
+# server.py – asyncio multiplayer server: authoritative BattleSnakes matches over TCP
+#
+#   python server.py --port 8765                       # serve
+#   python server.py --selftest 200 --idle 2000        # localhost load test with scripted clients
+#
+# Each match runs the engine rules (the same classes the pygame games build
+# on); the server owns the board and clients only send intents. Seat 0 is
+# the engine's user side and shoots first; seat 1 is the engine's bot side,
+# played by a bot or by a second human. Modes whose rules are one-sided
+# (Easy's cross shot, Hard's re-fire) apply to seat 0 as in the local game.
+#
+# Wire format: every message is a frame, u16 length + payload (little-endian),
+# and the payload starts with a one-byte tag.
+#   client -> server
+#     J  u8 opponent (0 bot, 1 heatmap bot, 2 human), u8 mode, u16 rows,
+#        u16 cols, u16 snakes, then the player's name (UTF-8)
+#     P  u32 cell                    place a snake
+#     F  u32 cell                    fire
+#   server -> client
+#     S  u8 seat, u8 mode, u16 rows, u16 cols, u16 snakes, opponent name
+#     p  u32 cell, u8 colour         one of your snakes was placed
+#     B                              both sides placed; battle begins
+#     T  u32 turn, u8 n, n * (u8 seat, u32 cell, u8 hit), u32 m,
+#        m * u32 (snake << 2 | direction)
+#        one frame per shot-and-move phase: the shots fired and how *your*
+#        snakes moved (directions E/W/S/N as in replay.py)
+#     E  u8 winner seat              game over
+#     X  message (UTF-8)             request rejected; the connection stays up
+# Cells are y * cols + x and colours index engine.SNAKE_COLOURS.
+import argparse
+import asyncio
+import random
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from engine import ENGINES, SNAKE_COLOURS, Coord, GameEngine, Snake
+
+MODES = ["easy", "regular", "hard"]
+OPPONENTS = ["bot", "heatmap", "human"]
+
+FRAME = struct.Struct("<H")
+JOIN = struct.Struct("<cBBHHH")
+START = struct.Struct("<cBBHHH")
+CELL = struct.Struct("<cI")
+PLACED = struct.Struct("<cIB")
+TURN = struct.Struct("<cIB")
+SHOT = struct.Struct("<BIB")
+COUNT = struct.Struct("<I")
+END = struct.Struct("<cB")
+
+# A match is built in the event loop, so one J can't be allowed to stall
+# every other client: boards are capped, and so are the cells held by all
+# live matches together. A peer whose unsent frames pass MAX_BACKLOG is
+# dropped rather than buffered for without limit.
+MAX_BOARD = 100
+MAX_SNAKES = 500
+MAX_LIVE_CELLS = 1_000_000
+MAX_BACKLOG = 256 * 1024
+
+
+class ProtocolError(Exception):
+    """A client sent something the server can't act on."""
+
+
+class RemoteShooter:
+    """bot_ai stand-in through which a second human aims the bot side's shot."""
+
+    def __init__(self, game: GameEngine):
+        self.game = game
+        self.target: Optional[Coord] = None
+
+    def copy(self, game: GameEngine) -> "RemoteShooter":
+        new = RemoteShooter(game)
+        new.target = self.target
+        return new
+
+    def choose_target(self) -> Coord:
+        return self.target
+
+    def observe_shot(self, xy: Coord, hit: bool):
+        pass
+
+    def observe_move(self):
+        pass
+
+
+class Connection:
+    __slots__ = ("reader", "writer", "name", "seat", "match")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader, self.writer = reader, writer
+        self.name = ""
+        self.seat = 0
+        self.match: Optional["Match"] = None
+
+    async def recv(self) -> bytes:
+        (n,) = FRAME.unpack(await self.reader.readexactly(FRAME.size))
+        return await self.reader.readexactly(n)
+
+    def send(self, payload: bytes):
+        """Queue a frame. Only the sender's own handler waits on its writer,
+        so a peer that stops reading is cut off here once too far behind."""
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_BACKLOG:
+            self.writer.transport.abort()
+            return
+        self.writer.write(FRAME.pack(len(payload)) + payload)
+
+
+class Match:
+    """One game: its engine, its seats and whose move it is."""
+
+    def __init__(self, server: "GameServer", mode: str, settings: dict,
+                 seats: List[Optional[Connection]], opponent: str):
+        self.server = server
+        self.mode = mode
+        if opponent == "heatmap":
+            settings = {**settings, "bot_ai": "heatmap"}
+        self.game = ENGINES[mode](settings, seats[0].name)
+        self.seats = seats  # seats[1] is None when the bot plays
+        self.humans = sum(c is not None for c in seats)
+        if seats[1] is not None:
+            self.game.bot_ai = RemoteShooter(self.game)
+        self.to_move = 0
+        self._cells: List[List[int]] = [[], []]  # last cell sent for each snake
+        for seat, conn in enumerate(seats):
+            if conn is not None:
+                conn.seat, conn.match = seat, self
+                other = seats[1 - seat]
+                conn.send(START.pack(b"S", seat, MODES.index(mode), self.game.rows,
+                                     self.game.cols, self.game.snakes_each)
+                          + (other.name if other else opponent).encode())
+
+    def _cell(self, xy: Coord) -> int:
+        return xy[1] * self.game.cols + xy[0]
+
+    def _xy(self, cell: int) -> Coord:
+        if not 0 <= cell < self.game.rows * self.game.cols:
+            raise ProtocolError("cell off the board")
+        return cell % self.game.cols, cell // self.game.cols
+
+    def handle(self, conn: Connection, msg: bytes):
+        game = self.game
+        if game.over:
+            raise ProtocolError("game is over")
+        tag = msg[:1]
+        if len(msg) != CELL.size or tag not in (b"P", b"F"):
+            raise ProtocolError("expected P or F")
+        xy = self._xy(CELL.unpack(msg)[1])
+        if tag == b"P":
+            self.place(conn.seat, xy)
+        else:
+            self.fire(conn.seat, xy)
+
+    # ── placement ──
+    def place(self, seat: int, xy: Coord):
+        game = self.game
+        player = game.players[seat]
+        if game.phase != "placement" or len(player.snakes) >= game.snakes_each:
+            raise ProtocolError("all your snakes are placed")
+        if player.snake_at(xy) is not None:
+            raise ProtocolError("you already have a snake there")
+        snake = Snake(xy, game.rng.choice(SNAKE_COLOURS))
+        player.add_snake(snake)
+        self._cells[seat].append(self._cell(xy))
+        self.seats[seat].send(PLACED.pack(b"p", self._cell(xy), SNAKE_COLOURS.index(snake.colour)))
+        if len(game.user.snakes) < game.snakes_each:
+            return
+        if self.seats[1] is None:
+            game.auto_place_bot()
+            self._cells[1] = [self._cell(s.xy) for s in game.bot.snakes]
+        elif len(game.bot.snakes) < game.snakes_each:
+            return
+        game.phase = "battle"
+        self.broadcast(b"B")
+
+    # ── battle ──
+    def fire(self, seat: int, xy: Coord):
+        game = self.game
+        if game.phase != "battle":
+            raise ProtocolError("still placing snakes")
+        if seat != self.to_move:
+            raise ProtocolError("not your turn")
+        shots = []
+        if seat == 0:
+            if not game.can_attack(xy):
+                raise ProtocolError("you can't fire there")
+            shots.append((0, xy, game.attack(xy)))
+            if game.check_game_over() or self.seats[1] is not None:
+                # Against a human, the move phase waits for their answer.
+                self.to_move = 1
+                return self.send_turn(shots)
+        else:
+            if xy not in game.bot_targets and (len(game.bot_targets) or xy in game.bot.hits):
+                raise ProtocolError("you can't fire there")
+            game.bot_ai.target = xy
+        game.bot_turn()
+        shots.append((1, game.bot_last_guess, game.bot_last_guess in game.bot.hits))
+        self.to_move = 0
+        self.send_turn(shots)
+
+    def send_turn(self, shots: List[Tuple[int, Coord, bool]]):
+        """One frame per seat for this phase: every shot, plus own moves."""
+        game = self.game
+        head = TURN.pack(b"T", game.turns_taken, len(shots)) + b"".join(
+            SHOT.pack(seat, self._cell(xy), hit) for seat, xy, hit in shots)
+        cols = game.cols
+        steps = {1: 0, -1: 1, cols: 2, -cols: 3}
+        for seat, conn in enumerate(self.seats):
+            last = self._cells[seat]
+            words = []
+            for i, s in enumerate(game.players[seat].snakes):
+                cell = s.xy[1] * cols + s.xy[0]
+                if cell != last[i]:
+                    words.append(i << 2 | steps[cell - last[i]])
+                    last[i] = cell
+            if conn is not None:
+                conn.send(head + COUNT.pack(len(words)) + struct.pack(f"<{len(words)}I", *words))
+        if game.over:
+            self.finish(0 if game.end_winner == "Player" else 1)
+
+    def finish(self, winner: int):
+        self.game.over = True
+        self.broadcast(END.pack(b"E", winner))
+        self.server.matches_done += 1
+        self.server.live_cells -= self.game.rows * self.game.cols
+
+    def abandon(self, conn: Connection):
+        """A player left: the other side wins."""
+        self.seats[conn.seat] = None
+        if not self.game.over:
+            self.finish(1 - conn.seat)
+
+    def broadcast(self, payload: bytes):
+        for conn in self.seats:
+            if conn is not None:
+                conn.send(payload)
+
+
+class GameServer:
+    def __init__(self, max_cells: int = MAX_LIVE_CELLS):
+        self.waiting: Dict[tuple, Connection] = {}  # human-vs-human lobby, by game shape
+        self.connections = 0
+        self.matches_done = 0
+        self.max_cells = max_cells
+        self.live_cells = 0  # board cells across unfinished matches
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(reader, writer)
+        self.connections += 1
+        key = None
+        try:
+            key = self.join(conn, await conn.recv())
+            while True:
+                msg = await conn.recv()
+                if conn.match is None:
+                    conn.send(b"Xwaiting for an opponent")
+                    continue
+                try:
+                    conn.match.handle(conn, msg)
+                except ProtocolError as e:
+                    conn.send(b"X" + str(e).encode())
+                await writer.drain()
+        except ProtocolError as e:
+            conn.send(b"X" + str(e).encode())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            if self.waiting.get(key) is conn:
+                del self.waiting[key]
+            if conn.match is not None:
+                conn.match.abandon(conn)
+            writer.close()
+
+    def join(self, conn: Connection, msg: bytes) -> Optional[tuple]:
+        if len(msg) < JOIN.size or msg[:1] != b"J":
+            raise ProtocolError("expected J")
+        _, opponent, mode, rows, cols, snakes = JOIN.unpack_from(msg)
+        conn.name = msg[JOIN.size:].decode("utf-8", "replace")[:32] or "Guest"
+        if (opponent >= len(OPPONENTS) or mode >= len(MODES) or not 1 <= rows <= MAX_BOARD
+                or not 1 <= cols <= MAX_BOARD or not 1 <= snakes <= min(MAX_SNAKES, rows * cols // 2)):
+            raise ProtocolError("bad game settings")
+        settings = {"rows": rows, "cols": cols, "snakes_per_player": snakes}
+        if OPPONENTS[opponent] != "human":
+            self.reserve(rows * cols)
+            Match(self, MODES[mode], settings, [conn, None], OPPONENTS[opponent])
+            return None
+        key = (mode, rows, cols, snakes)
+        other = self.waiting.pop(key, None)
+        if other is None:
+            self.waiting[key] = conn
+            return key
+        try:
+            self.reserve(rows * cols)
+        except ProtocolError:
+            self.waiting[key] = other
+            raise
+        Match(self, MODES[mode], settings, [other, conn], "human")
+        return None
+
+    def reserve(self, cells: int):
+        if self.live_cells + cells > self.max_cells:
+            raise ProtocolError("server is full; try a smaller board")
+        self.live_cells += cells
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, backlog=4096)
+
+
+# ─────── scripted clients (for tests and load runs) ───────────────────────
+async def scripted_client(host: str, port: int, name: str = "script", opponent: str = "bot",
+                          mode: str = "regular", rows: int = 10, cols: int = 10,
+                          snakes: int = 7, rng: random.Random = random) -> dict:
+    """Join a match and play it with random legal moves; returns a summary."""
+    reader, writer = await asyncio.open_connection(host, port)
+
+    def send(payload: bytes):
+        writer.write(FRAME.pack(len(payload)) + payload)
+
+    async def recv() -> bytes:
+        (n,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+        return await reader.readexactly(n)
+
+    send(JOIN.pack(b"J", OPPONENTS.index(opponent), MODES.index(mode), rows, cols, snakes)
+         + name.encode())
+    _, seat, _, rows, cols, snakes = START.unpack_from(await recv())
+    free = list(range(rows * cols))
+    rng.shuffle(free)
+    for cell in free[:snakes]:
+        send(CELL.pack(b"P", cell))
+    targets = list(range(rows * cols))
+    rng.shuffle(targets)
+    frames = turns = 0
+    my_turn = seat == 0
+    while True:
+        if my_turn:
+            if not targets:
+                # Snakes may crawl back onto old misses (Hard); start over
+                # and let the server turn down cells it won't allow.
+                targets = list(range(rows * cols))
+                rng.shuffle(targets)
+            send(CELL.pack(b"F", targets.pop()))
+            my_turn = False
+        msg = await recv()
+        frames += 1
+        tag = msg[:1]
+        if tag == b"B":
+            my_turn = seat == 0
+        elif tag == b"T":
+            _, turns, n = TURN.unpack_from(msg)
+            last_shooter = SHOT.unpack_from(msg, TURN.size + (n - 1) * SHOT.size)[0]
+            my_turn = last_shooter != seat
+        elif tag == b"E":
+            writer.close()
+            return {"seat": seat, "winner": msg[1], "frames": frames, "turns": turns}
+        elif tag == b"X":
+            # Rejected shot (e.g. Hard mode allows fewer cells than we tried):
+            # just try another.
+            my_turn = True
+
+
+async def selftest(matches: int, idle: int, humans: bool, port: int):
+    server = GameServer()
+    srv = await server.serve("127.0.0.1", port)
+    port = srv.sockets[0].getsockname()[1]
+    idle_conns = []
+    for _ in range(idle):
+        idle_conns.append(await asyncio.open_connection("127.0.0.1", port))
+    await asyncio.sleep(0.1)
+    print(f"{server.connections} idle connections open")
+
+    rng = random.Random(0)
+    t = time.perf_counter()
+    jobs = []
+    for i in range(matches):
+        mode = MODES[i % 3]
+        opponent = "human" if humans and i % 2 else ("heatmap" if i % 4 == 0 else "bot")
+        jobs.append(scripted_client("127.0.0.1", port, f"p{i}", opponent, mode,
+                                    rng=random.Random(rng.random())))
+        if opponent == "human":
+            jobs.append(scripted_client("127.0.0.1", port, f"q{i}", opponent, mode,
+                                        rng=random.Random(rng.random())))
+    results = await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - t
+    turns = sum(r["turns"] for r in results if r["seat"] == 0)
+    print(f"{server.matches_done} matches, {turns} turns in {elapsed:.2f}s "
+          f"({turns / elapsed:,.0f} turns/s) alongside {idle} idle connections")
+    for _, w in idle_conns:
+        w.close()
+    while server.connections:  # let the handlers see the closes
+        await asyncio.sleep(0.01)
+    srv.close()
+    await srv.wait_closed()
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="BattleSnakes multiplayer server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--selftest", type=int, metavar="N",
+                    help="play N scripted matches against a local server and exit")
+    ap.add_argument("--idle", type=int, default=0, help="with --selftest: idle connections to hold open")
+    ap.add_argument("--humans", action="store_true", help="with --selftest: half the matches human vs human")
+    args = ap.parse_args(argv)
+    if args.selftest is not None:
+        asyncio.run(selftest(args.selftest, args.idle, args.humans, 0))
+        return
+
+    async def run():
+        srv = await GameServer().serve(args.host, args.port)
+        print(f"serving on {args.host}:{args.port}")
+        async with srv:
+            await srv.serve_forever()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
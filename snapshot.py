@@ -0,0 +1,235 @@
+# snapshot.py – save and restore a game in progress as a compact binary blob
+#
+#   data = snapshot.save(game)             # bytes
+#   snapshot.restore(game, data)           # into an existing game of the same shape
+#   game = snapshot.load(data)             # or build a fresh engine for it
+#   snapshot.save_file(game, path) / snapshot.load_file(path, {"hard": HardGame, ...})
+#
+# Layout, little-endian:
+#   header    b"BSSN", u16 version, u16 0, u32 n, then n bytes of JSON padded to 8
+#   JSON      mode, backend, user, settings, scalar state (phase, turn counters,
+#             last guesses, subclass extras such as the pygame timers),
+#             "sections": {name: [offset, length]} and "lists" (below)
+#   sections  raw arrays, each 8-byte aligned so a memory-mapped file can be
+#             sliced in place: per player snake cells (u32), snake flags (u8:
+#             alive | revealed << 1 | colour << 2), hits/misses/fallen as cell
+#             bitmaps, or as u32 cell lists where that is shorter (those named
+#             in "lists"); the cells taken out of the bot's target pool, in
+#             order (i32), which restore replays to rebuild the pool; the RNG
+#             state; the heat/safe grids of a HeatmapAI (or SearchAI) bot.
+# Nothing is stored per board cell, so a snapshot of a big board with few
+# shots fired stays small.
+# A snapshot doesn't carry a replay recorder; restoring detaches it.
+import json
+import mmap
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bitboard import BitSet
+from engine import ENGINES, SNAKE_COLOURS, CellPool, GameEngine, Snake, mode_and_backend
+
+MAGIC = b"BSSN"
+VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+
+
+def _bitmap(cells, rows: int, cols: int) -> bytes:
+    """Cells packed one bit each, cell i = y * cols + x at bit i."""
+    nbytes = (rows * cols + 7) // 8
+    if isinstance(cells, BitSet):
+        return cells.mask.to_bytes(nbytes, "little")
+    packed = bytearray(nbytes)
+    for x, y in cells:
+        i = y * cols + x
+        packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def _indices_of(bitmap) -> Iterator[int]:
+    """The set bits of a bitmap from _bitmap(); skips empty 64-bit words."""
+    padded = bytes(bitmap) + bytes(-len(bitmap) % 8)
+    for word_i, word in enumerate(memoryview(padded).cast("Q")):
+        base = word_i << 6
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+def _cell_section(cells, rows: int, cols: int) -> Tuple[bytes, bool]:
+    """cells as a bitmap, or as u32 cell indices where that is smaller (a
+    few shots on a big board); the flag is True for indices."""
+    nbytes = (rows * cols + 7) // 8
+    if 4 * len(cells) >= nbytes:
+        return _bitmap(cells, rows, cols), False
+    if isinstance(cells, BitSet):
+        return array("I", _indices_of(cells.mask.to_bytes(nbytes, "little"))).tobytes(), True
+    return array("I", [y * cols + x for x, y in cells]).tobytes(), True
+
+
+def save(game: GameEngine) -> bytes:
+    rows, cols = game.rows, game.cols
+    sections: Dict[str, bytes] = {}
+    lists: List[str] = []  # sections holding cell indices rather than a bitmap
+    for p_i, p in enumerate(game.players):
+        sections[f"cells{p_i}"] = array("I", [s.xy[1] * cols + s.xy[0] for s in p.snakes]).tobytes()
+        sections[f"flags{p_i}"] = bytes(
+            s.alive | s.revealed << 1 | (SNAKE_COLOURS.index(s.colour) if s.colour in SNAKE_COLOURS else 63) << 2
+            for s in p.snakes)
+        for name in ("hits", "misses", "fallen"):
+            sections[f"{name}{p_i}"], is_list = _cell_section(getattr(p, name), rows, cols)
+            if is_list:
+                lists.append(f"{name}{p_i}")
+    sections["targets_removed"] = game.bot_targets.removed.tobytes()
+    rng_version, rng_words, gauss = game.rng.getstate()
+    sections["rng"] = array("I", rng_words).tobytes()
+
+    mode, backend = mode_and_backend(game)
+    settings = {"rows": game.rows, "cols": game.cols,
+                "snakes_per_player": game.snakes_each, "seed": game.seed,
+                **game.board_config()}
+    state = {"phase": game.phase, "over": game.over, "end_winner": game.end_winner,
+             "turn_idx": game.turn_idx, "turns_taken": game.turns_taken,
+             "bot_last_guess": game.bot_last_guess,
+             "rng": [rng_version, gauss], "extras": game.snapshot_extras()}
+    if game.bot_ai is not None:
+        ai = game.bot_ai
+        settings.update(ai.config())
+        sections["heat"] = ai.heat.tobytes()
+        sections["safe"] = ai.safe.tobytes()
+        state["bot_ai"] = {"remaining": ai.remaining, "bot_dead": ai._bot_dead}
+    if game.mover is not None:
+        settings["move_rule"] = "simultaneous"
+        state["mover_rng"] = game.mover.rng.bit_generator.state
+    if game.opening is not None:
+        settings.update(game.opening.config())
+
+    # Lay sections out after the header, each on an 8-byte boundary. The
+    # offsets live in the JSON, whose length depends on them, so iterate.
+    meta = {"mode": mode, "backend": backend, "user": game.user.name,
+            "settings": settings, "state": state, "lists": lists, "sections": {}}
+    head = 0
+    while True:
+        blob = json.dumps(meta).encode()
+        start = -(-(HEADER.size + len(blob)) // 8) * 8
+        if start == head:
+            break
+        head, offset = start, start
+        for name, data in sections.items():
+            meta["sections"][name] = [offset, len(data)]
+            offset += -(-len(data) // 8) * 8
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, len(blob)) + blob)
+    for name, data in sections.items():
+        out += bytes(meta["sections"][name][0] - len(out))
+        out += data
+    return bytes(out)
+
+
+def read_meta(data) -> dict:
+    if len(data) < HEADER.size:
+        raise ValueError("not a BattleSnakes snapshot")
+    magic, version, _, n = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a BattleSnakes snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    return json.loads(bytes(data[HEADER.size:HEADER.size + n]))
+
+
+def restore(game: GameEngine, data, meta: Optional[dict] = None):
+    """Overwrite `game` with the snapshot in `data` (bytes, memoryview or mmap).
+
+    The game must have the snapshot's mode, backend, board size and shape,
+    snake count and attack pattern; anything else raises ValueError.
+    """
+    meta = meta or read_meta(data)
+    settings, state = meta["settings"], meta["state"]
+    if (mode_and_backend(game) != (meta["mode"], meta["backend"])
+            or (game.rows, game.cols, game.snakes_each)
+            != (settings["rows"], settings["cols"], settings["snakes_per_player"])
+            or game.board_config() != {k: settings[k] for k in ("topology", "attack_pattern")
+                                       if k in settings}):
+        raise ValueError("snapshot is for a different kind of game")
+    view = memoryview(data)
+
+    def section(name: str) -> memoryview:
+        offset, length = meta["sections"][name]
+        return view[offset:offset + length]
+
+    cols = game.cols
+    bits = meta["backend"] == "bits"
+
+    lists = set(meta.get("lists", ()))
+
+    def cell_set(name: str) -> set:
+        data = section(name)
+        return {(i % cols, i // cols) for i in (data.cast("I") if name in lists else _indices_of(data))}
+
+    def cells(name: str):
+        if not bits:
+            return cell_set(name)
+        board = game.user.board
+        if name in lists:
+            return BitSet(board, board.mask_of(board.coords[i] for i in section(name).cast("I")))
+        return BitSet(board, int.from_bytes(section(name), "little"))
+
+    players = []
+    for p_i, old in enumerate(game.players):
+        p = game.new_player(old.name)
+        for cell, flags in zip(section(f"cells{p_i}").cast("I"), section(f"flags{p_i}")):
+            colour = flags >> 2
+            s = Snake((cell % cols, cell // cols),
+                      SNAKE_COLOURS[colour] if colour < len(SNAKE_COLOURS) else "green")
+            s.alive, s.revealed = bool(flags & 1), bool(flags & 2)
+            p.add_snake(s)
+        p.hits, p.misses = cells(f"hits{p_i}"), cells(f"misses{p_i}")
+        p.fallen = cell_set(f"fallen{p_i}")
+        players.append(p)
+    game.players = players
+
+    game.bot_targets = CellPool.replayed(game.rows, cols, section("targets_removed").cast("i"))
+
+    rng_version, gauss = state["rng"]
+    game.seed = settings["seed"]
+    game.rng.setstate((rng_version, tuple(section("rng").cast("I")), gauss))
+    game.phase, game.over, game.end_winner = state["phase"], state["over"], state["end_winner"]
+    game.turn_idx, game.turns_taken = state["turn_idx"], state["turns_taken"]
+    game.bot_last_guess = tuple(state["bot_last_guess"]) if state["bot_last_guess"] else None
+
+    if game.bot_ai is not None and "bot_ai" in state:
+        import numpy as np
+        ai = game.bot_ai
+        shape = (game.rows, game.cols)
+        ai.heat = np.frombuffer(section("heat"), dtype=np.float64).reshape(shape).copy()
+        ai.safe = np.frombuffer(section("safe"), dtype=np.float64).reshape(shape).copy()
+        ai.remaining = state["bot_ai"]["remaining"]
+        ai._bot_dead = list(state["bot_ai"]["bot_dead"])
+        ai._update_degree()
+    if game.mover is not None and "mover_rng" in state:
+        game.mover.rng.bit_generator.state = state["mover_rng"]
+    game.recorder = None
+    game.restore_extras(state["extras"])
+
+
+def load(data, classes: Dict[str, type] = ENGINES) -> GameEngine:
+    """A new game built from the snapshot; `classes` maps its mode to the
+    class to build (e.g. the pygame games), defaulting to the engines."""
+    meta = read_meta(data)
+    cls = classes[meta["mode"]]
+    if meta["backend"] == "bits":
+        from bitboard import bitboard_engine
+        cls = bitboard_engine(cls)
+    game = cls(dict(meta["settings"]), meta["user"])
+    restore(game, data, meta)
+    return game
+
+
+def save_file(game: GameEngine, path: str):
+    with open(path, "wb") as f:
+        f.write(save(game))
+
+
+def load_file(path: str, classes: Dict[str, type] = ENGINES) -> GameEngine:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return load(mm, classes)
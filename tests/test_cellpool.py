@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from engine import CellPool
+
+
+def _layout(pool: CellPool):
+    return pool._cells.tolist(), pool._pos.tolist()
+
+
+@pytest.mark.parametrize("rows,cols", [(1, 1), (3, 5), (12, 9)])
+@pytest.mark.parametrize("seed", range(4))
+def test_replayed_pool_has_the_same_layout(rows, cols, seed):
+    rng = random.Random(seed)
+    pool = CellPool(rows, cols)
+    taken = []
+    while pool and rng.random() < 0.9:
+        if rng.random() < 0.5:
+            taken.append(pool.pop_random(rng))
+        else:
+            xy = (rng.randrange(cols), rng.randrange(rows))
+            pool.discard(xy)  # sometimes already gone: must not be logged twice
+            if xy not in taken:
+                taken.append(xy)
+    assert sorted(pool.removed.tolist()) == sorted(y * cols + x for x, y in taken)
+    again = CellPool.replayed(rows, cols, pool.removed)
+    assert len(again) == len(pool)
+    assert _layout(again) == _layout(pool)
+    # Both go on to draw the same cells.
+    while pool:
+        assert again.pop_random(random.Random(len(pool))) == pool.pop_random(random.Random(len(pool)))
+    assert not again
+
+
+def test_pool_built_with_exclude_replays_the_same():
+    rng = random.Random(3)
+    exclude = {(rng.randrange(10), rng.randrange(7)) for _ in range(30)}
+    pool = CellPool(7, 10, exclude=exclude)
+    assert all(xy not in pool for xy in exclude) and len(pool) == 70 - len(exclude)
+    pool.pop_random(rng)
+    assert _layout(CellPool.replayed(7, 10, pool.removed)) == _layout(pool)
+
+
+def test_replayed_pool_is_built_lazily_and_copies():
+    pool = CellPool(4, 4)
+    for xy in [(1, 1), (3, 0), (0, 3)]:
+        pool.discard(xy)
+    again = CellPool.replayed(4, 4, pool.removed)
+    fork = again.copy()
+    assert _layout(fork) == _layout(pool)
+    fork.discard((2, 2))
+    assert (2, 2) in again and (2, 2) not in fork
+    assert again.removed.tolist() == pool.removed.tolist()
+
+
+def test_pop_from_empty_pool_raises():
+    pool = CellPool(1, 2)
+    pool.pop_random()
+    pool.pop_random()
+    with pytest.raises(IndexError):
+        pool.pop_random()
@@ -0,0 +1,87 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from bitboard import bitboard_engine
+from engine import ENGINES, GameEngine, mode_and_backend, play_headless
+
+BOARD = {"rows": 8, "cols": 8, "snakes_per_player": 4}
+BACKENDS = {"sets": lambda cls: cls, "bits": bitboard_engine}
+GAMES = [(mode, backend) for mode in ENGINES for backend in BACKENDS]
+
+
+def _engine(mode: str, backend: str, seed: int) -> GameEngine:
+    return BACKENDS[backend](ENGINES[mode])({**BOARD, "seed": seed})
+
+
+def _shot(game: GameEngine, rng: random.Random):
+    while True:
+        xy = (rng.randrange(game.cols), rng.randrange(game.rows))
+        if game.can_attack(xy):
+            return xy
+
+
+def _state(game: GameEngine):
+    return ([[(s.xy, s.alive) for s in p.snakes] for p in game.players],
+            sorted(game.user.hits), sorted(game.bot.hits), sorted(game.bot.misses),
+            game.bot_last_guess, game.over, game.end_winner)
+
+
+@pytest.mark.parametrize("mode,backend", GAMES)
+def test_headless_game_ends_with_a_winner(mode, backend):
+    for seed in range(5):
+        random.seed(seed)
+        game = play_headless(_engine(mode, backend, seed))
+        assert game.over and game.phase == "battle"
+        assert game.end_winner in ("Player", "Bot")
+        loser = game.bot if game.end_winner == "Player" else game.user
+        assert loser.is_defeated()
+        assert mode_and_backend(game) == (mode, backend)
+
+
+@pytest.mark.parametrize("mode,backend", GAMES)
+def test_same_seed_same_game(mode, backend):
+    games = []
+    for _ in range(2):
+        random.seed(7)
+        games.append(_state(play_headless(_engine(mode, backend, 7))))
+    assert games[0] == games[1]
+
+
+@pytest.mark.parametrize("mode,backend", GAMES)
+def test_copy_plays_on_like_the_original(mode, backend):
+    game = _engine(mode, backend, 3)
+    rng = random.Random(3)
+    while game.phase == "placement":
+        game.place_snake(rng.randrange(game.cols), rng.randrange(game.rows))
+    for _ in range(5):
+        game.step(_shot(game, rng))
+    fork = game.copy()
+    assert _state(fork) == _state(game)
+    while not game.over:
+        xy = _shot(game, rng)
+        assert game.step(xy) == fork.step(xy)
+        assert _state(fork) == _state(game)
+    assert fork.over
+
+
+def test_step_rejects_shots_outside_battle():
+    game = _engine("regular", "sets", 1)
+    with pytest.raises(ValueError):
+        game.step((0, 0))
+
+
+def test_engines_never_import_pygame():
+    script = ("import random, sys\n"
+              "from bitboard import bitboard_engine\n"
+              "from engine import ENGINES, play_headless\n"
+              "for cls in ENGINES.values():\n"
+              "    for c in (cls, bitboard_engine(cls)):\n"
+              "        random.seed(0)\n"
+              "        play_headless(c({'rows': 6, 'cols': 6, 'snakes_per_player': 3, 'seed': 0}))\n"
+              "assert 'pygame' not in sys.modules, 'pygame was imported'\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True)
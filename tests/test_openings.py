@@ -0,0 +1,133 @@
+import pytest
+
+import openings
+from engine import RegularEngine
+
+BOARD = {"rows": 6, "cols": 6, "snakes_per_player": 3}
+SHOTS = [0, 7, 14, 21, 28, 35]  # the diagonal
+USER_SNAKES = [(3, 3), (4, 0), (5, 0)]  # one on the fourth book shot
+
+
+class _Aim:
+    """bot_ai stand-in firing along a fixed list of cells."""
+
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.fired = []
+
+    def choose_target(self):
+        xy = self.cells.pop(0)
+        self.fired.append(xy)
+        return xy
+
+    def observe_shot(self, xy, hit):
+        pass
+
+    def observe_move(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_books():
+    openings.load.cache_clear()
+    yield
+    openings.load.cache_clear()
+
+
+@pytest.fixture
+def book(tmp_path) -> str:
+    path = str(tmp_path / "book.bsb")
+    openings.write(path, {(6, 6, 3, "rect"): (list(range(1, 37)), SHOTS)})
+    return path
+
+
+def _game(book: str, seed: int = 1) -> RegularEngine:
+    game = RegularEngine({**BOARD, "seed": seed, "opening_book": book})
+    for xy in USER_SNAKES:
+        game.place_snake(*xy)
+    return game
+
+
+def test_shipped_book_is_found_from_any_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    book = openings.load(openings.BOOK_FILE)
+    assert book is not None and (10, 10, 7, "rect") in book.keys()
+    opening = openings.find_opening(openings.BOOK_FILE, 10, 10, 6)  # nearest snake count
+    assert opening is not None and len(opening.shots) > 0
+
+
+def test_missing_book_plays_without_one():
+    assert openings.load("no_such_book.bsb") is None
+    game = _game("no_such_book.bsb")
+    assert game.opening is None and game.book_target() is None
+    assert game.phase == "battle" and len(game.bot.snakes) == 3
+
+
+@pytest.mark.parametrize("damage", ["truncated", "magic", "empty"])
+def test_corrupt_book_falls_back(book, damage, capsys):
+    with open(book, "rb") as f:
+        data = f.read()
+    data = {"truncated": data[:len(data) // 2], "magic": b"XXXX" + data[4:], "empty": b""}[damage]
+    with open(book, "wb") as f:
+        f.write(data)
+    assert openings.load(book) is None
+    assert _game(book).opening is None
+    if damage != "empty":
+        assert "opening book" in capsys.readouterr().out
+
+
+def test_book_shots_come_first_then_bot_ai_then_random(book):
+    game = _game(book)
+    assert game.opening is not None
+    # Misses along the book, in order.
+    for cell in SHOTS[:3]:
+        assert game.bot_take_shot() == ((cell % 6, cell // 6), False)
+    game.bot_ai = _Aim([(1, 5), (2, 5)])
+    assert game.bot_take_shot() == ((3, 3), True)
+    assert game.bot_ai.fired == []
+    # Once it hits, the book steps aside for bot_ai.
+    assert game.book_target() is None
+    assert game.bot_take_shot() == ((1, 5), False)
+    # Without bot_ai, random untried cells.
+    game.bot_ai = None
+    fired = set(game.bot.all_shots())
+    for _ in range(5):
+        xy, _ = game.bot_take_shot()
+        assert xy not in fired
+        fired.add(xy)
+    assert game.book_shot == 4
+
+
+def test_book_skips_cells_already_fired_at(book):
+    game = _game(book)
+    for xy in [(0, 0), (2, 2)]:
+        game.bot_targets.discard(xy)
+        game.bot.misses.add(xy)
+    assert [game.bot_take_shot()[0] for _ in range(2)] == [(1, 1), (3, 3)]
+    assert game.book_shot == 4
+
+
+def test_used_up_book_falls_back_to_random(book):
+    game = _game(book)
+    for cell in SHOTS:
+        xy = (cell % 6, cell // 6)
+        game.bot_targets.discard(xy)
+        game.bot.misses.add(xy)
+    assert game.book_target() is None
+    for _ in range(5):
+        xy, _ = game.bot_take_shot()
+        assert xy[0] != xy[1]
+    assert game.book_shot == len(SHOTS)
+
+
+def test_bot_places_by_the_book_weights(tmp_path):
+    path = str(tmp_path / "corner.bsb")
+    # All the weight on the bottom row.
+    openings.write(path, {(6, 6, 3, "rect"): ([0] * 30 + list(range(1, 7)), SHOTS)})
+    for seed in range(5):
+        game = _game(path, seed)
+        assert {y for _, y in game.bot.cells()} == {5}
+
+
+def test_book_path_is_kept_for_replays_and_snapshots(book):
+    assert _game(book).opening.config() == {"opening_book": book}
@@ -0,0 +1,75 @@
+import pytest
+
+import patterns
+from topology import topology
+
+SPECS = sorted(patterns.PATTERNS) + [("#..",
+                                      "..#",
+                                      ".#.")]
+SIZES = [(1, 1), (1, 7), (5, 5), (6, 9), (9, 4)]
+
+
+def _axial(x: int, y: int):
+    # Odd-r offset coordinates to axial ones, where a step is the same
+    # (dq, dr) from every cell.
+    return x - (y - (y & 1)) // 2, y
+
+
+def _brute(spec, topo, xy):
+    """The pattern expanded cell by cell, straight from the definitions."""
+    x, y = xy
+    out = []
+    for dx, dy in patterns.offsets(spec, topo.name):
+        if topo.wraps:
+            cell = ((x + dx) % topo.cols, (y + dy) % topo.rows)
+        elif topo.staggered:
+            # The grid is drawn from an even row; move it to xy in axial space.
+            dq, dr = _axial(dx, dy)
+            q, r = _axial(x, y)
+            ny = r + dr
+            cell = (q + dq + (ny - (ny & 1)) // 2, ny)
+        else:
+            cell = (x + dx, y + dy)
+        if 0 <= cell[0] < topo.cols and 0 <= cell[1] < topo.rows and cell not in out:
+            out.append(cell)
+    return out
+
+
+@pytest.mark.parametrize("shape", ["rect", "torus", "hex"])
+@pytest.mark.parametrize("rows,cols", SIZES)
+@pytest.mark.parametrize("spec", SPECS)
+def test_kernel_matches_brute_force(shape, rows, cols, spec):
+    topo = topology(shape, rows, cols)
+    k = patterns.kernel(spec, topo)
+    for xy in topo.coords:
+        want = _brute(spec, topo, xy)
+        assert sorted(k.cells(xy)) == sorted(want), xy
+        assert k.mask(xy) == sum(1 << (y * cols + x) for x, y in want), xy
+
+
+@pytest.mark.parametrize("shape", ["rect", "torus", "hex"])
+def test_off_board_centre_covers_nothing(shape):
+    topo = topology(shape, 5, 6)
+    k = patterns.kernel("square", topo)
+    for xy in [(-1, 0), (6, 0), (0, -1), (0, 5), (7, 9)]:
+        assert k.cells(xy) == [] and k.mask(xy) == 0
+
+
+def test_torus_wraps_across_the_corner():
+    topo = topology("torus", 4, 5)
+    cells = set(patterns.kernel("square", topo).cells((0, 0)))
+    assert cells == {(x, y) for x in (4, 0, 1) for y in (3, 0, 1)}
+
+
+@pytest.mark.parametrize("rows,cols", SIZES)
+def test_hex_cross_is_the_centre_and_its_neighbours(rows, cols):
+    topo = topology("hex", rows, cols)
+    k = patterns.kernel("cross", topo)
+    for xy in topo.coords:
+        assert sorted(k.cells(xy)) == sorted([xy] + topo.neighbours(xy))
+
+
+@pytest.mark.parametrize("spec", [(), ("##",), ("#", "##"), ("#x#",), ("...",), "nope"])
+def test_bad_patterns_are_rejected(spec):
+    with pytest.raises(ValueError):
+        patterns.offsets(spec)
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+import replay
+from bitboard import bitboard_engine
+from engine import ENGINES, GameEngine, play_headless, random_policy
+
+BOARD = {"rows": 8, "cols": 8, "snakes_per_player": 4}
+
+
+def _state(game: GameEngine):
+    return ([[(s.xy, s.alive) for s in p.snakes] for p in game.players],
+            sorted(game.user.hits), sorted(game.bot.hits), sorted(game.bot.misses),
+            game.bot_last_guess, game.end_winner)
+
+
+def _recorded(mode: str, seed: int, bits: bool = False, states=None, **settings) -> GameEngine:
+    """A seeded play_headless game with a recorder attached; `states`, if
+    given, collects the position before each of the user's shots."""
+    cls = bitboard_engine(ENGINES[mode]) if bits else ENGINES[mode]
+    game = cls({**BOARD, "seed": seed, **settings})
+    replay.ReplayRecorder(game)
+
+    def policy(g: GameEngine):
+        if states is not None:
+            states.append(_state(g))
+        return random_policy(g)
+    random.seed(seed)
+    return play_headless(game, policy)
+
+
+@pytest.mark.parametrize("mode", sorted(ENGINES))
+@pytest.mark.parametrize("bits", [False, True])
+@pytest.mark.parametrize("shape", ["rect", "torus", "hex"])
+def test_replay_reproduces_the_game(mode, bits, shape):
+    original = _recorded(mode, 11, bits, topology=shape)
+    log = replay.Replay(bytes(original.recorder.data))
+    assert (log.mode, log.backend) == (mode, "bits" if bits else "sets")
+    again = replay.replay_headless(log)
+    assert again.end_winner == original.end_winner
+    assert bytes(again.recorder.data) == bytes(original.recorder.data)
+
+
+@pytest.mark.parametrize("mode", sorted(ENGINES))
+@pytest.mark.parametrize("bits", [False, True])
+def test_replay_matches_turn_for_turn(mode, bits):
+    states = []
+    original = _recorded(mode, 4, bits, states)
+    log = replay.Replay(bytes(original.recorder.data))
+    game = log.new_game()
+    replayed = []
+    for kind, xy in log.inputs():
+        if kind == "P":
+            game.place_snake(*xy)
+        else:
+            replayed.append(_state(game))
+            game.step(xy)
+    assert replayed == states
+    assert _state(game) == _state(original)
+
+
+@pytest.mark.parametrize("mode", sorted(ENGINES))
+def test_same_seed_same_bytes(mode):
+    first = bytes(_recorded(mode, 5).recorder.data)
+    assert bytes(_recorded(mode, 5).recorder.data) == first
+    assert bytes(_recorded(mode, 6).recorder.data) != first
+
+
+def test_tampered_replay_is_caught():
+    data = bytearray(_recorded("regular", 3).recorder.data)
+    log = replay.Replay(bytes(data))
+    start, _, ev = next(e for e in log.events if e[2][0] == "S")
+    # Point the first bot shot at another cell.
+    cell = ev[1][1] * BOARD["cols"] + ev[1][0]
+    data[start + 1:start + 5] = ((cell + 1) % 64).to_bytes(4, "little")
+    with pytest.raises(replay.ReplayMismatch):
+        replay.replay_headless(replay.Replay(bytes(data)))
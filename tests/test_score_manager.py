@@ -0,0 +1,52 @@
+import pytest
+
+import score_manager
+
+
+@pytest.fixture
+def scores(tmp_path, monkeypatch):
+    """score_manager pointed at a fresh database and legacy file in tmp_path."""
+    score_manager.close()
+    monkeypatch.setattr(score_manager, "SCORES_DB", str(tmp_path / "scores.db"))
+    monkeypatch.setattr(score_manager, "SCORES_FILE", str(tmp_path / "scores.txt"))
+    yield score_manager
+    score_manager.close()
+
+
+def test_update_keeps_each_players_best(scores):
+    scores.update_score("ann", 30)
+    scores.update_score("ann", 10)
+    scores.update_score("bob", "20")
+    assert scores.top_scores() == [("ann", 30), ("bob", 20)]
+    scores.update_score("bob", 50)
+    assert scores.top_scores() == [("bob", 50), ("ann", 30)]
+
+
+def test_top_scores_are_highest_first_and_limited(scores):
+    for i, score in enumerate([5, 80, 35, 60, 15]):
+        scores.update_score(f"p{i}", score)
+    assert scores.top_scores(3) == [("p1", 80), ("p3", 60), ("p2", 35)]
+    assert [s for _, s in scores.top_scores()] == [80, 60, 35, 15, 5]
+    assert scores.top_scores(0) == []
+
+
+def test_scores_survive_reconnecting(scores):
+    scores.update_score("ann", 12)
+    scores.close()
+    assert scores.top_scores() == [("ann", 12)]
+
+
+def test_legacy_file_is_imported_once(scores, tmp_path):
+    (tmp_path / "scores.txt").write_text("ann lee 40\nbob 25\nann lee 55\nnot a score\nbob x\n")
+    assert scores.top_scores() == [("ann lee", 55), ("bob", 25)]
+    # Later edits to the old file, or reopening the database, change nothing.
+    (tmp_path / "scores.txt").write_text("bob 99\ncat 70\n")
+    scores.close()
+    assert scores.top_scores() == [("ann lee", 55), ("bob", 25)]
+    scores.update_score("cat", 1)
+    scores.close()
+    assert scores.top_scores() == [("ann lee", 55), ("bob", 25), ("cat", 1)]
+
+
+def test_no_legacy_file_starts_empty(scores):
+    assert scores.top_scores() == []
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import search
+import snapshot
+from engine import RegularEngine
+
+
+def _in_process_game() -> RegularEngine:
+    game = RegularEngine({"rows": 8, "cols": 8, "snakes_per_player": 3, "seed": 1,
+                          "bot_ai": "search", "search_worker": False, "search_iters": 20})
+    rng = random.Random(1)
+    while game.phase == "placement":
+        game.place_snake(rng.randrange(8), rng.randrange(8))
+    for _ in range(3):
+        if not game.over:
+            game.step(next((x, y) for y in range(8) for x in range(8) if game.can_attack((x, y))))
+    return game
+
+
+def test_snapshot_keeps_search_in_process():
+    search._reset_executor()
+    game = _in_process_game()
+    restored = snapshot.load(snapshot.save(game))
+    assert restored.bot_ai.config()["search_worker"] is False
+    assert restored.bot_ai.worker is False
+    if not restored.over:
+        restored.step(next((x, y) for y in range(8) for x in range(8) if restored.can_attack((x, y))))
+    assert search._executor_ is None
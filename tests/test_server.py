@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+class _Transport:
+    def __init__(self):
+        self.buffered = 0
+        self.aborted = False
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    def abort(self):
+        self.aborted = True
+
+
+class _Writer:
+    """Just enough of a StreamWriter to collect what the server sends."""
+
+    def __init__(self):
+        self.transport = _Transport()
+        self.frames = []
+
+    def is_closing(self) -> bool:
+        return self.transport.aborted
+
+    def write(self, data: bytes):
+        self.frames.append(data[server.FRAME.size:])
+
+
+def _conn() -> server.Connection:
+    return server.Connection(None, _Writer())
+
+
+def _join(opponent="bot", mode="regular", rows=10, cols=10, snakes=7) -> bytes:
+    return server.JOIN.pack(b"J", server.OPPONENTS.index(opponent), server.MODES.index(mode),
+                            rows, cols, snakes) + b"tester"
+
+
+@pytest.mark.parametrize("humans", [False, True])
+def test_selftest_matches_all_finish(humans, capsys):
+    matches = 6
+    results = asyncio.run(server.selftest(matches, 3, humans, 0))
+    assert sum(r["seat"] == 0 for r in results) == matches
+    assert len(results) == matches + (matches // 2 if humans else 0)
+    assert all(r["winner"] in (0, 1) for r in results)
+    assert f"{matches} matches" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("rows,cols,snakes", [
+    (server.MAX_BOARD + 1, 10, 5), (10, server.MAX_BOARD + 1, 5), (0, 10, 5),
+    (10, 10, 51), (server.MAX_BOARD, server.MAX_BOARD, server.MAX_SNAKES + 1)])
+def test_join_rejects_oversized_games(rows, cols, snakes):
+    with pytest.raises(server.ProtocolError):
+        server.GameServer().join(_conn(), _join(rows=rows, cols=cols, snakes=snakes))
+
+
+def test_live_cells_are_capped_and_released():
+    gs = server.GameServer(max_cells=250)
+    first, second = _conn(), _conn()
+    gs.join(first, _join())
+    gs.join(second, _join())
+    assert gs.live_cells == 200
+    with pytest.raises(server.ProtocolError, match="full"):
+        gs.join(_conn(), _join())
+    first.match.abandon(first)
+    assert gs.live_cells == 100
+    gs.join(_conn(), _join())
+    assert gs.live_cells == 200
+
+
+def test_full_server_keeps_the_waiting_human():
+    gs = server.GameServer(max_cells=100)
+    waiting = _conn()
+    key = gs.join(waiting, _join("human"))
+    gs.join(_conn(), _join())
+    with pytest.raises(server.ProtocolError):
+        gs.join(_conn(), _join("human"))
+    assert gs.waiting[key] is waiting
+
+
+def test_peer_too_far_behind_is_dropped():
+    conn = _conn()
+    conn.send(b"B")
+    conn.writer.transport.buffered = server.MAX_BACKLOG + 1
+    conn.send(b"B")
+    assert conn.writer.transport.aborted
+    assert conn.writer.frames == [b"B"]
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import snapshot
+from bitboard import bitboard_engine
+from engine import ENGINES, GameEngine
+
+BACKENDS = {"sets": lambda cls: cls, "bits": bitboard_engine}
+GAMES = [(mode, backend, bot_ai) for mode in ENGINES for backend in BACKENDS
+         for bot_ai in (None, "heatmap")]
+
+
+def _shot(game: GameEngine, rng: random.Random):
+    while True:
+        xy = (rng.randrange(game.cols), rng.randrange(game.rows))
+        if game.can_attack(xy):
+            return xy
+
+
+def _state(game: GameEngine):
+    return ([[(s.xy, s.alive) for s in p.snakes] for p in game.players],
+            sorted(game.user.hits), sorted(game.user.misses),
+            sorted(game.bot.hits), sorted(game.bot.misses),
+            game.bot_last_guess, game.over, game.end_winner)
+
+
+def _mid_game(mode: str, backend: str, bot_ai, size: int = 10) -> GameEngine:
+    settings = {"rows": size, "cols": size, "snakes_per_player": 6, "seed": 4}
+    if bot_ai:
+        settings["bot_ai"] = bot_ai
+    game = BACKENDS[backend](ENGINES[mode])(settings)
+    rng = random.Random(1)
+    while game.phase == "placement":
+        game.place_snake(rng.randrange(size), rng.randrange(size))
+    for _ in range(size):
+        game.step(_shot(game, rng))
+        if game.over:
+            break
+    assert not game.over, "pick a seed that leaves the game running"
+    return game
+
+
+def _play_on(game: GameEngine, *restored: GameEngine):
+    """Step every game with the same shots until the original ends,
+    checking the restored ones keep pace with it."""
+    rng = random.Random(2)
+    while not game.over:
+        xy = _shot(game, rng)
+        hit = game.step(xy)
+        for other in restored:
+            assert other.step(xy) == hit
+            assert _state(other) == _state(game)
+    for other in restored:
+        assert other.over
+
+
+@pytest.mark.parametrize("mode,backend,bot_ai", GAMES)
+def test_restored_game_plays_on_like_the_original(mode, backend, bot_ai, tmp_path):
+    game = _mid_game(mode, backend, bot_ai)
+    data = snapshot.save(game)
+    path = tmp_path / "game.bssn"
+    snapshot.save_file(game, str(path))
+    assert path.read_bytes() == data
+
+    loaded, mapped = snapshot.load(data), snapshot.load_file(str(path))
+    for other in (loaded, mapped):
+        assert type(other) is type(game)
+        assert _state(other) == _state(game)
+    _play_on(game, loaded, mapped)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_saving_a_restored_game_gives_the_same_bytes(backend):
+    game = _mid_game("regular", backend, None)
+    data = snapshot.save(game)
+    again = snapshot.load(data)
+    assert snapshot.save(again) == data
+    _play_on(game, snapshot.load(snapshot.save(again)))
+
+
+def test_restore_into_an_existing_game():
+    game = _mid_game("hard", "sets", None)
+    target = ENGINES["hard"]({"rows": 10, "cols": 10, "snakes_per_player": 6, "seed": 99})
+    snapshot.restore(target, snapshot.save(game))
+    assert _state(target) == _state(game)
+    _play_on(game, target)
+
+
+def test_big_board_snapshot_stays_small():
+    game = _mid_game("regular", "bits", None, size=200)
+    assert len(snapshot.save(game)) < 16 * 1024
+
+
+@pytest.mark.parametrize("data", [b"", b"XXXX" + bytes(8), b"BSSN\x01\x00\x00\x00" + bytes(4)])
+def test_rejects_what_is_not_a_current_snapshot(data):
+    with pytest.raises(ValueError):
+        snapshot.read_meta(data)
@@ -0,0 +1,56 @@
+import pytest
+
+from topology import TOPOLOGIES, topology
+
+SIZES = [(1, 1), (1, 5), (2, 2), (3, 7), (6, 4), (7, 7)]
+# Axial (dq, dr) of each hex direction, in HexTopology.directions order.
+HEX_STEPS = [(1, 0), (-1, 0), (0, 1), (-1, 1), (1, -1), (0, -1)]
+
+
+def _brute(topo, xy):
+    """xy's neighbour in each direction, or None, from first principles."""
+    x, y = xy
+    out = []
+    if topo.staggered:
+        q = x - (y - (y & 1)) // 2
+        for dq, dr in HEX_STEPS:
+            ny = y + dr
+            out.append((q + dq + (ny - (ny & 1)) // 2, ny))
+    else:
+        out = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+    if topo.wraps:
+        out = [(nx % topo.cols, ny % topo.rows) for nx, ny in out]
+        return [None if n == xy else n for n in out]
+    return [n if 0 <= n[0] < topo.cols and 0 <= n[1] < topo.rows else None for n in out]
+
+
+@pytest.mark.parametrize("shape", sorted(TOPOLOGIES))
+@pytest.mark.parametrize("rows,cols", SIZES)
+def test_table_matches_brute_force(shape, rows, cols):
+    topo = topology(shape, rows, cols)
+    assert topo.degree == len(topo.directions)
+    for i, xy in enumerate(topo.coords):
+        row = topo.table[i * topo.degree:(i + 1) * topo.degree]
+        assert [topo.coords[j] if j >= 0 else None for j in row] == _brute(topo, xy), xy
+
+
+@pytest.mark.parametrize("shape", sorted(TOPOLOGIES))
+@pytest.mark.parametrize("rows,cols", SIZES)
+def test_neighbours_are_symmetric(shape, rows, cols):
+    topo = topology(shape, rows, cols)
+    for xy in topo.coords:
+        for n in topo.neighbours(xy):
+            assert xy in topo.neighbours(n), (xy, n)
+            assert topo.neighbours(xy).count(n) == topo.neighbours(n).count(xy)
+
+
+def test_torus_has_no_edges():
+    topo = topology("torus", 5, 6)
+    assert all(len(topo.neighbours(xy)) == 4 for xy in topo.coords)
+    assert set(topo.neighbours((0, 0))) == {(1, 0), (5, 0), (0, 1), (0, 4)}
+
+
+def test_topologies_are_shared_and_named():
+    assert topology("hex", 4, 4) is topology("hex", 4, 4)
+    with pytest.raises(ValueError):
+        topology("sphere", 4, 4)
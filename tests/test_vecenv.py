@@ -0,0 +1,110 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engine import ENGINES, SNAKE_COLOURS, GameEngine, Snake
+from vecenv import BOT, USER, VectorEnv
+
+SETTINGS = {"rows": 6, "cols": 7, "snakes_per_player": 4}
+
+
+class _Shooter:
+    """bot_ai that fires where it is told: at the vector game's bot shot."""
+
+    def __init__(self):
+        self.target = None
+
+    def choose_target(self):
+        return self.target
+
+    def observe_shot(self, xy, hit):
+        pass
+
+    def observe_move(self):
+        pass
+
+
+class _Follow:
+    """Mover that makes the vector game's moves, after checking each is one
+    the "simultaneous" rule allows from the scalar game's position."""
+
+    def __init__(self, game: GameEngine):
+        self.game = game
+        self.to = None  # cell per snake, user's then bot's
+
+    def move(self):
+        game, topo = self.game, self.game.topology
+        snakes = [(p, s) for p in game.players for s in p.snakes]
+        start = {s.xy for _, s in snakes if s.alive}
+        taken = set()
+        for (p, s), cell in zip(snakes, self.to):
+            if not s.alive:
+                continue
+            to = topo.coords[cell]
+            free = [n for n in topo.neighbours(s.xy)
+                    if n not in start and n not in game.danger_cells(p)]
+            if to == s.xy:
+                # Stayed put: boxed in, or beaten to its cell by an earlier snake.
+                assert not free or taken & set(free), (s.xy, free)
+            else:
+                assert to in free and to not in taken, (s.xy, to, free)
+                taken.add(to)
+            s.xy = to
+
+
+def _scalar(env: VectorEnv, i: int, mode: str) -> GameEngine:
+    """A scalar engine set up like game i of env."""
+    game = ENGINES[mode]({**SETTINGS, "seed": i, "move_rule": "simultaneous"})
+    game.bot_ai, game.mover = _Shooter(), _Follow(game)
+    coords = env.topology.coords
+    for cell in env.pos[i, BOT]:
+        game.bot.add_snake(Snake(coords[cell], SNAKE_COLOURS[0]))
+    for cell in env.pos[i, USER]:
+        game.place_snake(*coords[cell])
+    assert game.phase == "battle"
+    return game
+
+
+def _cells(cells, cols: int):
+    return sorted(y * cols + x for x, y in cells)
+
+
+def _same(env: VectorEnv, i: int, game: GameEngine):
+    size, cols = env.size, env.cols
+    for side, p in ((USER, game.user), (BOT, game.bot)):
+        assert np.flatnonzero(env.occupied[i, side, :size]).tolist() == _cells(p.cells(), cols)
+        assert np.flatnonzero(env.fallen[i, side, :size]).tolist() == _cells(p.fallen, cols)
+        assert np.flatnonzero(env.hits[i, side, :size]).tolist() == _cells(p.hits, cols)
+        assert np.flatnonzero(env.misses[i, side, :size]).tolist() == _cells(p.misses, cols)
+    assert env.turns[i] == game.turns_taken
+
+
+@pytest.mark.parametrize("mode", sorted(ENGINES))
+def test_vector_games_follow_the_scalar_rules(mode):
+    n = 8
+    env = VectorEnv(n, SETTINGS, mode, seed=3)
+    env.reset()
+    games = [_scalar(env, i, mode) for i in range(n)]
+    finished = 0
+    rng = np.random.default_rng(5)
+    while finished < 2 * n:
+        actions = env.random_actions(rng)
+        before = env.pos.copy()
+        _, reward, done, info = env.step(actions)
+        for i, game in enumerate(games):
+            if not done[i]:
+                bot_shot = env.bot_order[i, env.bot_next[i] - 1]
+            else:
+                # The game was reset; if the bot won, it shot the last snake.
+                bot_shot = before[i, USER][before[i, USER] < env.size].max()
+            game.bot_ai.target = env.topology.coords[bot_shot]
+            game.mover.to = (before if done[i] else env.pos)[i].reshape(-1)
+            assert game.step(env.topology.coords[actions[i]]) == info["hit"][i]
+            assert game.over == done[i]
+            if done[i]:
+                assert reward[i] == (1 if game.end_winner == "Player" else -1)
+                games[i] = _scalar(env, i, mode)
+                finished += 1
+            else:
+                assert (game.bot_last_guess in game.bot.hits) == info["bot_hit"][i]
+                _same(env, i, game)
@@ -0,0 +1,119 @@
+# topology.py – board shapes: which cells neighbour which, tabulated once per size
+#
+#   "rect"   the classic grid: E/W/S/N neighbours, the edges are walls
+#   "torus"  the same grid with opposite edges joined, so nothing is an edge
+#   "hex"    hexagonal cells in offset rows: odd rows sit half a cell to the
+#            right, and every cell has up to six neighbours
+#
+# Pick one with "topology" in the board settings. Snake moves, the numpy
+# movers and bots, and attack patterns all read these tables instead of
+# working out neighbours themselves.
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+Coord = Tuple[int, int]
+
+
+class Topology:
+    """Neighbour tables for one shape of rows x cols board.
+
+    Cell (x, y) is index y*cols + x. `table[i * degree + d]` is the
+    neighbour of cell i in direction d (an index), or -1 where there is
+    none; a flat array of ints, so even a 500x500 board's table is small.
+    Shared by every game of the same shape and size, so get one with
+    topology().
+    """
+
+    name = "rect"
+    directions: Tuple[str, ...] = ("E", "W", "S", "N")
+    wraps = False      # opposite edges joined
+    staggered = False  # odd rows drawn half a cell to the right
+
+    def __init__(self, rows: int, cols: int):
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+        self.degree = len(self.directions)
+        self.coords: List[Coord] = [(x, y) for y in range(rows) for x in range(cols)]
+        self.table = array("i", [-1]) * (self.size * self.degree)
+        for y in range(rows):
+            for d in range(self.degree):
+                self._fill(y, d)
+        # Direction numbers for Snake.default_move to shuffle in place, so a
+        # move allocates nothing; single-threaded use only, like the game rng.
+        self.order = list(range(self.degree))
+
+    def _fill(self, y: int, d: int):
+        """table entries for row y, direction d: every cell in a row steps
+        by the same offset, so each run of them is one strided slice."""
+        cols, deg = self.cols, self.degree
+        dx, dy = self.offset(y, d)
+        ny = y + dy
+        if self.wraps:
+            ny %= self.rows
+            dx %= cols
+            if dx == 0 and ny == y:
+                return  # a 1-wide loop: the step comes back to the same cell
+            runs = ((0, cols - dx, dx), (cols - dx, cols, dx - cols))
+        elif 0 <= ny < self.rows:
+            runs = ((max(0, -dx), min(cols, cols - dx), dx),)
+        else:
+            return
+        row, nrow = y * cols, ny * cols
+        for x0, x1, shift in runs:
+            if x0 < x1:
+                self.table[(row + x0) * deg + d:(row + x1) * deg:deg] = array(
+                    "i", range(nrow + x0 + shift, nrow + x1 + shift))
+
+    def offset(self, y: int, d: int) -> Tuple[int, int]:
+        """(dx, dy) of a step in direction d from a cell in row y."""
+        return ((1, 0), (-1, 0), (0, 1), (0, -1))[d]
+
+    def pattern_offsets(self, offsets: Tuple[Coord, ...]) -> Tuple[Tuple[Coord, ...], ...]:
+        """An attack pattern's (dx, dy) offsets as applied from each row
+        parity (even rows first); see patterns.py."""
+        return (offsets,)
+
+    def neighbours(self, xy: Coord) -> List[Coord]:
+        """Every neighbour of xy, in direction order."""
+        base = (xy[1] * self.cols + xy[0]) * self.degree
+        return [self.coords[j] for j in self.table[base:base + self.degree] if j >= 0]
+
+
+class TorusTopology(Topology):
+    """The rectangular grid with wrap-around: leaving one edge enters the opposite one."""
+
+    name = "torus"
+    wraps = True
+
+
+class HexTopology(Topology):
+    """Hexagonal cells, odd rows offset half a cell right ("odd-r" layout)."""
+
+    name = "hex"
+    staggered = True
+    directions = ("E", "W", "SE", "SW", "NE", "NW")
+    # (dx, dy) per direction from an even row; odd rows add 1 to dx when dy != 0
+    _STEPS = ((1, 0), (-1, 0), (0, 1), (-1, 1), (0, -1), (-1, -1))
+
+    def offset(self, y: int, d: int) -> Tuple[int, int]:
+        dx, dy = self._STEPS[d]
+        return dx + (y & dy & 1), dy
+
+    def pattern_offsets(self, offsets: Tuple[Coord, ...]) -> Tuple[Tuple[Coord, ...], ...]:
+        # Patterns are drawn as seen from an even row. From an odd row, rows
+        # an odd distance away sit half a cell further left relative to it,
+        # so keep the shape by shifting them one cell right.
+        return offsets, tuple((dx + (dy & 1), dy) for dx, dy in offsets)
+
+
+TOPOLOGIES: Dict[str, type] = {t.name: t for t in (Topology, TorusTopology, HexTopology)}
+
+
+@lru_cache(maxsize=16)
+def topology(name: str, rows: int, cols: int) -> Topology:
+    """The shared tables for a `name` board of rows x cols; raises
+    ValueError for an unknown shape."""
+    if name not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {name!r} (known: {', '.join(TOPOLOGIES)})")
+    return TOPOLOGIES[name](rows, cols)
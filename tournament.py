@@ -0,0 +1,163 @@
+# tournament.py – headless Monte Carlo tournaments for AI and difficulty balancing
+#
+#   python tournament.py --games 1000000 --modes easy regular hard --bot random heatmap
+#
+# Games are split into batches that run on every core. Each batch seeds its
+# own RNG from (seed, mode, strategies, batch index), so any run, or any single
+# batch, can be reproduced. Batch results are appended to --out as JSON lines
+# as soon as they finish, followed by one summary line per matchup.
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator
+
+from engine import ENGINES, Coord, GameEngine, random_policy
+
+# User-side strategies: name -> policy(game) returning the cell to attack.
+# Anything else is imported as "module:function".
+USER_POLICIES: Dict[str, Callable[[GameEngine], Coord]] = {"random": random_policy}
+
+# Bot-side strategies: name -> settings["bot_ai"] value.
+BOT_AIS = {"random": None, "heatmap": "heatmap", "search": "search"}
+
+
+def resolve_policy(name: str) -> Callable[[GameEngine], Coord]:
+    if name in USER_POLICIES:
+        return USER_POLICIES[name]
+    module, _, func = name.partition(":")
+    return getattr(importlib.import_module(module), func)
+
+
+def play_one(engine_cls: type, settings: dict, policy: Callable[[GameEngine], Coord]) -> dict:
+    """Play one game with random user placement; returns its raw stats."""
+    game = engine_cls(settings)
+    while game.phase == "placement":
+        game.place_snake(random.randrange(game.cols), random.randrange(game.rows))
+    user_shots = user_cells = 0
+    while not game.over:
+        xy = policy(game)
+        # A pattern shot (Easy's cross) fires at several cells at once.
+        user_cells += len(game.pattern.cells(xy))
+        game.step(xy)
+        user_shots += 1
+    # Every step is a user shot answered by a bot shot, unless the user won.
+    bot_shots = user_shots if game.end_winner == "Bot" else user_shots - 1
+    return {"winner": game.end_winner, "turns": game.turns_taken,
+            "user_shots": user_shots, "user_cells": user_cells, "user_hits": len(game.user.hits),
+            "bot_shots": bot_shots, "bot_hits": len(game.bot.hits)}
+
+
+def run_batch(job: dict) -> dict:
+    """Worker entry point: play job["games"] games and return the totals."""
+    random.seed(f"{job['seed']}:{job['mode']}:{job['user']}:{job['bot']}:{job['batch']}")
+    engine_cls = ENGINES[job["mode"]]
+    if job["bitboard"]:
+        from bitboard import bitboard_engine
+        engine_cls = bitboard_engine(engine_cls)
+    settings = {"rows": job["rows"], "cols": job["cols"],
+                "snakes_per_player": job["snakes"], "bot_ai": BOT_AIS[job["bot"]],
+                "move_rule": job["move_rule"],
+                # Games already run one per core; search in-process, by count.
+                "search_iters": job["search_iters"], "search_worker": False}
+    policy = resolve_policy(job["user"])
+
+    totals = {"games": 0, "user_wins": 0, "bot_wins": 0,
+              "user_win_turns": 0, "bot_win_turns": 0,
+              "user_shots": 0, "user_cells": 0, "user_hits": 0, "bot_shots": 0, "bot_hits": 0}
+    for _ in range(job["games"]):
+        r = play_one(engine_cls, settings, policy)
+        totals["games"] += 1
+        side = "user" if r["winner"] == "Player" else "bot"
+        totals[f"{side}_wins"] += 1
+        totals[f"{side}_win_turns"] += r["turns"]
+        for key in ("user_shots", "user_cells", "user_hits", "bot_shots", "bot_hits"):
+            totals[key] += r[key]
+    return {**job, **totals}
+
+
+def summarise(t: dict) -> dict:
+    games = max(t["games"], 1)
+    return {
+        "games": t["games"],
+        "user_win_rate": t["user_wins"] / games,
+        "bot_win_rate": t["bot_wins"] / games,
+        "user_mean_turns_to_win": t["user_win_turns"] / t["user_wins"] if t["user_wins"] else None,
+        "bot_mean_turns_to_win": t["bot_win_turns"] / t["bot_wins"] if t["bot_wins"] else None,
+        # Hits per cell fired at on both sides, so the two compare like for like.
+        "user_hit_efficiency": t["user_hits"] / t["user_cells"] if t["user_cells"] else None,
+        "bot_hit_efficiency": t["bot_hits"] / t["bot_shots"] if t["bot_shots"] else None,
+    }
+
+
+def make_jobs(args) -> Iterator[dict]:
+    for mode in args.modes:
+        for user in args.user:
+            for bot in args.bot:
+                remaining, batch = args.games, 0
+                while remaining > 0:
+                    n = min(args.batch_size, remaining)
+                    yield {"mode": mode, "user": user, "bot": bot, "batch": batch, "games": n,
+                           "seed": args.seed, "rows": args.rows, "cols": args.cols,
+                           "snakes": args.snakes, "bitboard": args.bitboard,
+                           "move_rule": args.move_rule, "search_iters": args.search_iters}
+                    remaining -= n
+                    batch += 1
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Play many headless BattleSnakes games in parallel.")
+    ap.add_argument("--games", type=int, default=10000, help="games per matchup")
+    ap.add_argument("--modes", nargs="+", choices=sorted(ENGINES), default=["easy", "regular", "hard"])
+    ap.add_argument("--user", nargs="+", default=["random"],
+                    help="user strategies: %s or module:function" % ", ".join(USER_POLICIES))
+    ap.add_argument("--bot", nargs="+", choices=sorted(BOT_AIS), default=["random"])
+    ap.add_argument("--rows", type=int, default=10)
+    ap.add_argument("--cols", type=int, default=10)
+    ap.add_argument("--snakes", type=int, default=7, help="snakes per player")
+    ap.add_argument("--bitboard", action="store_true", help="use the bitboard backend")
+    ap.add_argument("--move-rule", choices=["sequential", "simultaneous"], default="sequential",
+                    help="simultaneous moves all snakes in one numpy pass (see vecmove.py)")
+    ap.add_argument("--search-iters", type=int, default=200,
+                    help="simulations per shot for the search bot (see search.py)")
+    ap.add_argument("--batch-size", type=int, default=500)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="tournament_results.jsonl")
+    args = ap.parse_args(argv)
+
+    totals: Dict[tuple, dict] = {}
+    started = time.perf_counter()
+    with open(args.out, "a") as out, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_batch, job) for job in make_jobs(args)]
+        for done, fut in enumerate(as_completed(futures), 1):
+            r = fut.result()
+            out.write(json.dumps({"type": "batch", **r}) + "\n")
+            out.flush()
+            key = (r["mode"], r["user"], r["bot"])
+            acc = totals.setdefault(key, dict.fromkeys(
+                ("games", "user_wins", "bot_wins", "user_win_turns", "bot_win_turns",
+                 "user_shots", "user_cells", "user_hits", "bot_shots", "bot_hits"), 0))
+            for k in acc:
+                acc[k] += r[k]
+            print(f"\r{done}/{len(futures)} batches", end="", file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+
+        elapsed = time.perf_counter() - started
+        for (mode, user, bot), acc in sorted(totals.items()):
+            summary = {"type": "summary", "mode": mode, "user": user, "bot": bot,
+                       "seed": args.seed, "rows": args.rows, "cols": args.cols,
+                       "snakes": args.snakes, **summarise(acc)}
+            out.write(json.dumps(summary) + "\n")
+            print(f"{mode:8} user={user:8} bot={bot:8} games={summary['games']:>9} "
+                  f"user wins {summary['user_win_rate']:.1%}  bot wins {summary['bot_win_rate']:.1%}")
+    games = sum(acc["games"] for acc in totals.values())
+    print(f"{games} games in {elapsed:.1f}s ({games / elapsed * 60:,.0f} games/min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# vecenv.py – many headless games stepped in lockstep as numpy arrays (needs numpy)
+#
+#   env = VectorEnv(4096, {"rows": 10, "cols": 10, "snakes_per_player": 7}, "regular")
+#   obs = env.reset()
+#   for _ in range(100000):
+#       obs, reward, done, info = env.step(env.random_actions())
+#
+# Each game is a slice of a few stacked arrays instead of a GameEngine with
+# its Player, Snake and set objects, so one step() call fires every user
+# shot, answers it with every bot shot and moves every snake in a handful of
+# array operations. Finished games start over on their own.
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ai import neighbour_index
+from engine import ENGINES, HardEngine
+from patterns import kernel
+from topology import topology
+
+USER, BOT = 0, 1
+
+
+class VectorEnv:
+    """n independent games of one mode, advanced together by step().
+
+    The rules are the engine's: the user's shot covers the mode's attack
+    pattern, the bot fires at a random cell it has not tried (HardEngine
+    lets it retry misses once every cell has been tried), and then every
+    snake moves by the "simultaneous" rule of vecmove.py. Both sides'
+    snakes are placed at random. Games differ from GameEngine ones only in
+    their random stream, and the bot is always the random one (no bot_ai).
+
+    Cells are flat indices, y*cols + x. Per game and player the state is:
+
+        pos       (n, 2, snakes)  each snake's cell, `size` once it is dead
+        occupied  (n, 2, size+1)  cells with a live snake of that player
+        fallen    (n, 2, size+1)  cells where one of its snakes was killed
+        hits      (n, 2, size+1)  cells that player has hit (user: on the
+        misses    (n, 2, size+1)  bot's board, bot: on the user's) / missed
+
+    The last column is a sentinel standing for "no cell" (a dead snake, an
+    off-board neighbour or pattern cell), so lookups need no bounds checks.
+    """
+
+    def __init__(self, n: int, settings: dict, mode: str = "regular", seed: Optional[int] = None):
+        self.n = n
+        self.rows, self.cols = settings["rows"], settings["cols"]
+        self.snakes_each = settings.get("snakes_per_player", 7)
+        engine_cls = ENGINES[mode]
+        self.mode = mode
+        self.hard = issubclass(engine_cls, HardEngine)  # repeat shots allowed; only hits block snakes
+        self.topology = topology(settings.get("topology", "rect"), self.rows, self.cols)
+        size = self.size = self.topology.size
+        if not 0 < 2 * self.snakes_each <= size:
+            raise ValueError(f"{self.snakes_each} snakes each do not fit on a {self.rows}x{self.cols} board")
+        self.rng = np.random.default_rng(settings.get("seed") if seed is None else seed)
+
+        # Per centre cell, the cells the user's pattern covers, padded with `size`.
+        pattern = kernel(settings.get("attack_pattern", engine_cls.attack_pattern), self.topology)
+        covers = [pattern.cells(xy) for xy in self.topology.coords]
+        self.pattern_cells = np.full((size, max(map(len, covers))), size, dtype=np.intp)
+        for i, cells in enumerate(covers):
+            self.pattern_cells[i, :len(cells)] = [y * self.cols + x for x, y in cells]
+        # Neighbours per cell, plus a row for the sentinel so dead snakes look
+        # boxed in rather than needing a mask.
+        nbrs = neighbour_index(self.topology)
+        self.neighbours = np.vstack([nbrs, np.full((1, nbrs.shape[1]), size, dtype=np.intp)])
+        self._steps = [np.ascontiguousarray(col) for col in self.neighbours.T]  # per direction
+        # For each bitmask of free directions: how many, and the nth of them.
+        degree = nbrs.shape[1]
+        masks = range(1 << degree)
+        self._free_count = np.array([bin(f).count("1") for f in masks], dtype=np.float64)
+        self._nth_free = np.array([[d for d in range(degree) if f >> d & 1] + [0] * (degree - bin(f).count("1"))
+                                   for f in masks], dtype=np.intp).reshape(-1)
+        self._claims = np.zeros(n * (size + 1), dtype=np.intp)  # scratch for _move
+
+        shape = (n, 2, size + 1)
+        self.pos = np.full((n, 2, self.snakes_each), size, dtype=np.intp)
+        self.occupied = np.zeros(shape, dtype=bool)
+        self.fallen = np.zeros(shape, dtype=bool)
+        self.hits = np.zeros(shape, dtype=bool)
+        self.misses = np.zeros(shape, dtype=bool)
+        # The random bot walks a shuffled list of cells: the same as picking
+        # uniformly among the cells it has not fired at yet.
+        self.bot_order = np.zeros((n, size), dtype=np.intp)
+        self.bot_next = np.zeros(n, dtype=np.intp)
+        self.bot_left = np.zeros(n, dtype=np.intp)  # bot_order[bot_next:bot_left] are untried
+        self.turns = np.zeros(n, dtype=np.intp)  # completed move phases, as GameEngine.turns_taken
+        self._games = np.arange(n)
+        self.obs = self._views()
+
+    def _grid(self, a: np.ndarray) -> np.ndarray:
+        """a[..., :size] as (..., rows, cols); a view, never a copy."""
+        view = a[..., :self.size].view()
+        view.shape = a.shape[:-1] + (self.rows, self.cols)
+        return view
+
+    def _views(self) -> Dict[str, np.ndarray]:
+        """Observations for the user's side, each (n, rows, cols) bool. They
+        are views of the live state, so step() updates them in place; copy
+        anything you want to keep."""
+        return {"user_hits": self._grid(self.hits[:, USER]),
+                "user_misses": self._grid(self.misses[:, USER]),
+                "bot_hits": self._grid(self.hits[:, BOT]),
+                "bot_misses": self._grid(self.misses[:, BOT]),
+                "user_snakes": self._grid(self.occupied[:, USER])}
+
+    # ── episodes ──
+    def reset(self, games=None) -> Dict[str, np.ndarray]:
+        """Start new games in the given slots (every slot by default) and
+        return the observation views."""
+        g = self._games if games is None else np.asarray(games, dtype=np.intp)
+        if len(g):
+            each, size = self.snakes_each, self.size
+            for a in (self.occupied, self.fallen, self.hits, self.misses):
+                a[g] = False
+            # One shuffle per game gives both sides distinct random cells.
+            cells = self.rng.random((len(g), size)).argsort(axis=1)[:, :2 * each]
+            self.pos[g] = cells.reshape(len(g), 2, each)
+            self.occupied[g[:, None, None], np.arange(2)[:, None], self.pos[g]] = True
+            self.bot_order[g] = self.rng.random((len(g), size)).argsort(axis=1)
+            self.bot_next[g] = 0
+            self.bot_left[g] = size
+            self.turns[g] = 0
+        return self.obs
+
+    def legal_actions(self) -> np.ndarray:
+        """(n, size) bool: the cells the user may fire at in each game."""
+        if self.hard:
+            return np.ones((self.n, self.size), dtype=bool)
+        return ~(self.hits[:, USER, :-1] | self.misses[:, USER, :-1])
+
+    def random_actions(self, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """A uniformly random legal shot per game, as engine.random_policy."""
+        rng = rng or self.rng
+        cells = rng.integers(self.size, size=self.n)
+        if self.hard:
+            return cells
+        # Redraw the illegal picks a few times (cheap while most cells are
+        # free), then choose among what is left directly.
+        shot = self.hits[:, USER] | self.misses[:, USER]
+        redo = self._games
+        for _ in range(4):
+            redo = redo[shot[redo, cells[redo]]]
+            if not len(redo):
+                return cells
+            cells[redo] = rng.integers(self.size, size=len(redo))
+        redo = redo[shot[redo, cells[redo]]]
+        keys = rng.random((len(redo), self.size))
+        keys[shot[redo, :-1]] = -1.0
+        cells[redo] = keys.argmax(axis=1)
+        return cells
+
+    # ── turns ──
+    def step(self, actions) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, dict]:
+        """Play one turn in every game: the user fires at actions[i] (a cell
+        index) in game i, the bot answers, then the snakes move.
+
+        Returns (obs, reward, done, info). reward is +1 where the user won
+        this turn, -1 where the bot did, else 0; finished games are reset
+        before returning, so their obs already show the next game. info has
+        "hit" and "bot_hit" (each side's shot hit; bot_hit is False where
+        the bot did not get to fire) and "turns" (how many turns each game
+        had played, taken before any reset).
+
+        Raises ValueError for an action off the board or one the mode's
+        rules don't allow.
+        """
+        a = np.asarray(actions, dtype=np.intp)
+        if a.shape != (self.n,):
+            raise ValueError(f"expected {self.n} actions, got shape {a.shape}")
+        if ((a < 0) | (a >= self.size)).any():
+            raise ValueError("actions must be cell indices on the board")
+        if not self.hard:
+            bad = np.flatnonzero(self.hits[self._games, USER, a] | self.misses[self._games, USER, a])
+            if len(bad):
+                raise ValueError(f"cannot attack cells already fired at, in games {bad[:10].tolist()}")
+
+        reward = np.zeros(self.n, dtype=np.int8)
+        user_hit = self._user_fires(a)
+        user_won = ~(self.pos[:, BOT] < self.size).any(axis=1)
+        reward[user_won] = 1
+
+        live = np.flatnonzero(~user_won)
+        bot_hit = np.zeros(self.n, dtype=bool)
+        bot_hit[live] = self._bot_fires(live)
+        bot_won = live[~(self.pos[live, USER] < self.size).any(axis=1)]
+        reward[bot_won] = -1
+
+        done = reward != 0
+        moving = np.flatnonzero(~done)
+        self._move(moving)
+        self.turns[moving] += 1
+        info = {"hit": user_hit, "bot_hit": bot_hit, "turns": self.turns.copy()}
+        self.reset(np.flatnonzero(done))
+        return self.obs, reward, done, info
+
+    def _user_fires(self, a: np.ndarray) -> np.ndarray:
+        g = self._games[:, None]
+        cells = self.pattern_cells[a]  # (n, pattern cells), padded with size
+        hit = self.occupied[g, BOT, cells] | self.fallen[g, BOT, cells]
+        self.hits[g, USER, cells] |= hit
+        self.misses[g, USER, cells] |= ~hit
+        # Kill every live bot snake under the pattern.
+        bot_pos = self.pos[:, BOT]
+        struck = (bot_pos[:, :, None] == cells[:, None, :]).any(axis=2) & (bot_pos < self.size)
+        gi, si = np.nonzero(struck)
+        dead = bot_pos[gi, si]
+        self.fallen[gi, BOT, dead] = True
+        self.occupied[gi, BOT, dead] = False
+        self.pos[gi, BOT, si] = self.size
+        return hit.any(axis=1)
+
+    def _bot_fires(self, g: np.ndarray) -> np.ndarray:
+        """The random bot's shot in games g; returns whether each hit."""
+        out = g[self.bot_next[g] >= self.bot_left[g]]
+        if len(out):
+            # Every cell tried (only possible in Hard mode, where snakes crawl
+            # back onto misses): start over on every cell it has not hit.
+            keys = self.rng.random((len(out), self.size))
+            keys[self.hits[out, BOT, :-1]] = 2.0
+            self.bot_order[out] = keys.argsort(axis=1)
+            self.bot_next[out] = 0
+            self.bot_left[out] = self.size - self.hits[out, BOT, :-1].sum(axis=1)
+        cell = self.bot_order[g, self.bot_next[g]]
+        self.bot_next[g] += 1
+        hit = self.occupied[g, USER, cell] | self.fallen[g, USER, cell]
+        self.hits[g, BOT, cell] |= hit
+        self.misses[g, BOT, cell] |= ~hit
+        gi, si = np.nonzero(self.pos[g, USER] == cell[:, None])
+        self.fallen[g[gi], USER, cell[gi]] = True
+        self.occupied[g[gi], USER, cell[gi]] = False
+        self.pos[g[gi], USER, si] = self.size
+        return hit
+
+    def _move(self, g: np.ndarray):
+        """vecmove's "simultaneous" rule in games g, all at once."""
+        m = len(g)
+        if not m:
+            return
+        each, size = self.snakes_each, self.size
+        occupied = self.occupied[g, USER] | self.occupied[g, BOT]
+        if self.hard:  # one danger map for both sides
+            blocked = (self.hits[g, USER] | self.hits[g, BOT] | occupied)[:, None]
+        else:  # each side's snakes avoid the other side's shots
+            blocked = (self.hits[g, ::-1] | self.misses[g, ::-1]) | occupied[:, None]
+        blocked[:, :, -1] = True
+
+        pos = self.pos[g].reshape(m, 2 * each)  # user's snakes, then the bot's
+        owner = np.repeat(np.arange(2), each) if blocked.shape[1] == 2 else 0
+        base = (np.arange(m)[:, None] * blocked.shape[1] + owner) * (size + 1)
+        blocked = blocked.reshape(-1)
+        # Bit d of free: direction d leads somewhere allowed.
+        free = np.zeros(pos.shape, dtype=np.uint8)
+        for d, step in enumerate(self._steps):
+            free |= (~blocked.take(base + step.take(pos))).view(np.uint8) << d
+        # A uniform pick among each mover's free directions, through the tables.
+        movers = np.flatnonzero(free)
+        free = free.reshape(-1).take(movers).astype(np.intp)
+        nth = (self.rng.random(len(movers)) * self._free_count.take(free)).astype(np.intp)
+        d = self._nth_free.take(free * self.topology.degree + nth)
+        target = self.neighbours.take(pos.reshape(-1).take(movers) * self.topology.degree + d)
+        # The snake earliest in turn order wins a contested cell: writing the
+        # claims in reverse order leaves the earliest one standing.
+        gi = movers // (2 * each)
+        key = gi * (size + 1) + target
+        order = np.arange(len(key))
+        self._claims[key[::-1]] = order[::-1]
+        won = self._claims.take(key) == order
+        gi, si, target = g.take(gi[won]), movers[won] % (2 * each), target[won]
+        # Flat indices into pos and occupied, both (n, 2, ...) arrays.
+        slot = gi * 2 * each + si
+        row = (gi * 2 + si // each) * (size + 1)
+        flat_pos, flat_occ = self.pos.reshape(-1), self.occupied.reshape(-1)
+        flat_occ[row + flat_pos.take(slot)] = False
+        flat_occ[row + target] = True
+        flat_pos[slot] = target
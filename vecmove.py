@@ -0,0 +1,99 @@
+# vecmove.py – batched, simultaneous snake movement with numpy (needs numpy)
+import copy
+
+import numpy as np
+
+from engine import GameEngine, Snake
+
+
+class VectorMover:
+    """Moves every snake at once instead of one at a time.
+
+    Rule ("simultaneous"): each live snake picks a random neighbour that was
+    empty at the start of the phase and is not dangerous to its owner. When
+    several snakes pick the same cell, the first in turn order (user's snakes
+    in list order, then the bot's) gets it and the others stay put; this is
+    the priority the one-at-a-time rule gives. Snakes vacating a cell do not
+    free it for others in the same phase.
+
+    Enable with settings["move_rule"] = "simultaneous", or assign game.mover.
+    Snakes with a custom move_fn still move one at a time, after the batch.
+    """
+
+    def __init__(self, game: GameEngine):
+        self.game = game
+        topo = game.topology
+        self.size = topo.size
+        # The topology's neighbour table, one row per cell; "none" is index
+        # `size`, a sentinel slot that every lookup array marks as blocked.
+        nbrs = np.frombuffer(topo.table, dtype=np.intc).astype(np.int64).reshape(self.size, topo.degree)
+        nbrs[nbrs < 0] = self.size
+        self.neighbours = nbrs
+        # Seeded from the game's stream, so its seed reproduces whole games.
+        self.rng = np.random.default_rng(game.rng.getrandbits(64))
+
+    def copy(self, game: GameEngine) -> "VectorMover":
+        """A mover for `game` (a GameEngine.copy()) sharing this one's tables."""
+        new = VectorMover.__new__(VectorMover)
+        new.game, new.size, new.neighbours = game, self.size, self.neighbours
+        new.rng = copy.deepcopy(self.rng)
+        return new
+
+    def _cell_mask(self, cells) -> np.ndarray:
+        """Boolean array over cells + sentinel, True for every cell in `cells`."""
+        out = np.zeros(self.size + 1, dtype=bool)
+        out[-1] = True
+        mask = getattr(cells, "mask", None)
+        if isinstance(mask, int):  # bitboard.BitSet
+            packed = np.frombuffer(mask.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+            out[:-1] = np.unpackbits(packed, count=self.size, bitorder="little").view(bool)
+        elif cells:
+            cols = self.game.cols
+            out[np.fromiter((y * cols + x for x, y in cells), np.int64, len(cells))] = True
+        return out
+
+    def move(self):
+        game, cols = self.game, self.game.cols
+        movers, owners, custom = [], [], []
+        for p_i, p in enumerate(game.players):
+            for s in p.snakes:
+                if not s.alive:
+                    continue
+                if s.move_fn is Snake.default_move:
+                    movers.append(s)
+                    owners.append(p_i)
+                else:
+                    custom.append((p, s))
+
+        if movers:
+            pos = np.fromiter((s.xy[1] * cols + s.xy[0] for s in movers), np.int64, len(movers))
+            occupied = np.zeros(self.size + 1, dtype=bool)
+            occupied[-1] = True
+            occupied[pos] = True
+            for _, s in custom:
+                occupied[s.xy[1] * cols + s.xy[0]] = True
+            blocked = np.stack([self._cell_mask(game.danger_cells(p)) | occupied
+                                for p in game.players])
+
+            cand = self.neighbours[pos]
+            ok = ~blocked[np.asarray(owners)[:, None], cand]
+            # Uniform choice among allowed neighbours: the largest random key.
+            keys = self.rng.random(cand.shape)
+            keys[~ok] = -1.0
+            choice = keys.argmax(axis=1)
+            can = np.flatnonzero(ok.any(axis=1))
+            targets = cand[can, choice[can]]
+            # np.unique reports the first index of each target, i.e. the
+            # snake earliest in turn order wins a contested cell.
+            _, first = np.unique(targets, return_index=True)
+            winners = can[first]
+            dest = targets[first]
+            for k, x, y in zip(winners.tolist(), (dest % cols).tolist(), (dest // cols).tolist()):
+                movers[k].xy = (x, y)
+
+        if custom:
+            blocked_set = game.user.cells() | game.bot.cells()
+            for p, s in custom:
+                blocked_set.discard(s.xy)
+                s.attempt_move(game.topology, blocked_set, game.danger_cells(p), game.rng)
+                blocked_set.add(s.xy)
@@ -0,0 +1,142 @@
+# viewport.py – zoom and pan for boards larger than the window
+#
+# A Camera maps board cells to pixels inside a fixed-size view. Both boards
+# of a game are the same size and share one camera, so they scroll and zoom
+# together. Nothing here draws; BaseGame asks the camera which cells are on
+# screen and where, and paints only those. Staggered boards (hex, see
+# topology.py) draw odd rows half a cell to the right, like bricks.
+from typing import Optional, Tuple
+
+Coord = Tuple[int, int]
+
+MIN_CELL = 4         # most zoomed out: a few pixels per cell
+MAX_CELL = 80        # most zoomed in
+MIN_START_CELL = 16  # boards are shrunk to fit the view at the start, but not below this
+ZOOM_STEP = 1.25     # cell size factor per wheel notch / +,- key
+
+
+def start_cell(rows: int, cols: int, max_w: int, max_h: int, cell: int, stagger: bool = False) -> int:
+    """Cell size a new game opens at: `cell`, or smaller so the board fits in
+    max_w x max_h, but never below MIN_START_CELL (bigger boards then scroll).
+    A staggered board is half a cell wider."""
+    fit_w = 2 * max_w // (2 * cols + 1) if stagger and rows > 1 else max_w // cols
+    return max(min(cell, fit_w, max_h // rows), min(cell, MIN_START_CELL))
+
+
+class Camera:
+    """Cell size and scroll position of a view_w x view_h window onto a
+    rows x cols board.
+
+    (ox, oy) is the board pixel, at the current cell size, shown at the
+    view's top-left. A board smaller than the view is centred in it, so the
+    offset is negative on that axis.
+    """
+
+    __slots__ = ("rows", "cols", "view_w", "view_h", "cell", "min_cell", "ox", "oy", "stagger")
+
+    def __init__(self, rows: int, cols: int, view_w: int, view_h: int, cell: int,
+                 stagger: bool = False):
+        self.rows, self.cols = rows, cols
+        self.view_w, self.view_h = view_w, view_h
+        self.cell = cell
+        self.stagger = stagger and rows > 1
+        # No zooming out past the size at which the whole board is in view.
+        self.min_cell = min(cell, max(MIN_CELL, min(view_w // cols, view_h // rows)))
+        self.ox = self.oy = 0
+        self._clamp()
+
+    def state(self) -> tuple:
+        return self.cell, self.ox, self.oy
+
+    def half(self) -> int:
+        """How far odd rows are shifted right, in pixels."""
+        return self.cell // 2 if self.stagger else 0
+
+    def board_size(self) -> Tuple[int, int]:
+        """The whole board's size in pixels at the current zoom."""
+        return self.cols * self.cell + self.half(), self.rows * self.cell
+
+    def _clamp(self):
+        def axis(offset: int, board: int, view: int) -> int:
+            if board <= view:
+                return -((view - board) // 2)
+            return min(max(offset, 0), board - view)
+        board_w, board_h = self.board_size()
+        self.ox = axis(self.ox, board_w, self.view_w)
+        self.oy = axis(self.oy, board_h, self.view_h)
+
+    def scrolls(self) -> bool:
+        """True if part of the board is out of view."""
+        board_w, board_h = self.board_size()
+        return board_w > self.view_w or board_h > self.view_h
+
+    def covers_view(self) -> bool:
+        """True if the board fills the whole view (no margin to clear)."""
+        board_w, board_h = self.board_size()
+        return board_w >= self.view_w and board_h >= self.view_h
+
+    # ── moving ──
+    def pan(self, dx: int, dy: int):
+        self.ox += dx
+        self.oy += dy
+        self._clamp()
+
+    def zoom(self, steps: float, anchor: Optional[Tuple[int, int]] = None):
+        """Zoom in (steps > 0) or out, keeping the board point under `anchor`
+        (view pixels; the view's centre by default) where it is."""
+        ax, ay = anchor if anchor is not None else (self.view_w // 2, self.view_h // 2)
+        new = round(self.cell * ZOOM_STEP ** steps)
+        if new == self.cell:
+            new += 1 if steps > 0 else -1
+        new = min(max(new, self.min_cell), MAX_CELL)
+        scale = new / self.cell
+        self.ox = round((self.ox + ax) * scale) - ax
+        self.oy = round((self.oy + ay) * scale) - ay
+        self.cell = new
+        self._clamp()
+
+    def fit(self):
+        """Zoom right out, to the whole board (or as much as MIN_CELL allows)."""
+        self.cell = self.min_cell
+        self._clamp()
+
+    def center_on(self, x: float, y: float):
+        """Scroll so the board point (x, y), in cells, is mid-view."""
+        self.ox = round(x * self.cell) - self.view_w // 2
+        self.oy = round(y * self.cell) - self.view_h // 2
+        self._clamp()
+
+    # ── mapping ──
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """(x0, y0, x1, y1): the cells at least partly in view are
+        x0 <= x < x1, y0 <= y < y1."""
+        c = self.cell
+        return (max(0, (self.ox - self.half()) // c), max(0, self.oy // c),
+                min(self.cols, -(-(self.ox + self.view_w) // c)),
+                min(self.rows, -(-(self.oy + self.view_h) // c)))
+
+    def pattern_size(self) -> Tuple[int, int]:
+        """(rows, cols) of a background tile pattern big enough to cover
+        visible_cells() wherever the camera is. A staggered pattern has a
+        spare row so it can start on either row parity."""
+        extra = 1 if self.stagger else 0
+        return (min(self.rows, self.view_h // self.cell + 2) + extra,
+                min(self.cols, self.view_w // self.cell + 2 + extra))
+
+    def is_visible(self, cell: Coord) -> bool:
+        x0, y0, x1, y1 = self.visible_cells()
+        return x0 <= cell[0] < x1 and y0 <= cell[1] < y1
+
+    def to_view(self, cell: Coord) -> Tuple[int, int]:
+        """Top-left of `cell` in view pixels (may be outside the view)."""
+        shift = self.half() if cell[1] & 1 else 0
+        return cell[0] * self.cell + shift - self.ox, cell[1] * self.cell - self.oy
+
+    def cell_at(self, vx: int, vy: int) -> Optional[Coord]:
+        """The cell under view pixel (vx, vy), or None off the board."""
+        y = (vy + self.oy) // self.cell
+        shift = self.half() if y & 1 else 0
+        x = (vx + self.ox - shift) // self.cell
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return x, y
+        return None